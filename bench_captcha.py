@@ -0,0 +1,160 @@
+# bench_captcha.py
+"""
+Benchmark solver captcha secara offline (tanpa TelkomCare / Selenium).
+
+Contoh:
+  python bench_captcha.py --corpus captcha_corpus/          # screenshot asli berlabel
+  python bench_captcha.py --synthetic 300 --seed 1          # captcha sintetis
+  python bench_captcha.py --synthetic 200 --save-synthetic /tmp/synth
+  python bench_captcha.py --corpus captcha_corpus/ --no-preprocess
+
+Laporan: akurasi, latency mean/p95 per captcha, dan attempts-to-success
+(berapa captcha yang harus dicoba berurutan sampai satu tembus, seperti
+loop login).
+"""
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from telkomcare_captcha import SOLVERS, load_corpus, preprocess_captcha
+from telkomcare_glyph import GLYPH_MODEL_PATH, load_model
+from telkomcare_captcha_synth import generate_corpus
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _decode_gray(png):
+    return cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_GRAYSCALE)
+
+
+def run_benchmark(samples, solver, preprocess=True, verbose=False):
+    """
+    Jalankan solver atas samples [(label, png_bytes, path)].
+    Return dict metrik (accuracy, latency, attempts-to-success, strategy).
+    """
+    latencies = []
+    correct = 0
+    attempts_to_success = []
+    attempts = 0
+    strategies = {}
+    failures = []
+
+    for label, png, path in samples:
+        start = time.perf_counter()
+        img = preprocess_captcha(png) if preprocess else _decode_gray(png)
+        text, info = solver(img)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        attempts += 1
+        ok = text == label
+        if ok:
+            correct += 1
+            attempts_to_success.append(attempts)
+            attempts = 0
+            strategy = info.get("strategy") or "-"
+            strategies[strategy] = strategies.get(strategy, 0) + 1
+        else:
+            failures.append((label, text, str(path) if path else ""))
+        if verbose:
+            print(f"   {'✅' if ok else '❌'} {label:<8} → {text:<8} {latencies[-1]:7.1f}ms {path or ''}")
+
+    n = len(samples)
+    return {
+        "samples": n,
+        "correct": correct,
+        "accuracy": correct / n if n else 0.0,
+        "latency_ms_mean": statistics.fmean(latencies) if latencies else 0.0,
+        "latency_ms_p95": _percentile(latencies, 95),
+        "attempts_to_success_mean": statistics.fmean(attempts_to_success) if attempts_to_success else None,
+        "attempts_to_success_max": max(attempts_to_success) if attempts_to_success else None,
+        "unfinished_attempts": attempts,
+        "winning_strategies": strategies,
+        "failures": failures[:20],
+    }
+
+
+def print_report(name, metrics):
+    print(f"\n📊 {name}: {metrics['samples']} captcha")
+    print(f"   Akurasi        : {metrics['accuracy'] * 100:.1f}% ({metrics['correct']}/{metrics['samples']})")
+    print(f"   Latency        : mean {metrics['latency_ms_mean']:.1f}ms, p95 {metrics['latency_ms_p95']:.1f}ms")
+    if metrics["attempts_to_success_mean"] is not None:
+        print(f"   Attempts/sukses: mean {metrics['attempts_to_success_mean']:.2f}, "
+              f"max {metrics['attempts_to_success_max']}")
+    else:
+        print("   Attempts/sukses: tidak ada yang tembus")
+    if metrics["winning_strategies"]:
+        wins = ", ".join(f"{k}={v}" for k, v in sorted(metrics["winning_strategies"].items()))
+        print(f"   Strategi menang: {wins}")
+    for label, text, path in metrics["failures"][:5]:
+        print(f"   ❌ {label} → '{text}' {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark solver captcha TelkomCare (offline)")
+    parser.add_argument("--corpus", help="folder PNG berlabel (<label>_*.png)")
+    parser.add_argument("--synthetic", type=int, default=0, help="jumlah captcha sintetis")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--length", type=int, default=5, help="panjang captcha sintetis")
+    parser.add_argument("--save-synthetic", help="simpan captcha sintetis ke folder ini")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), action="append",
+                        help="backend solver (boleh diulang; default semua)")
+    parser.add_argument("--no-preprocess", action="store_true",
+                        help="lewati resize x2 + GaussianBlur (bandingkan efek preprocessing)")
+    parser.add_argument("--json", help="tulis metrik ke file JSON")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    datasets = []
+    if args.corpus:
+        datasets.append((f"korpus {args.corpus}", load_corpus(args.corpus)))
+    if args.synthetic:
+        synth = generate_corpus(args.synthetic, seed=args.seed, length=args.length)
+        if args.save_synthetic:
+            out = Path(args.save_synthetic)
+            out.mkdir(parents=True, exist_ok=True)
+            for i, (label, png, _) in enumerate(synth):
+                (out / f"{label}_{i:05d}.png").write_bytes(png)
+            print(f"💾 {len(synth)} captcha sintetis disimpan di {out}")
+        datasets.append((f"sintetis seed={args.seed}", synth))
+    if not datasets:
+        parser.error("isi --corpus dan/atau --synthetic")
+
+    report = {}
+    for solver_name in args.solver or sorted(SOLVERS):
+        solver = SOLVERS[solver_name]
+        if solver_name == "glyph" and load_model() is None:
+            print(f"⚠️ [glyph] dilewati: model {GLYPH_MODEL_PATH} belum ada "
+                  "(python telkomcare_glyph.py train ...)")
+            continue
+        for name, samples in datasets:
+            if not samples:
+                print(f"⚠️ {name}: tidak ada sampel")
+                continue
+            try:
+                metrics = run_benchmark(samples, solver, preprocess=not args.no_preprocess,
+                                        verbose=args.verbose)
+            except ImportError as e:
+                print(f"⚠️ [{solver_name}] dilewati: {e}")
+                break
+            print_report(f"[{solver_name}] {name}", metrics)
+            report[f"{solver_name}:{name}"] = metrics
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n💾 Metrik ditulis ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# bench_cycle.py
+"""
+Benchmark end-to-end run_cycle secara offline: mock_telkomcare.py (TelkomCare
++ Sheets API tiruan) di-start di proses ini, lalu run_cycle.main() dijalankan
+di subprocess (bench_cycle.py --run-cycle) dengan TC_BASE_URL mengarah ke
+mock. Hook khusus benchmark dipasang di subprocess itu, bukan di kode
+produksi: client gspread tanpa auth yang mengarah ke Sheets API tiruan, dan
+report UI dibuang dari daftar report kalau Chrome tidak ada. Per run dilaporkan
+waktu end-to-end, waktu per tahap (dari history telkomcare_metrics) dan
+hitungan request di sisi mock.
+
+Contoh:
+  python bench_cycle.py                                  # 5000 baris/report, 3 run
+  python bench_cycle.py --rows 50000 --latency 0.3 --sheets-latency 0.05
+  python bench_cycle.py --runs 5 --churn 0.02 --json /tmp/bench.json
+  python bench_cycle.py --fresh-state                    # tiap run tanpa shadow/snapshot
+  python bench_cycle.py --ttr-days 30 --env TC_TTR_INCREMENTAL=1
+
+Run pertama menulis penuh ke Sheets; run berikutnya (state dipertahankan)
+mengukur jalur diff/skip. Report UI (HSI, DATIN) butuh chromedriver; kalau
+tidak ada di PATH, keduanya dilewati.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from shutil import which
+
+import requests
+
+from mock_telkomcare import DEFAULT_TOKEN, SESSION_COOKIE_NAME, start_mock_server
+from telkomcare_fanout import BROWSER_REPORTS, REPORT_ORDER
+
+BASE_DIR = Path(__file__).resolve().parent
+
+GOOGLE_SHEETS_API = "https://sheets.googleapis.com"
+
+
+# ===================== SUBPROCESS CYCLE =====================
+
+class _RedirectSession(requests.Session):
+    """Session tanpa auth yang mengganti host Sheets API dengan URL mock."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url
+
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith(GOOGLE_SHEETS_API):
+            url = self.base_url + url[len(GOOGLE_SHEETS_API):]
+        return super().request(method, url, *args, **kwargs)
+
+
+def run_cycle_against_mock():
+    """
+    Entry subprocess (--run-cycle): pasang hook benchmark lalu run_cycle.main().
+    BENCH_SHEETS_API_URL → client gspread yang dipakai importer;
+    BENCH_SKIP_REPORTS (dipisah koma) → report yang dibuang dari daftar cycle.
+    """
+    import gspread
+
+    import run_cycle
+    import telkomcare_fanout
+    import telkomcare_importer
+
+    sheets_url = os.environ["BENCH_SHEETS_API_URL"]
+    print(f"🧪 Sheets API diarahkan ke {sheets_url}")
+    # setup_gsheets() memakai client yang sudah ada → credentials.json tidak dibaca
+    telkomcare_importer._gsheets_client = gspread.Client(auth=None, session=_RedirectSession(sheets_url))
+
+    skip = {r for r in os.getenv("BENCH_SKIP_REPORTS", "").split(",") if r}
+    if skip:
+        # REPORT_ORDER dipakai bersama run_cycle → ubah list yang sama
+        telkomcare_fanout.BROWSER_REPORTS[:] = [(r, f) for r, f in telkomcare_fanout.BROWSER_REPORTS
+                                                if r not in skip]
+        telkomcare_fanout.REPORT_ORDER[:] = [r for r in telkomcare_fanout.REPORT_ORDER if r not in skip]
+    run_cycle.main()
+
+
+def _cycle_env(base_url, workdir, args, skip_reports):
+    cookies = workdir / "cookies.env"
+    cookies.write_text(
+        f"TC_SESSION_NAME={SESSION_COOKIE_NAME}\nTC_BASE_DOMAIN=127.0.0.1\n"
+        f"TC_SESSION_VALUE={DEFAULT_TOKEN}\n",
+        encoding="utf-8",
+    )
+    env = dict(os.environ)
+    # telkomcare_login menolak import tanpa kredensial; mock tidak butuh login
+    for key in ("TELKOM_USERNAME", "TELKOM_PASSWORD", "TELKOM_TOTP_SECRET"):
+        env.setdefault(key, "mock")
+    env.update({
+        "TC_BASE_URL": base_url,
+        "BENCH_SHEETS_API_URL": base_url,
+        "TC_COOKIES_ENV": str(cookies),
+        "TC_STATE_DIR": str(workdir / "state"),
+        "TC_ARCHIVE_DIR": str(workdir / "archive"),
+        "TC_METRICS_HISTORY": str(workdir / "metrics_history.jsonl"),
+        "TC_METRICS_TEXTFILE": str(workdir / "telkomcare.prom"),
+        # Mock tidak punya kuota; limiter 60/menit hanya akan mengukur sleep
+        "TC_SHEETS_WRITES_PER_MIN": str(args.writes_per_min),
+        "BENCH_SKIP_REPORTS": ",".join(skip_reports),
+        "PYTHONUNBUFFERED": "1",
+    })
+    env.update(dict(item.split("=", 1) for item in args.env))
+    return env
+
+
+def _last_history(path):
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    return json.loads(lines[-1]) if lines else None
+
+
+def run_once(base_url, workdir, args, skip_reports, index):
+    if args.fresh_state:
+        shutil.rmtree(workdir / "state", ignore_errors=True)
+    requests.post(f"{base_url}/__reset", timeout=5)
+    env = _cycle_env(base_url, workdir, args, skip_reports)
+    log_path = workdir / f"run_{index}.log"
+
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(
+            [sys.executable, str(BASE_DIR / "bench_cycle.py"), "--run-cycle"],
+            cwd=workdir, env=env, stdout=None if args.verbose else log,
+            stderr=subprocess.STDOUT, timeout=args.timeout,
+        )
+    e2e = time.perf_counter() - start
+
+    cycle = _last_history(workdir / "metrics_history.jsonl")
+    mock = requests.get(f"{base_url}/__stats", timeout=5).json()
+    return {"run": index, "exit_code": proc.returncode, "e2e_seconds": e2e,
+            "cycle": cycle, "mock": mock, "log": str(log_path)}
+
+
+def print_run(res):
+    cycle = res["cycle"] or {}
+    mock = res["mock"]
+    status = "" if res["exit_code"] == 0 else f" (exit {res['exit_code']}, log {res['log']})"
+    print(f"\n📊 Run #{res['run']}: end-to-end {res['e2e_seconds']:.2f}s, "
+          f"cycle {cycle.get('wall_seconds', 0):.2f}s{status}")
+    for stage, seconds in (cycle.get("stages") or {}).items():
+        print(f"   {stage:<22} {seconds:7.2f}s")
+    for report in REPORT_ORDER:
+        stages = (cycle.get("reports") or {}).get(report)
+        if not stages:
+            continue
+        parts = []
+        for stage in ("download", "parse", "archive", "upload"):
+            entry = stages.get(stage)
+            if entry is None:
+                continue
+            part = f"{stage} {entry['seconds']:.2f}s"
+            if entry.get("status") == "skipped":
+                part += " (skip)"
+            elif entry.get("rows"):
+                part += f" {entry['rows']} baris"
+            if not entry["ok"]:
+                part += " ❌"
+            parts.append(part)
+        print(f"   {report:<22} " + ", ".join(parts))
+    print(f"   mock: {mock['exports']} export ({mock['export_bytes'] / 1e6:.1f} MB), "
+          f"{mock['sheets_requests']} request Sheets, {mock['sheets_updated_rows']} baris ditulis"
+          + (f", {mock['sheets_429']}x 429" if mock.get("sheets_429") else ""))
+
+
+def summarize(runs):
+    """Median per metrik lintas run (run pertama = tulis penuh, dipisah)."""
+    def med(values):
+        return statistics.median(values) if values else None
+
+    def collect(selected):
+        out = {"e2e_seconds": med([r["e2e_seconds"] for r in selected])}
+        stages = {}
+        for r in selected:
+            for stage, seconds in ((r["cycle"] or {}).get("stages") or {}).items():
+                stages.setdefault(stage, []).append(seconds)
+        out["stages"] = {k: med(v) for k, v in stages.items()}
+        return out
+
+    summary = {"first_run": collect(runs[:1])}
+    if len(runs) > 1:
+        summary["warm_runs"] = collect(runs[1:])
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run_cycle terhadap mock TelkomCare + Sheets")
+    parser.add_argument("--rows", type=int, default=5000, help="baris per report")
+    parser.add_argument("--cols", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="delay per halaman TelkomCare")
+    parser.add_argument("--sheets-latency", type=float, default=0.0, help="delay per request Sheets")
+    parser.add_argument("--churn", type=float, default=0.0, help="fraksi baris berubah per cycle")
+    parser.add_argument("--sheets-429-every", type=int, default=0)
+    parser.add_argument("--ttr-days", type=int, default=0,
+                        help="tiket TTR tersebar di N hari terakhir (export ikut startdate/enddate)")
+    parser.add_argument("--export-latency-per-1k", type=float, default=0.0,
+                        help="delay generate export per 1000 baris (detik)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="env tambahan untuk run_cycle (boleh berulang)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--fresh-state", action="store_true", help="hapus state lokal sebelum tiap run")
+    parser.add_argument("--writes-per-min", type=int, default=100000)
+    parser.add_argument("--browser", action="store_true",
+                        help="ikutkan report UI walau chromedriver tidak terdeteksi")
+    parser.add_argument("--timeout", type=int, default=1800)
+    parser.add_argument("--workdir", help="folder kerja (default: temp, dihapus setelah selesai)")
+    parser.add_argument("--json", help="tulis hasil ke file JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="tampilkan output run_cycle")
+    args = parser.parse_args()
+
+    skip_reports = []
+    if not args.browser and not which("chromedriver"):
+        skip_reports = [report for report, _ in BROWSER_REPORTS]
+        print(f"ℹ️ chromedriver tidak ada → report UI dilewati: {', '.join(skip_reports)}")
+
+    server, _state = start_mock_server(
+        rows=args.rows, cols=args.cols, latency=args.latency, sheets_latency=args.sheets_latency,
+        churn=args.churn, sheets_429_every=args.sheets_429_every, ttr_days=args.ttr_days,
+        export_latency_per_1k=args.export_latency_per_1k,
+    )
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    print(f"🧪 Mock di {base_url}: {args.rows} baris × {args.cols} kolom/report, "
+          f"latency {args.latency}s, Sheets {args.sheets_latency}s, churn {args.churn}")
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="tc_bench_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    runs = []
+    try:
+        for i in range(1, args.runs + 1):
+            res = run_once(base_url, workdir, args, skip_reports, i)
+            print_run(res)
+            runs.append(res)
+    finally:
+        server.shutdown()
+
+    summary = summarize(runs)
+    print("\n📈 Median:")
+    for name, part in summary.items():
+        stages = ", ".join(f"{k} {v:.2f}s" for k, v in part["stages"].items())
+        print(f"   {name:<10} e2e {part['e2e_seconds']:.2f}s  ({stages})")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "runs": runs, "summary": summary},
+                                              indent=2), encoding="utf-8")
+        print(f"\n💾 Hasil ditulis ke {args.json}")
+    if not args.workdir and all(r["exit_code"] == 0 for r in runs):
+        shutil.rmtree(workdir, ignore_errors=True)
+    elif not args.workdir:
+        print(f"📁 Log run tersimpan di {workdir}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--run-cycle"]:
+        run_cycle_against_mock()
+    else:
+        main()
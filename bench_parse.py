@@ -0,0 +1,178 @@
+# bench_parse.py
+"""
+Benchmark jalur parse read_excel_data terhadap report sintetis besar
+(telkomcare_report_synth): waktu, baris/detik dan puncak memori per jalur.
+
+Jalur yang diukur:
+  html_first       PARSERS["first_table"]  (HTML-as-xls, streaming lxml)
+  html_fallback    PARSERS["html_fallback"]
+  html_widest      PARSERS["widest_table"] (GAUL)
+  pandas_first     pd.read_html(...)[0]    (baseline lama, DOM penuh)
+  pandas_widest    pd.read_html → tabel terlebar (baseline GAUL lama)
+  xls_xlrd         .xls asli → read_excel(engine='xlrd')    (file butuh xlwt)
+  xlsx_openpyxl    .xlsx asli → read_excel(engine='openpyxl')
+
+Tiap pengukuran jalan di proses baru, jadi puncak RSS (ru_maxrss) tidak
+tercampur antar jalur. File sintetis di-cache di --data-dir.
+
+Contoh:
+  python bench_parse.py --rows 10000 100000 --cols 16 40
+  python bench_parse.py --rows 500000 --paths html_first html_widest --repeat 1
+  python bench_parse.py --rows 20000 --tracemalloc --json /tmp/parse.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from telkomcare_report_synth import BASE_COLUMNS, ensure_report_file
+
+# nama jalur -> (format file, report sintetis)
+PARSE_PATHS = {
+    "html_first": ("html", "TTR DATIN"),
+    "html_fallback": ("html", "WECARE DATIN"),
+    "html_widest": ("html", "WECARE GAUL"),
+    "pandas_first": ("html", "TTR DATIN"),
+    "pandas_widest": ("html", "WECARE GAUL"),
+    "xls_xlrd": ("xls", "TTR DATIN"),
+    "xlsx_openpyxl": ("xlsx", "TTR DATIN"),
+}
+
+
+def _run_parser(name, path):
+    import pandas as pd
+
+    from telkomcare_importer import _frame_to_table, read_excel_data
+
+    if name in ("html_first", "xls_xlrd", "xlsx_openpyxl"):
+        return read_excel_data(str(path), "first_table")
+    if name == "html_fallback":
+        return read_excel_data(str(path), "html_fallback")
+    if name == "html_widest":
+        return read_excel_data(str(path), "widest_table")
+    if name == "pandas_first":
+        return _frame_to_table(pd.read_html(str(path))[0])
+    if name == "pandas_widest":
+        tables = pd.read_html(str(path))
+        return _frame_to_table(max(tables, key=lambda df: df.shape[1]))
+    raise KeyError(name)
+
+
+def _measure(name, path, trace):
+    """Dijalankan di proses anak: return dict hasil satu pengukuran."""
+    # Import modul berat dulu supaya tidak ikut terhitung waktu / RSS parse
+    import pandas  # noqa: F401
+    import telkomcare_importer  # noqa: F401
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = _run_parser(name, path)
+    seconds = time.perf_counter() - start
+    traced = tracemalloc.get_traced_memory()[1] if trace else None
+    if trace:
+        tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss: KB di Linux, byte di macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    n = len(rows or [])
+    return {
+        "seconds": seconds,
+        "rows": n,
+        "rows_per_s": n / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": rss_after * scale / 1e6,
+        "rss_growth_mb": (rss_after - rss_before) * scale / 1e6,
+        "tracemalloc_peak_mb": traced / 1e6 if traced is not None else None,
+    }
+
+
+def _new_pool():
+    # Satu proses per pengukuran (spawn: tidak mewarisi memori proses induk)
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                               max_tasks_per_child=1)
+
+
+def bench_path(name, path, repeat, trace):
+    runs = []
+    for _ in range(repeat):
+        with _new_pool() as pool:
+            runs.append(pool.submit(_measure, name, path, trace).result())
+    best = min(runs, key=lambda r: r["seconds"])
+    return {
+        "path": name,
+        "file": str(path),
+        "file_mb": Path(path).stat().st_size / 1e6,
+        "rows": best["rows"],
+        "seconds_min": best["seconds"],
+        "seconds_median": statistics.median(r["seconds"] for r in runs),
+        "rows_per_s": best["rows_per_s"],
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+        "rss_growth_mb": max(r["rss_growth_mb"] for r in runs),
+        "tracemalloc_peak_mb": best["tracemalloc_peak_mb"],
+    }
+
+
+def print_table(results):
+    print(f"\n{'jalur':<15} {'baris':>8} {'kolom':>5} {'MB':>7} {'detik':>8} {'baris/s':>10} "
+          f"{'RSS+MB':>8} {'puncakMB':>9}" + ("  tracemallocMB" if any(
+              r.get("tracemalloc_peak_mb") is not None for r in results) else ""))
+    for r in results:
+        line = (f"{r['path']:<15} {r['rows']:>8} {r['cols']:>5} {r['file_mb']:>7.1f} "
+                f"{r['seconds_min']:>8.2f} {r['rows_per_s']:>10.0f} {r['rss_growth_mb']:>8.1f} "
+                f"{r['peak_rss_mb']:>9.1f}")
+        if r.get("tracemalloc_peak_mb") is not None:
+            line += f"  {r['tracemalloc_peak_mb']:>13.1f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser report TelkomCare (offline)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--cols", type=int, nargs="+", default=[len(BASE_COLUMNS)])
+    parser.add_argument("--paths", nargs="+", choices=sorted(PARSE_PATHS), help="default semua")
+    parser.add_argument("--repeat", type=int, default=3, help="ulangan per jalur (diambil tercepat)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="ukur juga puncak alokasi Python (lebih lambat)")
+    parser.add_argument("--data-dir", default=str(Path(tempfile.gettempdir()) / "telkomcare_synth"),
+                        help="cache file sintetis")
+    parser.add_argument("--json", help="tulis hasil ke file JSON")
+    args = parser.parse_args()
+
+    results = []
+    for cols in args.cols:
+        for rows in args.rows:
+            for name in args.paths or list(PARSE_PATHS):
+                fmt, report = PARSE_PATHS[name]
+                try:
+                    path = ensure_report_file(args.data_dir, report, rows, cols, fmt)
+                except (ImportError, ValueError) as e:
+                    print(f"⚠️ {name} {rows}×{cols} dilewati: {e}")
+                    continue
+                res = bench_path(name, path, args.repeat, args.tracemalloc)
+                res["cols"] = cols
+                print(f"   ⏱  {name:<15} {rows}×{cols}: {res['seconds_min']:.2f}s, "
+                      f"{res['rows_per_s']:.0f} baris/s, RSS +{res['rss_growth_mb']:.0f} MB")
+                results.append(res)
+
+    if results:
+        print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": results}, indent=2),
+                                   encoding="utf-8")
+        print(f"\n💾 Hasil ditulis ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+# mock_telkomcare.py
+"""
+Server tiruan TelkomCare + Google Sheets API untuk benchmark offline.
+
+Satu ThreadingHTTPServer melayani:
+  - TelkomCare: /public/login, /assurance/dashboard/alertresponse (probe),
+    wecaresugar25/26 (form teritori + SUBMIT), detailsugar25 (detail + export
+    xls=1) dan detailrescomp25 (export TTR). Export = HTML-as-xls sintetis
+    (telkomcare_report_synth) dengan ukuran & latency yang bisa diatur.
+    Semua halaman /assurance butuh cookie newtelkomcareapache=<token>.
+    Dengan --ttr-days N, tiket TTR tersebar rata di N hari terakhir dan
+    export detailrescomp25 hanya berisi tiket startdate..enddate.
+    --export-latency-per-1k meniru waktu generate export yang sebanding
+    dengan jumlah baris.
+  - Sheets API v4 minimal untuk gspread: metadata spreadsheet, :batchUpdate
+    (addSheet), values:batchUpdate, values:batchClear.
+  - /__stats: hitungan request, byte export, baris/cell yang ditulis.
+
+  python mock_telkomcare.py --port 8765 --rows 20000 --latency 0.3
+  TC_BASE_URL=http://127.0.0.1:8765 BENCH_SHEETS_API_URL=http://127.0.0.1:8765 \
+      python bench_cycle.py --run-cycle
+
+bench_cycle.py menjalankan server ini + run_cycle sekaligus.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.cookies import SimpleCookie
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from telkomcare_report_synth import BASE_COLUMNS, date_index_range, render_html_report
+
+SESSION_COOKIE_NAME = "newtelkomcareapache"
+DEFAULT_TOKEN = "mock-session-token"
+
+# (path, sumber/kategori) → nama report yang di-export
+TTR_SUMBER = {"DATIN24": "TTR DATIN", "INDIBIZ": "TTR INDIBIZ", "RESELLER": "TTR RESELLER"}
+WECARE_SUMBER = {"HSI24": "WECARE HSI", "DATIN24": "WECARE DATIN"}
+
+_SHEET_PATH = re.compile(r"^/v4/spreadsheets/([^/:]+)(.*)$")
+
+
+class MockState:
+    """Konfigurasi + state bersama semua thread handler."""
+
+    def __init__(self, rows=5000, cols=len(BASE_COLUMNS), latency=0.0, sheets_latency=0.0,
+                 churn=0.0, seed=0, token=DEFAULT_TOKEN, sheets_429_every=0, report_rows=None,
+                 ttr_days=0, export_latency_per_1k=0.0):
+        self.rows = rows
+        self.ttr_days = ttr_days
+        self.export_latency_per_1k = export_latency_per_1k
+        self.cols = cols
+        self.latency = latency
+        self.sheets_latency = sheets_latency
+        self.churn = churn
+        self.seed = seed
+        self.token = token
+        self.sheets_429_every = sheets_429_every
+        self.report_rows = report_rows or {}
+        self.lock = threading.Lock()
+        self.versions = {}  # report -> version export berikutnya
+        self.exports = {}  # (report, version, index_range) -> bytes
+        self.sheets = {}  # title -> properties
+        self.stats = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {
+                "requests": 0,
+                "exports": 0,
+                "export_bytes": 0,
+                "sheets_requests": 0,
+                "sheets_value_updates": 0,
+                "sheets_updated_rows": 0,
+                "sheets_updated_cells": 0,
+                "sheets_clears": 0,
+                "sheets_429": 0,
+            }
+
+    def bump(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def date_span(self, report):
+        """(mulai, hari) sebaran REPORTED DATE tiket TTR, atau None."""
+        if not self.ttr_days or report not in TTR_SUMBER.values():
+            return None
+        start = datetime.combine(date.today() - timedelta(days=self.ttr_days - 1), datetime.min.time())
+        return start, self.ttr_days
+
+    def render(self, report, version, index_range=None):
+        key = (report, version, index_range)
+        with self.lock:
+            cached = self.exports.get(key)
+        if cached is None:
+            cached = render_html_report(
+                report, self.report_rows.get(report, self.rows), cols=self.cols,
+                seed=self.seed, version=version, churn=self.churn,
+                date_span=self.date_span(report), index_range=index_range,
+            )
+            with self.lock:
+                # Simpan hanya version yang masih bisa diminta (hemat memori)
+                self.exports = {k: v for k, v in self.exports.items()
+                                if k[0] != report or k[1] >= version}
+                self.exports[key] = cached
+        return cached
+
+    def export(self, report, startdate=None, enddate=None):
+        """
+        Bytes export report; tiap request menaikkan version kalau churn > 0.
+        Version berikutnya di-render di background supaya waktu generate
+        tidak ikut terukur sebagai waktu download cycle berikutnya.
+        startdate/enddate (YYYY-MM-DD) hanya berlaku untuk TTR dengan ttr_days.
+        """
+        index_range = None
+        total_rows = self.report_rows.get(report, self.rows)
+        span = self.date_span(report)
+        if span and startdate and enddate:
+            index_range = date_index_range(total_rows, span,
+                                           date.fromisoformat(startdate), date.fromisoformat(enddate))
+        if self.export_latency_per_1k:
+            n_rows = index_range[1] - index_range[0] if index_range else total_rows
+            time.sleep(self.export_latency_per_1k * n_rows / 1000)
+        with self.lock:
+            version = self.versions.get(report, 0)
+            if self.churn:
+                self.versions[report] = version + 1
+        body = self.render(report, version, index_range)
+        if self.churn:
+            threading.Thread(target=self.render, args=(report, version + 1, index_range),
+                             daemon=True).start()
+        return body
+
+    def sheet(self, title):
+        with self.lock:
+            props = self.sheets.get(title)
+            if props is None:
+                props = {
+                    "sheetId": len(self.sheets) + 1,
+                    "title": title,
+                    "index": len(self.sheets),
+                    "sheetType": "GRID",
+                    "gridProperties": {"rowCount": 100000, "columnCount": max(26, self.cols)},
+                }
+                self.sheets[title] = props
+            return props
+
+
+# ===================== HALAMAN TELKOMCARE =====================
+
+def _page(title, body):
+    return (f"<html><head><title>{title}</title></head><body>{body}</body></html>").encode("utf-8")
+
+
+LOGIN_PAGE = _page(
+    "Login",
+    '<form method="post" action="/public/login"><input id="uname"><input id="passw" type="password">'
+    '<div id="captcha-element"><img src="/public/captcha.png"></div><input id="captcha-input">'
+    '<input id="agree" type="checkbox"><button id="submit">Login</button></form>',
+)
+
+DASHBOARD_PAGE = _page("Dashboard", '<div class="dashboard-header">TelkomCare (mock)</div>')
+
+
+def _detail_query(sumber, **extra):
+    params = {"read": "all", "param_teritory": "TELKOMBARU", "sumber": sumber,
+              "regional": "REGIONAL2", "witel": "BANTEN", "kategori": "grand_total", **extra}
+    return urlencode(params)
+
+
+def _wecare_page(path, sumber, submitted):
+    body = (
+        f'<form method="get" action="{path}">'
+        f'<input type="hidden" name="sumber" value="{sumber}">'
+        '<select id="param_teritory" name="param_teritory">'
+        '<option value="">-- pilih --</option><option value="TELKOMBARU">TELKOM BARU</option>'
+        '</select><button type="submit">SUBMIT</button></form>'
+    )
+    if submitted:
+        link = f"/assurance/lapebis25/detailsugar25?{_detail_query(sumber)}"
+        body += (
+            "<table><thead><tr><th>WITEL</th><th>GRAND TOTAL</th></tr></thead><tbody>"
+            f'<tr><td>BANTEN</td><td><a href="{link}">123</a></td></tr></tbody></table>'
+        )
+    return _page(f"WECARE {sumber}", body)
+
+
+def _detail_page(sumber):
+    link = f"/assurance/lapebis25/detailsugar25?{_detail_query(sumber, xls=1)}"
+    return _page(
+        f"Detail {sumber}",
+        f'<a href="{link}">Download Excel</a>'
+        "<table><thead><tr><th>INCIDENT</th></tr></thead><tbody><tr><td>INC1</td></tr></tbody></table>",
+    )
+
+
+# ===================== HANDLER =====================
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass  # server senyap
+
+        # ---------- util ----------
+
+        def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _json(self, status, data):
+            self._send(status, json.dumps(data).encode("utf-8"), "application/json")
+
+        def _logged_in(self):
+            cookie = SimpleCookie(self.headers.get("Cookie", ""))
+            morsel = cookie.get(SESSION_COOKIE_NAME)
+            return morsel is not None and morsel.value == state.token
+
+        def _redirect_login(self):
+            self._send(302, b"", headers={"Location": "/public/login?&modules=assurance"})
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        # ---------- routing ----------
+
+        def do_GET(self):
+            state.bump("requests")
+            url = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            if url.path == "/__stats":
+                with state.lock:
+                    return self._json(200, dict(state.stats))
+            if url.path.startswith("/v4/spreadsheets/"):
+                return self._sheets("GET", url.path)
+            if url.path.startswith("/public/login"):
+                return self._send(200, LOGIN_PAGE)
+            if url.path in ("", "/"):
+                return self._send(200, DASHBOARD_PAGE) if self._logged_in() else self._redirect_login()
+            if not url.path.startswith("/assurance/"):
+                return self._send(404, b"not found")
+            if not self._logged_in():
+                return self._redirect_login()
+
+            time.sleep(state.latency)
+            if url.path == "/assurance/dashboard/alertresponse":
+                return self._send(200, DASHBOARD_PAGE)
+            if url.path.endswith(("/wecaresugar25", "/wecaresugar26")):
+                sumber = query.get("sumber", "")
+                return self._send(200, _wecare_page(url.path, sumber, bool(query.get("param_teritory"))))
+            if url.path.endswith("/detailsugar25"):
+                if query.get("xls") != "1":
+                    return self._send(200, _detail_page(query.get("sumber", "")))
+                if query.get("kategori") == "gaul":
+                    return self._export("WECARE GAUL")
+                return self._export(WECARE_SUMBER.get(query.get("sumber")))
+            if url.path.endswith("/detailrescomp25") and query.get("xls") == "1":
+                return self._export(TTR_SUMBER.get(query.get("sumber")),
+                                    query.get("startdate"), query.get("enddate"))
+            return self._send(404, b"not found")
+
+        def do_POST(self):
+            state.bump("requests")
+            url = urlparse(self.path)
+            if url.path.startswith("/v4/spreadsheets/"):
+                return self._sheets("POST", url.path)
+            if url.path == "/__reset":
+                state.reset_stats()
+                return self._json(200, {})
+            return self._send(404, b"not found")
+
+        def _export(self, report, startdate=None, enddate=None):
+            if report is None:
+                return self._send(404, b"report tidak dikenal")
+            body = state.export(report, startdate, enddate)
+            state.bump("exports")
+            state.bump("export_bytes", len(body))
+            filename = report.lower().replace(" ", "_") + ".xls"
+            self._send(200, body, "application/vnd.ms-excel",
+                       {"Content-Disposition": f'attachment; filename="{filename}"'})
+
+        # ---------- Sheets API ----------
+
+        def _sheets(self, method, path):
+            state.bump("sheets_requests")
+            time.sleep(state.sheets_latency)
+            m = _SHEET_PATH.match(path)
+            if not m:
+                return self._json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+            spreadsheet_id, rest = m.groups()
+
+            if method == "GET" and rest == "":
+                with state.lock:
+                    sheets = [{"properties": dict(p)} for p in state.sheets.values()]
+                return self._json(200, {
+                    "spreadsheetId": spreadsheet_id,
+                    "properties": {"title": "TelkomCare (mock)", "locale": "en_US", "timeZone": "Asia/Jakarta"},
+                    "sheets": sheets,
+                })
+
+            body = self._read_json()
+            if rest == ":batchUpdate":
+                replies = []
+                for req in body.get("requests", []):
+                    if "addSheet" in req:
+                        props = state.sheet(req["addSheet"].get("properties", {}).get("title", "Sheet"))
+                        replies.append({"addSheet": {"properties": props}})
+                    else:
+                        replies.append({})
+                return self._json(200, {"spreadsheetId": spreadsheet_id, "replies": replies})
+
+            if rest == "/values:batchUpdate":
+                with state.lock:
+                    state.stats["sheets_value_updates"] += 1
+                    n = state.stats["sheets_value_updates"]
+                if state.sheets_429_every:
+                    if n % state.sheets_429_every == 0:
+                        state.bump("sheets_429")
+                        return self._json(429, {"error": {
+                            "code": 429, "message": "Quota exceeded (mock)", "status": "RESOURCE_EXHAUSTED"}})
+                rows = cells = 0
+                for item in body.get("data", []):
+                    values = item.get("values", [])
+                    rows += len(values)
+                    cells += sum(len(r) for r in values)
+                state.bump("sheets_updated_rows", rows)
+                state.bump("sheets_updated_cells", cells)
+                return self._json(200, {"spreadsheetId": spreadsheet_id, "totalUpdatedRows": rows,
+                                        "totalUpdatedCells": cells, "responses": []})
+
+            if rest == "/values:batchClear":
+                state.bump("sheets_clears")
+                return self._json(200, {"spreadsheetId": spreadsheet_id,
+                                        "clearedRanges": body.get("ranges", [])})
+
+            return self._json(404, {"error": {"code": 404, "message": f"{rest} belum didukung mock",
+                                              "status": "NOT_FOUND"}})
+
+    return Handler
+
+
+REPORTS = ("WECARE HSI", "WECARE GAUL", "WECARE DATIN", "TTR DATIN", "TTR INDIBIZ", "TTR RESELLER")
+
+
+def start_mock_server(host="127.0.0.1", port=0, prerender=True, **options):
+    """
+    Start server di thread daemon; return (server, state). URL: http://host:server.server_port
+    prerender=True → export version pertama dibuat sebelum server menerima request.
+    """
+    state = MockState(**options)
+    for title in REPORTS:
+        state.sheet(title)
+        if prerender:
+            state.render(title, 0)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-telkomcare", daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server tiruan TelkomCare + Sheets API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=5000, help="baris per export report")
+    parser.add_argument("--cols", type=int, default=len(BASE_COLUMNS))
+    parser.add_argument("--latency", type=float, default=0.0, help="delay per halaman TelkomCare (detik)")
+    parser.add_argument("--sheets-latency", type=float, default=0.0, help="delay per request Sheets (detik)")
+    parser.add_argument("--churn", type=float, default=0.0, help="fraksi baris berubah per export")
+    parser.add_argument("--sheets-429-every", type=int, default=0, help="balas 429 tiap N request Sheets")
+    parser.add_argument("--ttr-days", type=int, default=0,
+                        help="tiket TTR tersebar di N hari terakhir, export ikut startdate/enddate")
+    parser.add_argument("--export-latency-per-1k", type=float, default=0.0,
+                        help="delay generate export per 1000 baris (detik)")
+    parser.add_argument("--token", default=DEFAULT_TOKEN)
+    args = parser.parse_args()
+
+    server, _state = start_mock_server(
+        args.host, args.port, rows=args.rows, cols=args.cols, latency=args.latency,
+        sheets_latency=args.sheets_latency, churn=args.churn, token=args.token,
+        sheets_429_every=args.sheets_429_every, ttr_days=args.ttr_days,
+        export_latency_per_1k=args.export_latency_per_1k,
+    )
+    base = f"http://{args.host}:{server.server_port}"
+    print(f"🧪 Mock TelkomCare + Sheets API di {base} (cookie {SESSION_COOKIE_NAME}={args.token})")
+    print(f"   TC_BASE_URL={base} BENCH_SHEETS_API_URL={base} python bench_cycle.py --run-cycle")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
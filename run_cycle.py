@@ -1,5 +1,5 @@
 # run_cycle.py
-import subprocess
+import time
 from datetime import datetime
 from pathlib import Path
 from shutil import which
@@ -8,19 +8,19 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
+from telkomcare_browser import PERSISTENT_BROWSER, close_driver, get_persistent_driver
 from telkomcare_login import login_otomatis
-from telkomcare_downloads import (
-    download_report_hsi,
-    download_report_datin,
-    download_ttr_datin,
-    download_ttr_indibiz,
-    download_ttr_reseller,
-    download_wecare_gaul,
+from telkomcare_metrics import finish_cycle, record_span, span
+from telkomcare_fanout import REPORT_ORDER, download_all
+from telkomcare_importer import import_report, import_status
+from telkomcare_http import (
+    SessionExpiredError,
+    create_http_session,
+    probe_session,
+    record_session_verdict,
 )
-from telkomcare_session import ensure_logged_in
-
-BASE_DIR = Path(__file__).resolve().parent
-COOKIES_ENV_PATH = BASE_DIR / "cookies.env"
+from telkomcare_session import COOKIES_ENV_PATH, attach_session_cookie, ensure_logged_in
+from telkomcare_wait import print_wait_summary
 
 # Pastikan folder Downloads ada
 DOWNLOADS_FOLDER = Path.home() / "Downloads"
@@ -29,6 +29,10 @@ DOWNLOADS_FOLDER_STR = str(DOWNLOADS_FOLDER)
 
 
 def create_driver():
+    if PERSISTENT_BROWSER:
+        # Attach ke Chrome yang hidup lintas cycle (profil & cache hangat)
+        return get_persistent_driver()
+
     chrome_options = Options()
     prefs = {
         "download.default_directory": DOWNLOADS_FOLDER_STR,
@@ -58,58 +62,123 @@ def need_fresh_login():
     return True
 
 
+def print_import_summary(results):
+    labels = {
+        "uploaded": "⬆️  diupload",
+        "skipped": "⏭  dilewati (isi sama dengan upload terakhir)",
+        "failed": "❌ gagal import",
+    }
+    print("\n📊 Ringkasan import:")
+    for report in REPORT_ORDER:
+        if not results[report]["ok"]:
+            status = "❌ download gagal"
+        else:
+            status = labels.get(import_status.get(report), "❌ gagal import")
+        print(f"   {report:<13} {status}")
+    skipped = [r for r in REPORT_ORDER if import_status.get(r) == "skipped"]
+    if skipped:
+        print(f"   ⏭  {len(skipped)} report tidak berubah: {', '.join(skipped)}")
+
+
 def main():
-    driver = None
+    # Driver Chrome hanya dibuat kalau perlu (login, atau report yang butuh UI)
+    state = {"driver": None}
+    http_session = None
     first_cycle = True
+    started_at = datetime.now()
+    cycle_start = time.perf_counter()
+
+    def get_driver():
+        if state["driver"] is None:
+            print("🌐 Ada report yang butuh UI → start Chrome + pasang cookie session...")
+            with span("browser_start"):
+                state["driver"] = attach_session_cookie(create_driver())
+        return state["driver"]
+
+    def login():
+        with span("login") as rec:
+            state["driver"] = login_otomatis()
+            rec["ok"] = state["driver"] is not None
+        if state["driver"] is None:
+            raise Exception("login_otomatis gagal, driver None")
+        record_session_verdict(True)
+
+    def relogin():
+        # Cookie ditolak saat download padahal probe bilang valid → login ulang,
+        # cookies.env diperbarui (login_otomatis membuat driver sendiri)
+        print("🔑 Cookie ditolak saat download → login OTP ulang...")
+        close_driver(state["driver"])
+        state["driver"] = None
+        login()
+        return state["driver"]
+
     try:
         print("\n" + "=" * 70)
-        print(f"⏱  START CYCLE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"⏱  START CYCLE - {started_at.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 70)
 
         if need_fresh_login():
             print("🔑 cookies.env kosong / belum ada → login OTP otomatis...")
-            driver = login_otomatis()
-            if driver is None:
-                raise Exception("login_otomatis gagal, driver None")
+            login()
         else:
-            driver = create_driver()
-            print("🔑 cookies.env ada → pakai ensure_logged_in (cookie)...")
-            driver = ensure_logged_in(
-                driver, login_func=login_otomatis, first_cycle=first_cycle
-            )
+            print("🔑 cookies.env ada → cek cookie lewat probe HTTP...")
+            with span("session_probe") as rec:
+                verdict = probe_session()
+                rec["status"] = {True: "valid", False: "expired", None: "unknown"}[verdict]
+            if verdict is False:
+                print("⚠️ Cookie expired → login OTP otomatis...")
+                login()
+            elif verdict is None:
+                # Probe tidak bisa memastikan → cek lama lewat browser (tanpa probe ulang)
+                with span("session_browser_check"):
+                    state["driver"] = ensure_logged_in(
+                        create_driver(), login_func=login_otomatis, first_cycle=first_cycle, probe=False
+                    )
+            else:
+                print("✅ Cookie valid, Chrome belum perlu dijalankan.")
 
         try:
-            # 2. HSI24 → WECARE HSI
-            download_report_hsi(driver)
-            subprocess.run("python import_telkomcare_download.py", shell=True, check=False)
+            http_session = create_http_session()
+        except SessionExpiredError as e:
+            print(f"⚠️ Session HTTP tidak tersedia ({e}) → semua download via browser.")
+            http_session = None
 
-            # 2b. HSI24 GAUL → WECARE GAUL
-            download_wecare_gaul(driver)
-            subprocess.run("python import_telkomcare_wecare_gaul.py", shell=True, check=False)
-
-            # 3. DATIN24 → WECARE DATIN
-            download_report_datin(driver)
-            subprocess.run("python import_telkomcare_wecare_datin.py", shell=True, check=False)
-
-            # 4. TTR DATIN
-            download_ttr_datin(driver)
-            subprocess.run("python import_telkomcare_ttr_datin.py", shell=True, check=False)
-
-            # 5. TTR INDIBIZ
-            download_ttr_indibiz(driver)
-            subprocess.run("python import_telkomcare_ttr_indibiz.py", shell=True, check=False)
-
-            # 6. TTR RESELLER
-            download_ttr_reseller(driver)
-            subprocess.run("python import_telkomcare_ttr_reseller.py", shell=True, check=False)
+        try:
+            # 2. Download keenam report paralel (HTTP + satu lane browser)
+            with span("download"):
+                results = download_all(state["driver"], http_session, driver_factory=get_driver,
+                                       relogin=relogin)
+            for report in REPORT_ORDER:
+                res = results[report]
+                record_span("download", res["seconds"], report, ok=res["ok"])
+
+            # 3. Import in-process (client gspread di-authorize sekali per cycle)
+            with span("import"):
+                for report in REPORT_ORDER:
+                    res = results[report]
+                    if not res["ok"]:
+                        print(f"⏭  Skip import {report}: {res['error']}")
+                        continue
+                    try:
+                        import_report(report, res["file"])
+                    except Exception as e:
+                        print(f"❌ Error import {report}: {e}")
+
+            print_import_summary(results)
+            print_wait_summary()
 
         except Exception as e:
             print(f"❌ Error saat proses download/import: {e}")
 
     finally:
-        print("🧹 Menutup browser Selenium...")
-        if driver is not None:
-            driver.quit()
+        if http_session is not None:
+            http_session.close()
+        if PERSISTENT_BROWSER:
+            print("🧹 Lepas driver (Chrome persisten tetap hidup untuk cycle berikutnya)...")
+        else:
+            print("🧹 Menutup browser Selenium...")
+        close_driver(state["driver"])
+        finish_cycle(started_at, time.perf_counter() - cycle_start)
 
 
 if __name__ == "__main__":
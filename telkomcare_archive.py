@@ -0,0 +1,327 @@
+# telkomcare_archive.py
+"""
+Arsip lokal Parquet untuk setiap report yang berhasil di-parse, supaya
+pertanyaan historis tidak perlu export ulang dari portal.
+
+Layout (partisi gaya Hive, bisa dibaca langsung oleh pyarrow.dataset /
+DuckDB / Spark):
+    <TC_ARCHIVE_DIR>/report=ttr_datin/date=2026-10-18/093000_<hash12>.parquet
+
+Satu file = satu snapshot (hasil parse satu cycle), kompresi zstd dan
+dictionary encoding per kolom. Kolom tambahan _snapshot_at (timestamp
+snapshot) ikut ditulis supaya hasil baca lintas snapshot bisa dibedakan.
+
+Snapshot hasil backfill historis (telkomcare_backfill) diberi akhiran nama
+file _backfill (<HHMMSS>_<hash12>_backfill.parquet) dan tidak pernah ikut
+dihapus oleh retensi TC_ARCHIVE_KEEP_DAYS.
+
+Butuh pyarrow (opsional): tanpa pyarrow, arsip dilewati dengan peringatan
+dan cycle tetap jalan.
+
+Contoh baca:
+    from telkomcare_archive import read_archive
+    t = read_archive("TTR DATIN", start="2026-10-01", columns=["WITEL", "STATUS"])
+    df = t.to_pandas()
+"""
+import argparse
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from telkomcare_state import BASE_DIR
+
+# Default di luar .telkomcare_state: arsip jauh lebih besar dari state cycle
+ARCHIVE_DIR = Path(os.getenv("TC_ARCHIVE_DIR", str(BASE_DIR / "archive")))
+
+# TC_ARCHIVE=0 → tidak menulis arsip
+ARCHIVE_ENABLED = os.getenv("TC_ARCHIVE", "1") not in ("", "0", "false", "False")
+
+ARCHIVE_COMPRESSION = os.getenv("TC_ARCHIVE_COMPRESSION", "zstd")
+
+# Partisi tanggal yang lebih tua dari ini dihapus saat menulis (0 = simpan selamanya)
+ARCHIVE_KEEP_DAYS = int(os.getenv("TC_ARCHIVE_KEEP_DAYS", "90"))
+
+SNAPSHOT_COLUMN = "_snapshot_at"
+
+# Akhiran nama file snapshot backfill (dikecualikan dari retensi)
+BACKFILL_SUFFIX = "_backfill"
+
+_warned_missing = False
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow belum ter-install (pip install pyarrow) untuk arsip Parquet") from e
+    return pa, pq
+
+
+def report_slug(report):
+    """'TTR DATIN' → 'ttr_datin' (nama partisi report=...)."""
+    return report.lower().replace(" ", "_")
+
+
+# ===================== TULIS =====================
+
+def _arrow_array(pa, values):
+    """
+    Satu kolom ColumnTable → pyarrow Array. Kolom numerik langsung; kolom
+    object: "" (NA hasil fillna) dan NaT jadi null, lalu tipe dipilih dari
+    isinya (int / float / bool / timestamp), selain itu string. Kolom yang
+    seluruhnya kosong bertipe null, jadi ikut tipe snapshot lain saat dibaca.
+    """
+    if values.dtype.kind != "O":
+        return pa.array(values)
+    # v != v: NaT / NaN
+    items = [None if (isinstance(v, str) and not v) or v != v else v for v in values.tolist()]
+    present = [v for v in items if v is not None]
+    types = set(map(type, present))
+    if not present:
+        return pa.nulls(len(items))
+    if types <= {int}:
+        arrow_type = pa.int64()
+    elif types <= {int, float}:
+        arrow_type = pa.float64()
+    elif types == {bool}:
+        arrow_type = pa.bool_()
+    elif all(isinstance(v, datetime) for v in present):
+        arrow_type = pa.timestamp("us")
+    else:
+        arrow_type = pa.string()
+        items = [v if v is None or isinstance(v, str) else str(v) for v in items]
+    try:
+        return pa.array(items, type=arrow_type)
+    except (pa.ArrowInvalid, OverflowError, ValueError):
+        return pa.array([None if v is None else str(v) for v in items], type=pa.string())
+
+
+def to_arrow(table, captured_at):
+    """ColumnTable → pyarrow.Table (+ kolom _snapshot_at)."""
+    pa, _pq = _require_pyarrow()
+    arrays = [_arrow_array(pa, col) for col in table.columns]
+    names = list(table.names)
+    arrays.append(pa.array(np.full(len(table), np.datetime64(captured_at, "us"))))
+    names.append(SNAPSHOT_COLUMN)
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def snapshot_path(report, captured_at, digest, backfill=False):
+    suffix = BACKFILL_SUFFIX if backfill else ""
+    return (ARCHIVE_DIR / f"report={report_slug(report)}" / f"date={captured_at:%Y-%m-%d}"
+            / f"{captured_at:%H%M%S}_{digest[:12]}{suffix}.parquet")
+
+
+def is_backfill_snapshot(path):
+    return Path(path).stem.endswith(BACKFILL_SUFFIX)
+
+
+def archive_report(report, table, captured_at=None, metadata=None, backfill=False):
+    """
+    Tulis satu snapshot report (ColumnTable) ke arsip. Return dict
+    {"path", "bytes", "rows"} atau None kalau arsip mati / pyarrow tidak ada.
+    metadata: tambahan metadata schema Parquet. backfill=True → snapshot
+    historis (telkomcare_backfill): ditandai di nama file, tidak pernah
+    di-prune, dan penulisannya tidak memicu prune.
+    """
+    global _warned_missing
+    if not ARCHIVE_ENABLED or not table:
+        return None
+    try:
+        pa, pq = _require_pyarrow()
+    except ImportError as e:
+        if not _warned_missing:
+            print(f"⚠️ Arsip Parquet dilewati: {e}")
+            _warned_missing = True
+        return None
+
+    captured_at = (captured_at or datetime.now()).replace(microsecond=0)
+    path = snapshot_path(report, captured_at, table.digest()["content_hash"], backfill)
+    arrow_table = to_arrow(table, captured_at)
+    arrow_table = arrow_table.replace_schema_metadata({
+        "report": report,
+        "captured_at": captured_at.isoformat(),
+        "content_hash": table.digest()["content_hash"],
+        "source": "backfill" if backfill else "cycle",
+        **(metadata or {}),
+    })
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    pq.write_table(arrow_table, tmp, compression=ARCHIVE_COMPRESSION, use_dictionary=True)
+    os.replace(tmp, path)
+    size = path.stat().st_size
+    print(f"🗄️ Arsip {report}: {path.relative_to(ARCHIVE_DIR)} ({size / 1024:.0f} KB)")
+
+    if not backfill and ARCHIVE_KEEP_DAYS > 0:
+        prune_archive(report, ARCHIVE_KEEP_DAYS)
+    return {"path": str(path), "bytes": size, "rows": len(table)}
+
+
+def prune_archive(report, keep_days=ARCHIVE_KEEP_DAYS):
+    """
+    Hapus snapshot cycle di partisi date=... milik report yang lebih tua
+    dari keep_days. Snapshot backfill dipertahankan; partisi yang jadi
+    kosong ikut dihapus.
+    """
+    cutoff = date.today() - timedelta(days=keep_days)
+    for day, day_dir in _date_partitions(report):
+        if day >= cutoff:
+            continue
+        kept = [path for path in day_dir.glob("*.parquet") if is_backfill_snapshot(path)]
+        if not kept:
+            shutil.rmtree(day_dir, ignore_errors=True)
+            print(f"🧹 Arsip {report} {day} dihapus (> {keep_days} hari)")
+            continue
+        removed = 0
+        for path in day_dir.iterdir():
+            if path not in kept:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            print(f"🧹 Arsip {report} {day}: {removed} snapshot cycle dihapus (> {keep_days} hari), "
+                  f"{len(kept)} snapshot backfill dipertahankan")
+
+
+# ===================== BACA =====================
+
+def _as_datetime(value, end=False):
+    """None / 'YYYY-MM-DD[ HH:MM[:SS]]' / date / datetime → datetime (atau None)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value)
+        if len(value) > 10:
+            return parsed
+        value = parsed.date()
+    # Tanggal saja: start = awal hari, end = akhir hari (inklusif)
+    return datetime.combine(value, datetime.max.time() if end else datetime.min.time())
+
+
+def _date_partitions(report):
+    root = ARCHIVE_DIR / f"report={report_slug(report)}"
+    if not root.is_dir():
+        return []
+    out = []
+    for day_dir in root.iterdir():
+        try:
+            out.append((date.fromisoformat(day_dir.name.removeprefix("date=")), day_dir))
+        except ValueError:
+            continue
+    return sorted(out)
+
+
+def list_snapshots(report, start=None, end=None, backfill=None):
+    """
+    Snapshot arsip report dalam rentang [start, end] (inklusif), urut waktu:
+    list of (captured_at, path). Partisi tanggal di luar rentang tidak dibuka.
+    backfill=True/False → hanya snapshot backfill / hanya snapshot cycle.
+    """
+    start, end = _as_datetime(start), _as_datetime(end, end=True)
+    out = []
+    for day, day_dir in _date_partitions(report):
+        if (start and day < start.date()) or (end and day > end.date()):
+            continue
+        for path in sorted(day_dir.glob("*.parquet")):
+            if backfill is not None and is_backfill_snapshot(path) != backfill:
+                continue
+            try:
+                captured_at = datetime.combine(day, datetime.strptime(path.stem[:6], "%H%M%S").time())
+            except ValueError:
+                continue
+            if (start and captured_at < start) or (end and captured_at > end):
+                continue
+            out.append((captured_at, path))
+    return out
+
+
+def _common_type(pa, types):
+    """Tipe gabungan satu kolom antar snapshot: int+float → float64, bentrok lain → string."""
+    types = {t for t in types if not pa.types.is_null(t)}
+    if not types:
+        return pa.null()
+    if len(types) == 1:
+        return types.pop()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def _unify_columns(pa, tables):
+    """
+    Samakan tipe kolom yang bentrok antar snapshot (mis. TTR double di satu
+    jam, string di jam lain) supaya concat_tables tidak gagal.
+    """
+    types = {}
+    for table in tables:
+        for field in table.schema:
+            types.setdefault(field.name, set()).add(field.type)
+    target = {name: _common_type(pa, found) for name, found in types.items() if len(found) > 1}
+    out = []
+    for table in tables:
+        for name, arrow_type in target.items():
+            i = table.schema.get_field_index(name)
+            if i >= 0 and table.schema.field(i).type != arrow_type:
+                table = table.set_column(i, name, table.column(i).cast(arrow_type))
+        out.append(table)
+    return out
+
+
+def read_archive(report, start=None, end=None, columns=None, latest=False):
+    """
+    Baca snapshot report dalam rentang waktu sebagai satu pyarrow.Table.
+    columns: proyeksi kolom (hanya kolom itu yang dibaca dari disk);
+    _snapshot_at selalu ikut. latest=True → hanya snapshot terakhir di rentang.
+    Kolom yang tidak ada di snapshot lama diisi null; kolom yang tipenya
+    beda antar snapshot disamakan (_unify_columns).
+    """
+    pa, pq = _require_pyarrow()
+    snapshots = list_snapshots(report, start, end)
+    if latest:
+        snapshots = snapshots[-1:]
+
+    tables = []
+    for _captured_at, path in snapshots:
+        pf = pq.ParquetFile(path)
+        wanted = None
+        if columns is not None:
+            present = set(pf.schema_arrow.names)
+            wanted = [c for c in dict.fromkeys([*columns, SNAPSHOT_COLUMN]) if c in present]
+        tables.append(pf.read(columns=wanted).replace_schema_metadata(None))
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(_unify_columns(pa, tables), promote_options="permissive")
+
+
+# ===================== CLI =====================
+
+def main():
+    parser = argparse.ArgumentParser(description="Lihat / query arsip Parquet report TelkomCare")
+    parser.add_argument("report", help='nama report, mis. "TTR DATIN"')
+    parser.add_argument("--start", help="YYYY-MM-DD atau YYYY-MM-DD HH:MM")
+    parser.add_argument("--end", help="YYYY-MM-DD atau YYYY-MM-DD HH:MM")
+    parser.add_argument("--columns", nargs="+", help="proyeksi kolom")
+    parser.add_argument("--latest", action="store_true", help="hanya snapshot terakhir")
+    parser.add_argument("--csv", help="tulis hasil ke CSV")
+    args = parser.parse_args()
+
+    snapshots = list_snapshots(args.report, args.start, args.end)
+    print(f"🗄️ {len(snapshots)} snapshot {args.report} di {ARCHIVE_DIR}")
+    start = time.perf_counter()
+    table = read_archive(args.report, args.start, args.end, args.columns, args.latest)
+    seconds = time.perf_counter() - start
+    print(f"✓ {table.num_rows} baris × {table.num_columns} kolom dibaca dalam {seconds * 1000:.0f} ms")
+    if table.num_rows:
+        print(table.slice(0, 5).to_pandas().to_string())
+    if args.csv:
+        table.to_pandas().to_csv(args.csv, index=False)
+        print(f"💾 Ditulis ke {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# telkomcare_backfill.py
+"""
+Backfill historis arsip Parquet: fetch report per hari untuk rentang tanggal
+lampau (via HTTP, cookie cookies.env), parse, lalu tulis snapshot ke arsip
+(telkomcare_archive) di partisi date=<hari itu>.
+
+Satu hari = satu export per report:
+  TTR DATIN / TTR INDIBIZ / TTR RESELLER : detailrescomp25 startdate=enddate=hari
+  WECARE GAUL                            : detailsugar25 enddate=hari
+WECARE HSI dan WECARE DATIN butuh klik SUBMIT di UI (tidak ada URL export
+bertanggal), jadi tidak bisa di-backfill.
+
+Resumable: hari yang sudah punya snapshot backfill di arsip dilewati, dan
+progres (termasuk hari tanpa tiket) dicatat di <TC_STATE_DIR>/backfill.json
+begitu satu hari selesai. Kalau proses berhenti (Ctrl+C, cookie expired,
+runner mati), jalankan ulang perintah yang sama untuk melanjutkan.
+Snapshot cycle per jam tidak dihitung: isinya hanya month-to-date yang
+belum tutup, jadi hari itu tetap di-backfill.
+
+Snapshot backfill ditandai di nama file (*_backfill.parquet) dan tidak ikut
+dihapus retensi TC_ARCHIVE_KEEP_DAYS cycle biasa.
+
+Contoh:
+  python telkomcare_backfill.py --start 2025-10-01 --end 2026-09-30
+  python telkomcare_backfill.py --start 2026-01-01 --reports "TTR DATIN" "WECARE GAUL" --workers 6
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from telkomcare_archive import (
+    ARCHIVE_DIR,
+    ARCHIVE_ENABLED,
+    _require_pyarrow,
+    archive_report,
+    list_snapshots,
+    report_slug,
+)
+from telkomcare_downloads import _build_gaul_url, _build_ttr_url
+from telkomcare_http import SessionExpiredError, create_http_session, fetch_to_file
+from telkomcare_importer import PARSERS, REPORTS
+from telkomcare_state import STATE_DIR, read_json, write_json
+
+PROGRESS_PATH = STATE_DIR / "backfill.json"
+
+# Export yang jalan bersamaan (semua report digabung)
+BACKFILL_WORKERS = int(os.getenv("TC_BACKFILL_WORKERS", "4"))
+
+BACKFILL_RETRIES = 3
+
+# Report yang punya URL export bertanggal → fungsi hari → URL
+BACKFILL_URLS = {
+    "WECARE GAUL": lambda day: _build_gaul_url(enddate=day.isoformat()),
+    "TTR DATIN": lambda day: _build_ttr_url("DATIN24", day.isoformat(), day.isoformat()),
+    "TTR INDIBIZ": lambda day: _build_ttr_url("INDIBIZ", day.isoformat(), day.isoformat()),
+    "TTR RESELLER": lambda day: _build_ttr_url("RESELLER", day.isoformat(), day.isoformat()),
+}
+
+
+# ===================== PROGRES =====================
+
+class Progress:
+    """Status per (report, hari) di backfill.json, ditulis atomik tiap hari selesai."""
+
+    def __init__(self, path=PROGRESS_PATH):
+        self.path = Path(path)
+        self.data = read_json(self.path, default={}) or {}
+        self.lock = threading.Lock()
+
+    def get(self, report, day):
+        return self.data.get(report, {}).get(day.isoformat())
+
+    def set(self, report, day, **entry):
+        entry["at"] = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            self.data.setdefault(report, {})[day.isoformat()] = entry
+            write_json(self.path, self.data, indent=1, sort_keys=True)
+
+
+def _days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def pending_days(report, start, end, progress, force=False):
+    """Hari di [start, end] yang belum punya snapshot backfill dan belum tercatat kosong."""
+    if force:
+        return _days(start, end)
+    archived = {captured_at.date() for captured_at, _path in list_snapshots(report, start, end, backfill=True)}
+    return [
+        day for day in _days(start, end)
+        if day not in archived and (progress.get(report, day) or {}).get("status") != "empty"
+    ]
+
+
+# ===================== SATU HARI =====================
+
+def _parse(report, file_path):
+    """Export → ColumnTable (kosong kalau hari itu tidak ada tiket / tidak ada tabel)."""
+    try:
+        return PARSERS[REPORTS[report]["parser"]](file_path)
+    except ValueError:
+        # "No tables found": export tanpa tiket
+        return None
+
+
+def backfill_day(session, report, day, work_dir):
+    """
+    Fetch + parse + arsip satu report untuk satu hari. Return dict status
+    ("archived" / "empty"). Raise SessionExpiredError apa adanya; error lain
+    di-retry BACKFILL_RETRIES kali.
+    """
+    path = Path(work_dir) / f"{report_slug(report)}_{day.isoformat()}.xls"
+    for attempt in range(1, BACKFILL_RETRIES + 1):
+        try:
+            started = time.time()
+            fetch_to_file(session, BACKFILL_URLS[report](day), path)
+            table = _parse(report, str(path))
+            break
+        except SessionExpiredError:
+            raise
+        except Exception as e:
+            if attempt == BACKFILL_RETRIES:
+                raise
+            wait = 2 ** attempt
+            print(f"   ⚠️ {report} {day} gagal ({type(e).__name__}: {e}), "
+                  f"retry {attempt}/{BACKFILL_RETRIES - 1} dalam {wait}s")
+            time.sleep(wait)
+        finally:
+            path.unlink(missing_ok=True)
+
+    seconds = round(time.time() - started, 2)
+    if not table:
+        return {"status": "empty", "rows": 0, "seconds": seconds}
+    # Snapshot "akhir hari": hari yang di-backfill sudah tutup
+    archived = archive_report(report, table, captured_at=datetime.combine(day, datetime.max.time()),
+                              metadata={"day": day.isoformat()}, backfill=True)
+    if archived is None:
+        raise RuntimeError("arsip tidak ditulis (TC_ARCHIVE=0 atau pyarrow tidak ada)")
+    return {"status": "archived", "rows": archived["rows"], "bytes": archived["bytes"],
+            "seconds": seconds}
+
+
+# ===================== RENTANG =====================
+
+def backfill(reports, start, end, workers=None, force=False, session=None):
+    """
+    Backfill report (list nama) untuk hari start..end (date, inklusif).
+    Hari di-jadwalkan berurutan (semua report untuk satu hari dulu), maks
+    `workers` export bersamaan. Return dict hitungan status.
+    """
+    workers = max(1, workers or BACKFILL_WORKERS)
+    progress = Progress()
+    tasks = []
+    skipped = 0
+    for report in reports:
+        todo = pending_days(report, start, end, progress, force)
+        skipped += len(_days(start, end)) - len(todo)
+        tasks += [(day, report) for day in todo]
+    tasks.sort()
+
+    print("\n" + "=" * 70)
+    print(f"🕰️ BACKFILL {start}..{end}: {len(tasks)} export ({skipped} hari sudah ada) "
+          f"untuk {', '.join(reports)} (workers={workers})")
+    print("=" * 70)
+    counts = {"archived": 0, "empty": 0, "failed": 0, "skipped": skipped, "aborted": 0}
+    if not tasks:
+        return counts
+
+    session = session or create_http_session(pool_size=workers)
+    stop = threading.Event()
+    started = time.time()
+
+    def run(day, report):
+        if stop.is_set():
+            return None
+        return backfill_day(session, report, day, work_dir)
+
+    with tempfile.TemporaryDirectory(prefix="telkomcare_backfill_") as work_dir, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+        futures = {pool.submit(run, day, report): (day, report) for day, report in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            day, report = futures[future]
+            try:
+                result = future.result()
+            except SessionExpiredError as e:
+                if not stop.is_set():
+                    print(f"❌ Session expired ({e}) → backfill dihentikan. "
+                          "Login ulang (run_cycle.py) lalu jalankan perintah yang sama untuk melanjutkan.")
+                stop.set()
+                counts["aborted"] += 1
+                continue
+            except Exception as e:
+                counts["failed"] += 1
+                progress.set(report, day, status="failed", error=f"{type(e).__name__}: {e}")
+                print(f"   ❌ [{done}/{len(tasks)}] {report} {day}: {type(e).__name__}: {e}")
+                continue
+            if result is None:
+                counts["aborted"] += 1
+                continue
+            counts[result["status"]] += 1
+            progress.set(report, day, **result)
+            elapsed = time.time() - started
+            eta = elapsed / done * (len(tasks) - done)
+            print(f"   ✓ [{done}/{len(tasks)}] {report} {day}: {result['rows']} baris "
+                  f"({result['seconds']:.1f}s, sisa ~{eta / 60:.0f} menit)")
+
+    print(f"\n🕰️ Backfill selesai dalam {(time.time() - started) / 60:.1f} menit: "
+          f"{counts['archived']} diarsip, {counts['empty']} kosong, {counts['failed']} gagal, "
+          f"{counts['skipped']} dilewati" + (f", {counts['aborted']} dibatalkan" if counts["aborted"] else ""))
+    return counts
+
+
+# ===================== CLI =====================
+
+def _resolve_report(name):
+    for report in REPORTS:
+        if name.strip().lower() in (report.lower(), report_slug(report)):
+            return report
+    raise ValueError(f"report tidak dikenal: {name}")
+
+
+def main():
+    yesterday = date.today() - timedelta(days=1)
+    parser = argparse.ArgumentParser(description="Backfill histori report TelkomCare ke arsip Parquet")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, default=yesterday,
+                        help="YYYY-MM-DD (default kemarin)")
+    parser.add_argument("--reports", nargs="+", default=list(BACKFILL_URLS),
+                        help='nama report, mis. "TTR DATIN" atau ttr_datin (default semua yang bisa)')
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help="export bersamaan")
+    parser.add_argument("--force", action="store_true", help="fetch ulang hari yang sudah ada di arsip")
+    args = parser.parse_args()
+
+    try:
+        reports = [_resolve_report(name) for name in args.reports]
+    except ValueError as e:
+        parser.error(str(e))
+    unsupported = [r for r in reports if r not in BACKFILL_URLS]
+    if unsupported:
+        parser.error(f"{', '.join(unsupported)} butuh UI browser, tidak bisa di-backfill via HTTP")
+    if not ARCHIVE_ENABLED:
+        parser.error("arsip mati (TC_ARCHIVE=0), tidak ada tujuan backfill")
+    _require_pyarrow()
+
+    # Hari ini belum tutup → bagian cycle biasa
+    end = min(args.end, yesterday)
+    if args.start > end:
+        parser.error(f"rentang kosong: {args.start}..{end}")
+    print(f"🗄️ Arsip: {ARCHIVE_DIR}")
+    counts = backfill(reports, args.start, end, args.workers, args.force)
+    if counts["failed"] or counts["aborted"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
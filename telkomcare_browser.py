@@ -0,0 +1,181 @@
+# telkomcare_browser.py
+import os
+import signal
+import subprocess
+import time
+from pathlib import Path
+from shutil import which
+
+import requests
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+
+# Mode browser persisten: satu Chrome headless dengan user-data-dir tetap dan
+# remote-debugging port yang hidup lintas cycle. Tiap cycle hanya attach
+# (chromedriver + debuggerAddress), jadi profil (cookie login, cache HTTP)
+# tetap hangat. Aktif kalau TC_PERSISTENT_BROWSER=1.
+PERSISTENT_BROWSER = os.getenv("TC_PERSISTENT_BROWSER", "") not in ("", "0", "false", "False")
+
+PROFILE_DIR = Path(os.getenv("TC_CHROME_PROFILE_DIR", str(Path.home() / ".telkomcare_chrome")))
+DEBUG_PORT = int(os.getenv("TC_CHROME_DEBUG_PORT", "9222"))
+PID_FILE = PROFILE_DIR / "telkomcare_chrome.pid"
+
+STARTUP_TIMEOUT = 20
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chrome", "chromium", "chromium-browser")
+
+
+# ===================== PROSES CHROME =====================
+
+def _chrome_binary():
+    env_bin = os.getenv("TC_CHROME_BINARY")
+    if env_bin:
+        return env_bin
+    for name in CHROME_BINARIES:
+        path = which(name)
+        if path:
+            return path
+    raise RuntimeError("Binary Chrome tidak ditemukan (set TC_CHROME_BINARY)")
+
+
+def is_browser_alive(port=DEBUG_PORT, timeout=2):
+    """True kalau endpoint DevTools /json/version menjawab."""
+    try:
+        resp = requests.get(f"http://127.0.0.1:{port}/json/version", timeout=timeout)
+        return resp.ok
+    except requests.RequestException:
+        return False
+
+
+def _kill_stale_browser():
+    try:
+        pid = int(PID_FILE.read_text().strip())
+    except (OSError, ValueError):
+        return
+    try:
+        os.killpg(pid, signal.SIGTERM)
+        print(f"🧹 Chrome lama (pid {pid}) dihentikan.")
+    except (ProcessLookupError, PermissionError):
+        pass
+    PID_FILE.unlink(missing_ok=True)
+
+
+def launch_browser(port=DEBUG_PORT):
+    """
+    Start Chrome headless yang lepas dari proses ini (session sendiri),
+    jadi tetap hidup setelah cycle selesai.
+    """
+    _kill_stale_browser()
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        _chrome_binary(),
+        "--headless=new",
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={PROFILE_DIR}",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--disable-extensions",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--password-store=basic",
+        "--window-size=1280,800",
+        "about:blank",
+    ]
+    start = time.time()
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    PID_FILE.write_text(str(proc.pid))
+
+    while time.time() - start < STARTUP_TIMEOUT:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Chrome langsung keluar (exit {proc.returncode})")
+        if is_browser_alive(port, timeout=0.5):
+            print(f"🚀 Chrome persisten siap dalam {time.time() - start:.1f}s "
+                  f"(port {port}, profil {PROFILE_DIR})")
+            return proc.pid
+        time.sleep(0.2)
+    raise RuntimeError(f"Chrome tidak menjawab di port {port} setelah {STARTUP_TIMEOUT}s")
+
+
+# ===================== ATTACH & HEALTH CHECK =====================
+
+def _attach(port):
+    options = Options()
+    options.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
+    service = Service(which("chromedriver"))
+    return webdriver.Chrome(service=service, options=options)
+
+
+def is_driver_healthy(driver):
+    """Driver masih tersambung dan punya tab yang bisa dipakai."""
+    try:
+        driver.execute_script("return 1")
+        return bool(driver.window_handles)
+    except WebDriverException:
+        return False
+
+
+def _reset_tabs(driver):
+    """Sisakan satu tab (sisa cycle sebelumnya ditutup)."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+
+def get_persistent_driver(port=DEBUG_PORT):
+    """
+    Driver yang attach ke Chrome persisten. Chrome di-start kalau belum
+    hidup, dan di-respawn sekali kalau attach / health check gagal.
+    """
+    for attempt in (1, 2):
+        if not is_browser_alive(port):
+            print("🌐 Chrome persisten belum hidup → start baru...")
+            launch_browser(port)
+        else:
+            print(f"♻️ Attach ke Chrome persisten (port {port})")
+
+        try:
+            driver = _attach(port)
+            if is_driver_healthy(driver):
+                _reset_tabs(driver)
+                return driver
+            release_driver(driver)
+        except WebDriverException as e:
+            print(f"⚠️ Attach ke Chrome gagal (attempt {attempt}): {e}")
+
+        # Browser ada tapi tidak sehat → matikan dan start ulang
+        _kill_stale_browser()
+    raise RuntimeError("Chrome persisten tidak bisa dipakai setelah respawn")
+
+
+def release_driver(driver):
+    """
+    Lepas driver tanpa menutup Chrome persisten: hanya proses chromedriver
+    yang dihentikan (tanpa DELETE session yang bisa menutup browser).
+    """
+    try:
+        driver.service.stop()
+    except Exception:
+        pass
+
+
+def close_driver(driver):
+    """Akhiri pemakaian driver: release kalau mode persisten, quit kalau biasa."""
+    if driver is None:
+        return
+    if PERSISTENT_BROWSER:
+        release_driver(driver)
+        return
+    try:
+        driver.quit()
+    except Exception:
+        pass
@@ -0,0 +1,208 @@
+# telkomcare_captcha.py
+import os
+import warnings
+import logging
+
+os.environ["KMP_DUPLICATE_LIB_OK"] = "True"
+warnings.filterwarnings("ignore", message=".*pin_memory.*")
+warnings.filterwarnings("ignore", message=".*CUDA not available.*")
+
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from telkomcare_glyph import GLYPH_MODEL_PATH, load_model, solve_captcha_glyph
+
+# OCR captcha TelkomCare tanpa Selenium/kredensial, supaya bisa dipakai
+# login (telkomcare_login) maupun benchmark offline (bench_captcha.py).
+
+# Folder korpus captcha (screenshot asli + label). Kosong = tidak menyimpan.
+#   <dir>/<label>_<timestamp>.png           : captcha yang diterima server
+#   <dir>/unlabeled/<timestamp>_<ocr>.png   : captcha yang ditolak (label tidak diketahui)
+CAPTCHA_CORPUS_DIR = os.getenv("TC_CAPTCHA_CORPUS_DIR", "")
+
+# Backend OCR untuk login: "easyocr" (default) atau "glyph" (tanpa torch,
+# butuh model dari `python telkomcare_glyph.py train ...`)
+CAPTCHA_BACKEND = os.getenv("TC_CAPTCHA_BACKEND", "easyocr").lower()
+
+# ==================== EASYOCR READER ====================
+
+# EasyOCR untuk bahasa Indonesia. Reader (torch + model deteksi/rekognisi)
+# baru dibuat saat captcha pertama kali dibaca, jadi cycle dengan cookie
+# valid tidak pernah memuatnya. Bobot model disimpan di EASYOCR_MODEL_DIR
+# (di GitHub Actions folder ini di-cache antar run).
+EASYOCR_MODEL_DIR = Path(
+    os.getenv("TC_EASYOCR_MODEL_DIR", str(Path.home() / ".EasyOCR" / "model"))
+)
+
+_reader = None
+_reader_lock = threading.Lock()
+
+
+def get_reader():
+    """easyocr.Reader yang dibuat sekali per proses (lazy)."""
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            start = time.time()
+            import easyocr
+
+            EASYOCR_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+            _reader = easyocr.Reader(
+                ["id"],
+                gpu=False,
+                model_storage_directory=str(EASYOCR_MODEL_DIR),
+                verbose=False,
+            )
+            logging.info(f"EasyOCR reader siap dalam {time.time() - start:.1f}s ({EASYOCR_MODEL_DIR})")
+    return _reader
+
+
+# ==================== CAPTCHA OCR ====================
+
+# Strategi recognizer, dicoba berurutan di atas box hasil deteksi yang sama
+CAPTCHA_STRATEGIES = [
+    ("alnum", "0123456789abcdefghijklmnopqrstuvwxyz"),
+    ("digit", "0123456789"),
+    ("free", None),
+]
+
+# Berhenti kalau confidence kandidat >= ini dan panjangnya sesuai
+CAPTCHA_MIN_CONFIDENCE = float(os.getenv("TC_CAPTCHA_MIN_CONF", "0.6"))
+
+# Panjang captcha yang diharapkan (0 = terima 4..8 karakter)
+CAPTCHA_LENGTH = int(os.getenv("TC_CAPTCHA_LENGTH", "0"))
+
+
+def _clean_captcha_text(raw):
+    teks = raw.lower().replace(" ", "")
+    return "".join(ch for ch in teks if ch.isalnum())
+
+
+def _captcha_length_ok(teks):
+    if CAPTCHA_LENGTH:
+        return len(teks) == CAPTCHA_LENGTH
+    return 4 <= len(teks) <= 8
+
+
+def preprocess_captcha(img_bytes):
+    """PNG screenshot captcha → grayscale 2x + blur ringan (input OCR)."""
+    nparr = np.frombuffer(img_bytes, np.uint8)
+    img = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
+    img = cv2.resize(img, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_LINEAR)
+    return cv2.GaussianBlur(img, (3, 3), 0)
+
+
+def solve_captcha_image(img):
+    """
+    OCR captcha dari gambar grayscale yang sudah dipreprocess.
+    Deteksi teks sekali, lalu box yang sama dikenali per allowlist
+    (CAPTCHA_STRATEGIES); berhenti di kandidat pertama yang confidence-nya
+    >= CAPTCHA_MIN_CONFIDENCE dan panjangnya sesuai. Kalau tidak ada,
+    pilih kandidat dengan confidence tertinggi (yang panjangnya sesuai dulu).
+
+    Return: (teks, info) — info berisi strategy, confidence, ms per tahap.
+    """
+    reader = get_reader()
+    start = time.perf_counter()
+
+    horizontal_list, free_list = reader.detect(img)
+    horizontal_list, free_list = horizontal_list[0], free_list[0]
+    if not horizontal_list and not free_list:
+        # Tidak ada box terdeteksi → recognizer membaca seluruh gambar
+        horizontal_list, free_list = None, None
+    timings = {"detect": (time.perf_counter() - start) * 1000}
+
+    candidates = []
+    winner = None
+    early_exit = False
+    for name, allowlist in CAPTCHA_STRATEGIES:
+        t0 = time.perf_counter()
+        results = reader.recognize(
+            img,
+            horizontal_list=horizontal_list,
+            free_list=free_list,
+            allowlist=allowlist,
+            detail=1,
+        )
+        timings[name] = (time.perf_counter() - t0) * 1000
+
+        # Urutkan box kiri → kanan, gabungkan teksnya
+        results = sorted(results, key=lambda r: min(p[0] for p in r[0]))
+        teks = _clean_captcha_text("".join(r[1] for r in results))
+        confidence = min((float(r[2]) for r in results), default=0.0)
+        if not teks:
+            continue
+        cand = {"text": teks, "confidence": confidence, "strategy": name}
+        candidates.append(cand)
+        if confidence >= CAPTCHA_MIN_CONFIDENCE and _captcha_length_ok(teks):
+            winner, early_exit = cand, True
+            break
+
+    if winner is None and candidates:
+        winner = max(candidates, key=lambda c: (_captcha_length_ok(c["text"]), c["confidence"]))
+
+    info = {
+        "strategy": winner["strategy"] if winner else None,
+        "confidence": winner["confidence"] if winner else 0.0,
+        "early_exit": early_exit,
+        "ms": timings,
+        "total_ms": (time.perf_counter() - start) * 1000,
+        "candidates": candidates,
+    }
+    return (winner["text"] if winner else ""), info
+
+
+# Backend solver yang bisa dipilih (login: TC_CAPTCHA_BACKEND; benchmark: semua)
+SOLVERS = {
+    "easyocr": solve_captcha_image,
+    "glyph": lambda img: solve_captcha_glyph(img, CAPTCHA_LENGTH or None),
+}
+
+
+def get_solver():
+    """
+    Solver sesuai TC_CAPTCHA_BACKEND. Backend glyph tanpa file model
+    jatuh ke EasyOCR supaya login tetap jalan.
+    """
+    backend = CAPTCHA_BACKEND if CAPTCHA_BACKEND in SOLVERS else "easyocr"
+    if backend == "glyph" and load_model() is None:
+        logging.warning(f"Model glyph {GLYPH_MODEL_PATH} belum ada → pakai EasyOCR")
+        backend = "easyocr"
+    return backend, SOLVERS[backend]
+
+
+# ==================== KORPUS ====================
+
+def save_captcha_sample(img_bytes, text, accepted):
+    """
+    Simpan screenshot captcha ke korpus (kalau TC_CAPTCHA_CORPUS_DIR di-set).
+    Captcha yang diterima server jadi sampel berlabel untuk benchmark.
+    """
+    if not CAPTCHA_CORPUS_DIR or not img_bytes:
+        return None
+    stamp = time.strftime("%Y%m%d_%H%M%S") + f"{time.time() % 1:.3f}"[1:]
+    if accepted:
+        path = Path(CAPTCHA_CORPUS_DIR) / f"{text}_{stamp}.png"
+    else:
+        path = Path(CAPTCHA_CORPUS_DIR) / "unlabeled" / f"{stamp}_{text or 'empty'}.png"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(img_bytes)
+    except OSError as e:
+        logging.warning(f"Gagal simpan sampel captcha: {e}")
+        return None
+    return path
+
+
+def load_corpus(directory):
+    """List (label, png_bytes, path) dari file <label>_*.png di directory (tidak rekursif)."""
+    samples = []
+    for path in sorted(Path(directory).glob("*.png")):
+        label = path.stem.split("_", 1)[0].lower()
+        if label:
+            samples.append((label, path.read_bytes(), path))
+    return samples
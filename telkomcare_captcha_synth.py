@@ -0,0 +1,99 @@
+# telkomcare_captcha_synth.py
+import random
+
+import cv2
+import numpy as np
+
+# Generator captcha sintetis yang meniru #captcha-element img TelkomCare:
+# huruf kecil + angka gelap di latar terang, tiap karakter sedikit
+# diputar/digeser, ditambah garis pengganggu dan bintik noise.
+
+CAPTCHA_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+WIDTH, HEIGHT = 150, 50
+
+_FONTS = [
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+]
+
+
+def random_text(rng, length=5):
+    return "".join(rng.choice(CAPTCHA_CHARS) for _ in range(length))
+
+
+def _render_char(ch, font, scale, thickness, color, angle):
+    """Satu karakter di kanvas transparan (mask + warna), sudah diputar."""
+    (w, h), base = cv2.getTextSize(ch, font, scale, thickness)
+    size = max(w, h + base) + 8
+    mask = np.zeros((size, size), np.uint8)
+    org = ((size - w) // 2, (size + h) // 2 - base // 2)
+    cv2.putText(mask, ch, org, font, scale, 255, thickness, cv2.LINE_AA)
+    rot = cv2.getRotationMatrix2D((size / 2, size / 2), angle, 1.0)
+    mask = cv2.warpAffine(mask, rot, (size, size))
+    return mask, color
+
+
+def render_captcha(text, rng=None, width=WIDTH, height=HEIGHT):
+    """Gambar captcha BGR (numpy uint8) untuk text."""
+    rng = rng or random.Random()
+    bg = rng.randint(225, 255)
+    img = np.full((height, width, 3), bg, np.uint8)
+
+    # Bintik noise di latar
+    for _ in range(rng.randint(60, 140)):
+        x, y = rng.randrange(width), rng.randrange(height)
+        shade = rng.randint(90, 200)
+        img[y, x] = (shade, shade, shade)
+
+    font = rng.choice(_FONTS)
+    n = max(1, len(text))
+    step = (width - 16) / n
+    for i, ch in enumerate(text):
+        scale = rng.uniform(0.85, 1.05)
+        thickness = rng.choice([1, 2, 2])
+        color = tuple(rng.randint(0, 110) for _ in range(3))
+        mask, color = _render_char(ch, font, scale, thickness, color, rng.uniform(-20, 20))
+
+        size = mask.shape[0]
+        cx = int(8 + step * i + step / 2 + rng.uniform(-3, 3))
+        cy = int(height / 2 + rng.uniform(-4, 4))
+        x0, y0 = cx - size // 2, cy - size // 2
+
+        # Tempel mask ke gambar (dipotong di tepi kanvas)
+        sx0, sy0 = max(0, -x0), max(0, -y0)
+        dx0, dy0 = max(0, x0), max(0, y0)
+        dx1, dy1 = min(width, x0 + size), min(height, y0 + size)
+        if dx1 <= dx0 or dy1 <= dy0:
+            continue
+        m = mask[sy0:sy0 + (dy1 - dy0), sx0:sx0 + (dx1 - dx0)].astype(np.float32) / 255.0
+        region = img[dy0:dy1, dx0:dx1].astype(np.float32)
+        region = region * (1 - m[..., None]) + np.array(color, np.float32) * m[..., None]
+        img[dy0:dy1, dx0:dx1] = region.astype(np.uint8)
+
+    # Garis pengganggu melintang
+    for _ in range(rng.randint(2, 4)):
+        p1 = (rng.randrange(width), rng.randrange(height))
+        p2 = (rng.randrange(width), rng.randrange(height))
+        shade = tuple(rng.randint(60, 170) for _ in range(3))
+        cv2.line(img, p1, p2, shade, 1, cv2.LINE_AA)
+
+    return img
+
+
+def generate_captcha_png(text=None, rng=None, length=5):
+    """Return (text, png_bytes) captcha sintetis."""
+    rng = rng or random.Random()
+    text = text or random_text(rng, length)
+    ok, buf = cv2.imencode(".png", render_captcha(text, rng))
+    if not ok:
+        raise RuntimeError("cv2.imencode gagal membuat PNG captcha")
+    return text, buf.tobytes()
+
+
+def generate_corpus(n, seed=0, length=5):
+    """List (label, png_bytes, None) sebanyak n, deterministik per seed."""
+    rng = random.Random(seed)
+    return [(*generate_captcha_png(rng=rng, length=length), None) for _ in range(n)]
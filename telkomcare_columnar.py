@@ -0,0 +1,203 @@
+# telkomcare_columnar.py
+"""
+Tabel report kolumnar: satu array NumPy per kolom, dari parse sampai payload
+Sheets. Kolom numerik tanpa sel kosong disimpan tanpa boxing (int64 /
+float64 / bool); kolom lain (teks, kolom yang punya "" hasil fillna) berupa
+array object. Lebar tabel sudah final sejak dibuat, jadi tidak ada salinan
+baris untuk padding, dan baris Python hanya dibuat untuk potongan yang
+sedang dikirim (rows(start, end)).
+
+Nilai yang keluar dari rows()/iterasi sama persis dengan
+df.fillna("").values.tolist() versi lama, sehingga hash shadow/snapshot
+yang sudah tersimpan tetap cocok.
+"""
+import hashlib
+import json
+from itertools import zip_longest
+
+import numpy as np
+
+# Baris dimaterialisasi per blok saat iterasi / hashing
+BLOCK_ROWS = 4096
+
+_NUMERIC_DTYPES = {int: np.int64, float: np.float64, bool: np.bool_}
+
+# Kolom report (header, tidak case-sensitive) → field tiket; kandidat pertama yang ada dipakai
+FIELD_COLUMNS = {
+    "ticket_id": ("INCIDENT", "TICKET ID", "NO TIKET", "NOMOR TIKET", "TROUBLE NO", "TICKET"),
+    "status": ("STATUS", "STATUS TIKET", "TICKET STATUS"),
+    "witel": ("WITEL",),
+    "reported_at": ("REPORTED DATE", "REPORTED_DATE", "TGL OPEN", "OPEN DATE"),
+    "ttr_hours": ("TTR CUSTOMER", "TTR", "TTR (JAM)"),
+    "comply": ("COMPLY", "COMPLIANCE", "STATUS COMPLY"),
+}
+
+# Nomor urut baris: bergeser kalau ada tiket baru di atas, jadi tidak ikut hash
+ROW_NUMBER_COLUMNS = {"NO", "NO.", "#"}
+
+
+def column_array(values, kind=None):
+    """
+    list nilai satu kolom → array NumPy. Kolom yang semua nilainya satu tipe
+    numerik (int/float/bool) jadi array bertipe; campuran / teks / "" → object,
+    supaya tolist() mengembalikan objek Python yang sama persis.
+    kind (opsional, dari inferensi parser) menghemat pengecekan tipe.
+    """
+    if kind in ("int", "float", "int_as_float", "bool") and "" not in values:
+        py_type = {"int": int, "bool": bool}.get(kind, float)
+    else:
+        types = set(map(type, values))
+        py_type = types.pop() if len(types) == 1 else None
+    dtype = _NUMERIC_DTYPES.get(py_type)
+    if dtype is not None:
+        try:
+            return np.array(values, dtype=dtype)
+        except OverflowError:
+            pass  # int di luar int64 → simpan sebagai object
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def column_names(names, width):
+    """
+    Nama kolom unik sepanjang width: kosong / kurang → kolom_<n>, nama
+    dobel diberi akhiran .1, .2, ... (seperti pandas).
+    Nama tidak ikut hash; hanya dipakai untuk arsip / query.
+    """
+    out = []
+    seen = {}
+    for i in range(width):
+        name = str(names[i]).strip() if i < len(names) else ""
+        if not name or name.startswith("Unnamed:"):
+            name = f"kolom_{i + 1}"
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        out.append(name)
+    return out
+
+
+def field_columns(names):
+    """Index kolom per field tiket (FIELD_COLUMNS) berdasarkan header report: {field: index}."""
+    upper = {str(name).strip().upper(): i for i, name in reversed(list(enumerate(names)))}
+    found = {}
+    for field, candidates in FIELD_COLUMNS.items():
+        for candidate in candidates:
+            if candidate in upper:
+                found[field] = upper[candidate]
+                break
+    return found
+
+
+class ColumnTable:
+    """Report kolumnar. Bisa dipakai seperti list baris (len, index, slice, iterasi)."""
+
+    def __init__(self, columns, n_rows=0, names=None):
+        self.columns = list(columns)
+        self.n_rows = len(self.columns[0]) if self.columns else n_rows
+        self.names = column_names(names or [], len(self.columns))
+        self._digest = None
+
+    # ---------- konstruksi ----------
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Dari list baris (lebar boleh beda; kekurangan diisi "" seperti padding lama)."""
+        rows = list(rows)
+        if not rows:
+            return cls([])
+        columns = zip_longest(*rows, fillvalue="")
+        return cls([column_array(list(col)) for col in columns])
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Setara df.fillna("").values.tolist() tanpa membuat list baris:
+        fillna per kolom (kolom dengan NA jadi object), dan kalau semua kolom
+        numerik dengan dtype berbeda, semuanya di-upcast ke dtype bersama
+        (perilaku df.values, mis. int + float → float).
+        """
+        if df is None or df.empty:
+            return cls([])
+        columns = []
+        for _name, series in df.items():
+            if series.isna().any():
+                series = series.fillna("")
+            if series.dtype.kind in "iufb":
+                columns.append(series.to_numpy())
+            else:
+                columns.append(series.astype(object).to_numpy())
+        kinds = {c.dtype.kind for c in columns}
+        if kinds <= set("iuf") and len({c.dtype for c in columns}) > 1:
+            common = np.result_type(*columns)
+            columns = [c.astype(common) for c in columns]
+        return cls(columns, names=[str(name) for name in df.columns])
+
+    # ---------- akses baris ----------
+
+    @property
+    def n_cols(self):
+        return len(self.columns)
+
+    def __len__(self):
+        return self.n_rows
+
+    def __bool__(self):
+        return self.n_rows > 0
+
+    def rows(self, start=0, end=None):
+        """Materialisasi baris [start, end) sebagai list of list objek Python."""
+        end = self.n_rows if end is None else min(end, self.n_rows)
+        if start >= end:
+            return []
+        return [list(row) for row in zip(*(c[start:end].tolist() for c in self.columns))]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.n_rows)
+            if step != 1:
+                return self.rows()[key]
+            return self.rows(start, stop)
+        if key < 0:
+            key += self.n_rows
+        if not 0 <= key < self.n_rows:
+            raise IndexError("ColumnTable index out of range")
+        return [c[key].item() if isinstance(c[key], np.generic) else c[key] for c in self.columns]
+
+    def __iter__(self):
+        for start in range(0, self.n_rows, BLOCK_ROWS):
+            yield from self.rows(start, start + BLOCK_ROWS)
+
+    # ---------- hash & ukuran payload ----------
+
+    def digest(self):
+        """
+        Satu pass JSON per baris untuk semua kebutuhan upload:
+          content_hash : sama dengan telkomcare_snapshot.content_hash(rows)
+          row_hashes   : sama dengan [telkomcare_sheetdiff.row_hash(r) for r in rows]
+          row_sizes    : sama dengan telkomcare_upload._row_bytes(r) (array int64)
+        Hasil di-cache (tabel dianggap immutable).
+        """
+        if self._digest is None:
+            content = hashlib.blake2b(digest_size=16)
+            hashes = []
+            sizes = np.empty(self.n_rows, dtype=np.int64)
+            # json.dumps default memakai ", " → n_cols-1 byte lebih panjang dari versi ringkas
+            spaces = max(self.n_cols - 1, 0)
+            dumps = json.JSONEncoder(ensure_ascii=False, default=str, separators=(",", ":")).encode
+            for i, row in enumerate(self):
+                raw = dumps(row).encode("utf-8")
+                content.update(raw)
+                content.update(b"\n")
+                hashes.append(hashlib.blake2b(raw, digest_size=8).hexdigest())
+                sizes[i] = len(raw) + spaces + 1
+            self._digest = {"content_hash": content.hexdigest(), "row_hashes": hashes, "row_sizes": sizes}
+        return self._digest
+
+
+def as_column_table(data):
+    """ColumnTable apa adanya, atau konversi dari list baris."""
+    return data if isinstance(data, ColumnTable) else ColumnTable.from_rows(data)
@@ -2,16 +2,21 @@
 
 import os
 import sys
-import time
+import shutil
 from pathlib import Path
-from datetime import date
+from datetime import date, datetime
 
 from dotenv import load_dotenv
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from telkomcare_http import fetch_to_file
+from telkomcare_session import BASE_URL
+from telkomcare_ttr import TTR_INCREMENTAL, fetch_month_to_date, fetch_range
+from telkomcare_watch import wait_for_file
+from telkomcare_wait import wait_for, wait_page_settled
+
 # ===================== LOAD ENV & KONSTAN =====================
 
 if getattr(sys, "frozen", False):
@@ -81,43 +86,52 @@ def inject_session_cookie(driver):
 
 # ===================== HELPER DOWNLOAD =====================
 
-def wait_for_new_download(before_files, timeout=180):
-    print("⏳ Menunggu file download baru (.xls/.xlsx)...")
-    start = time.time()
-    while time.time() - start < timeout:
-        now_files = {
-            f
-            for f in os.listdir(DOWNLOADS_FOLDER)
-            if f.lower().endswith((".xls", ".xlsx"))
-        }
-        new_files = now_files - before_files
-        if new_files:
-            latest = max(
-                new_files,
-                key=lambda f: os.path.getmtime(os.path.join(DOWNLOADS_FOLDER, f)),
-            )
-            full_path = os.path.join(DOWNLOADS_FOLDER, latest)
-            print(f"✓ File baru terdeteksi: {full_path}")
-            return full_path
-        time.sleep(2)
-    raise TimeoutError("Timeout menunggu file download TelkomCare")
-
-
-def wait_download_complete(path: Path = DOWNLOADS_FOLDER_PATH, timeout: int = 300):
-    print("⏳ Menunggu proses download selesai (cek *.crdownload)...")
-    start = time.time()
-    while time.time() - start < timeout:
-        crs = list(path.glob("*.crdownload"))
-        if not crs:
-            print("✅ Tidak ada .crdownload, download selesai.")
-            return
-        time.sleep(1)
-    raise TimeoutError("Download belum selesai setelah timeout.")
+def new_download_dir(label, cycle_id=None):
+    """
+    Folder download khusus satu report di satu cycle:
+    ~/Downloads/telkomcare/<cycle_id>/<report>/
+    Folder selalu kosong di awal, jadi file yang muncul pasti milik report ini.
+    """
+    cycle_id = cycle_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+    slug = label.lower().replace(" ", "_")
+    path = DOWNLOADS_FOLDER_PATH / "telkomcare" / cycle_id / slug
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def set_driver_download_dir(driver, download_dir):
+    """Arahkan download Chrome ke download_dir (lewat CDP, berlaku untuk sesi berjalan)."""
+    params = {"behavior": "allow", "downloadPath": str(download_dir)}
+    try:
+        driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
+    except Exception:
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+
+
+def prune_old_cycles(keep=3):
+    """Hapus folder cycle lama di ~/Downloads/telkomcare, sisakan `keep` terbaru."""
+    root = DOWNLOADS_FOLDER_PATH / "telkomcare"
+    if not root.exists():
+        return
+    cycles = sorted(p for p in root.iterdir() if p.is_dir())
+    for old in cycles[:-keep] if keep > 0 else cycles:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def wait_for_new_download(download_dir, timeout=180):
+    """
+    Tunggu file final muncul di folder download report (event inotify,
+    fallback polling). Chrome baru me-rename .crdownload → .xls setelah
+    selesai, jadi file yang dikembalikan sudah lengkap.
+    """
+    print(f"⏳ Menunggu file download baru (.xls/.xlsx) di {download_dir}...")
+    full_path, _ = wait_for_file(download_dir, timeout=timeout)
+    return full_path
 
 
 # ===================== HSI24: STEP-BY-STEP (WECARESUGAR26) =====================
 
-def download_report_hsi(driver):
+def download_report_hsi(driver, download_dir=None):
     """
     HSI24 - Flow step-by-step:
     - Buka wecaresugar26?sumber=HSI24
@@ -133,15 +147,12 @@ def download_report_hsi(driver):
     print("⬇️ DOWNLOAD HSI24 (Step-by-step, detailsugar25)")
     print("=" * 70)
 
-    before_files = {
-        f
-        for f in os.listdir(DOWNLOADS_FOLDER)
-        if f.lower().endswith((".xls", ".xlsx"))
-    }
+    download_dir = download_dir or new_download_dir("WECARE HSI")
+    set_driver_download_dir(driver, download_dir)
 
     # 1. Buka halaman WECARE HSI
     wecaresugar_url = (
-        "https://telkomcare.telkom.co.id/assurance/lapebis26/wecaresugar26?sumber=HSI24"
+        f"{BASE_URL}/assurance/lapebis26/wecaresugar26?sumber=HSI24"
     )
     print(f"\n1️⃣ Buka halaman: {wecaresugar_url}")
     driver.get(wecaresugar_url)
@@ -149,13 +160,15 @@ def download_report_hsi(driver):
     # 2. Pilih teritori TELKOM BARU
     print("2️⃣ Select teritori TELKOM BARU...")
     try:
-        teritori_select = WebDriverWait(driver, 60).until(
-            EC.presence_of_element_located((By.ID, "param_teritory"))
+        teritori_select = wait_for(
+            driver, "HSI select teritori",
+            EC.element_to_be_clickable((By.ID, "param_teritory")), timeout=60,
         )
         teritori_select.click()
 
-        option_telkombaru = WebDriverWait(driver, 30).until(
-            EC.element_to_be_clickable((By.XPATH, "//option[@value='TELKOMBARU']"))
+        option_telkombaru = wait_for(
+            driver, "HSI option TELKOMBARU",
+            EC.element_to_be_clickable((By.XPATH, "//option[@value='TELKOMBARU']")),
         )
         option_telkombaru.click()
         print("   ✓ TELKOM BARU dipilih")
@@ -166,10 +179,10 @@ def download_report_hsi(driver):
     # 3. Klik SUBMIT
     print("3️⃣ Klik tombol SUBMIT (tanggal default hari ini)...")
     try:
-        submit_btn = WebDriverWait(driver, 60).until(
-            EC.element_to_be_clickable(
-                (By.XPATH, "//button[contains(., 'SUBMIT')]")
-            )
+        submit_btn = wait_for(
+            driver, "HSI tombol SUBMIT",
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'SUBMIT')]")),
+            timeout=60,
         )
         submit_btn.click()
         print("   ✓ SUBMIT diklik, menunggu data tabel HSI...")
@@ -180,10 +193,10 @@ def download_report_hsi(driver):
     # 4. Tunggu tabel HSI muncul
     print("4️⃣ Tunggu tabel HSI muncul...")
     try:
-        WebDriverWait(driver, 300).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "table tbody tr")
-            )
+        wait_for(
+            driver, "HSI tabel ringkasan",
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")),
+            timeout=300,
         )
         print("   ✓ Minimal 1 baris data HSI terdeteksi.")
     except Exception as e:
@@ -193,7 +206,8 @@ def download_report_hsi(driver):
     # 5. Ambil link detailsugar25 GRAND TOTAL (tanpa xls=1)
     print("5️⃣ Ambil link GRAND TOTAL (detailsugar25, sumber=HSI24, REGIONAL2 BANTEN)...")
     try:
-        data_link = WebDriverWait(driver, 180).until(
+        data_link = wait_for(
+            driver, "HSI link GRAND TOTAL",
             EC.presence_of_element_located(
                 (
                     By.XPATH,
@@ -205,13 +219,14 @@ def download_report_hsi(driver):
                     "and contains(@href, 'kategori=grand_total')"
                     "]",
                 )
-            )
+            ),
+            timeout=180,
         )
         href = data_link.get_attribute("href") or ""
         print(f"   ✓ Link href GRAND TOTAL ditemukan: {href}")
 
         if href.startswith("/"):
-            href = "https://telkomcare.telkom.co.id" + href
+            href = BASE_URL + href
             print(f"   ✓ URL absolute GRAND TOTAL: {href}")
     except Exception as e:
         print(f"   ❌ Error ambil link GRAND TOTAL HSI: {e}")
@@ -236,10 +251,10 @@ def download_report_hsi(driver):
     driver.get(href_no_xls)
 
     try:
-        WebDriverWait(driver, 300).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "table tbody tr")
-            )
+        wait_for(
+            driver, "HSI tabel detail",
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")),
+            timeout=300,
         )
         print("   ✓ Tabel detail GRAND TOTAL HSI sudah terisi.")
     except Exception as e:
@@ -249,7 +264,8 @@ def download_report_hsi(driver):
     # 7. Cari link download XLS di halaman detail
     print("7️⃣ Cari link download Excel HSI (href mengandung xls=1)...")
     try:
-        download_link = WebDriverWait(driver, 120).until(
+        download_link = wait_for(
+            driver, "HSI link download",
             EC.element_to_be_clickable(
                 (
                     By.XPATH,
@@ -260,13 +276,14 @@ def download_report_hsi(driver):
                     "and contains(@href, 'kategori=grand_total')"
                     "]",
                 )
-            )
+            ),
+            timeout=120,
         )
         dl_href = download_link.get_attribute("href") or ""
         print(f"   ✓ Link download HSI ditemukan: {dl_href}")
 
         if dl_href.startswith("/"):
-            dl_href = "https://telkomcare.telkom.co.id" + dl_href
+            dl_href = BASE_URL + dl_href
             print(f"   ✓ URL absolute download HSI: {dl_href}")
     except Exception as e:
         print(f"   ❌ Tidak menemukan link download HSI: {e}")
@@ -276,41 +293,27 @@ def download_report_hsi(driver):
     print("8️⃣ Trigger download HSI24 GRAND TOTAL...")
     driver.get(dl_href)
 
-    downloaded_file = wait_for_new_download(before_files)
-    wait_download_complete(DOWNLOADS_FOLDER_PATH)
+    downloaded_file = wait_for_new_download(download_dir)
     print("✅ Download HSI24 selesai!")
     return downloaded_file
 
 
 # ===================== WECARE GAUL (FOLLOW HSI PAGE) =====================
 
-def download_wecare_gaul(driver):
+def _build_gaul_url(enddate=None):
     """
-    WECARE GAUL (HSI24) - direct URL:
-    - Tidak lagi cari link di halaman.
-    - Langsung ke detailsugar25?xls=1 dengan param:
-      sumber=HSI24&regional=REGIONAL2&witel=BANTEN&kategori=gaul&param_teritory=TELKOMBARU&enddate=YYYY-MM-DD
+    URL export GAUL (detailsugar25?xls=1), enddate default hari ini (YYYY-MM-DD).
     """
-    print("\n" + "=" * 70)
-    print("⬇️ DOWNLOAD WECARE GAUL (direct URL xls=1)")
-    print("=" * 70)
+    if enddate is None:
+        enddate = date.today().strftime("%Y-%m-%d")
+    base_url = f"{BASE_URL}/assurance/lapebis25/detailsugar25"
 
-    before_files = {
-        f
-        for f in os.listdir(DOWNLOADS_FOLDER)
-        if f.lower().endswith((".xls", ".xlsx"))
-    }
-
-    # Tanggal hari ini dalam format YYYY-MM-DD
-    today_str = date.today().strftime("%Y-%m-%d")
-    base_url = "https://telkomcare.telkom.co.id/assurance/lapebis25/detailsugar25"
-
-    download_url = (
+    return (
         f"{base_url}"
         f"?xls=1"
         f"&read=all"
         f"&param_teritory=TELKOMBARU"
-        f"&enddate={today_str}"
+        f"&enddate={enddate}"
         f"&tahun="
         f"&bulan="
         f"&sumber=HSI24"
@@ -320,19 +323,46 @@ def download_wecare_gaul(driver):
         f"&kategori=gaul"
     )
 
+def download_wecare_gaul(driver, download_dir=None):
+    """
+    WECARE GAUL (HSI24) - direct URL:
+    - Tidak lagi cari link di halaman.
+    - Langsung ke detailsugar25?xls=1 dengan param:
+      sumber=HSI24&regional=REGIONAL2&witel=BANTEN&kategori=gaul&param_teritory=TELKOMBARU&enddate=YYYY-MM-DD
+    """
+    print("\n" + "=" * 70)
+    print("⬇️ DOWNLOAD WECARE GAUL (direct URL xls=1)")
+    print("=" * 70)
+
+    download_dir = download_dir or new_download_dir("WECARE GAUL")
+    set_driver_download_dir(driver, download_dir)
+
+    download_url = _build_gaul_url()
+
     print(f"1️⃣ Download URL GAUL: {download_url}")
     print("2️⃣ Trigger download GAUL...")
     driver.get(download_url)
 
-    downloaded_file = wait_for_new_download(before_files)
-    wait_download_complete(DOWNLOADS_FOLDER_PATH)
+    downloaded_file = wait_for_new_download(download_dir)
     print(f"✅ Download WECARE GAUL selesai: {downloaded_file}")
     return downloaded_file
 
 
 # ===================== DOWNLOAD DATIN (Step-by-step) =====================
 
-def download_report_datin(driver):
+# Link detail grand total BANTEN di tabel hasil SUBMIT DATIN24
+DATIN_LINK_XPATH = (
+    "//a["
+    "contains(@href, 'detailsugar25') "
+    "and contains(@href, 'sumber=DATIN24') "
+    "and contains(@href, 'regional=REGIONAL2') "
+    "and contains(@href, 'witel=BANTEN') "
+    "and contains(@href, 'kategori=grand_total')"
+    "]"
+)
+
+
+def download_report_datin(driver, download_dir=None):
     """
     DATIN24 - Flow step-by-step:
     Mencari link dengan parameter:
@@ -343,44 +373,51 @@ def download_report_datin(driver):
     print("⬇️ DOWNLOAD DATIN24 (Step-by-step)")
     print("=" * 70)
 
-    before_files = {
-        f
-        for f in os.listdir(DOWNLOADS_FOLDER)
-        if f.lower().endswith(".xls") or f.lower().endswith(".xlsx")
-    }
+    download_dir = download_dir or new_download_dir("WECARE DATIN")
+    set_driver_download_dir(driver, download_dir)
 
     wecaresugar_url = (
-        "https://telkomcare.telkom.co.id/assurance/lapebis25/wecaresugar25?sumber=DATIN24"
+        f"{BASE_URL}/assurance/lapebis25/wecaresugar25?sumber=DATIN24"
     )
     print(f"\n1️⃣ Buka halaman: {wecaresugar_url}")
     driver.get(wecaresugar_url)
-    time.sleep(4)
 
     print("2️⃣ Select teritori TELKOM BARU...")
     try:
-        teritori_select = WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.ID, "param_teritory"))
+        teritori_select = wait_for(
+            driver, "DATIN select teritori",
+            EC.element_to_be_clickable((By.ID, "param_teritory")),
         )
         teritori_select.click()
-        time.sleep(1)
 
-        option_telkombaru = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//option[@value='TELKOMBARU']"))
+        option_telkombaru = wait_for(
+            driver, "DATIN option TELKOMBARU",
+            EC.element_to_be_clickable((By.XPATH, "//option[@value='TELKOMBARU']")),
+            timeout=10,
         )
         option_telkombaru.click()
+        wait_for(
+            driver, "DATIN teritori terpilih",
+            EC.element_located_selection_state_to_be(
+                (By.XPATH, "//option[@value='TELKOMBARU']"), True
+            ),
+            timeout=10,
+        )
         print("   ✓ TELKOM BARU dipilih")
     except Exception as e:
         print(f"   ❌ Error select teritori: {e}")
         raise
 
-    time.sleep(2)
+    # Ganti teritori bisa memicu AJAX (isi ulang dropdown) → tunggu jaringan idle
+    wait_page_settled(driver, "DATIN setelah pilih teritori", timeout=15)
 
     print("3️⃣ Klik tombol SUBMIT (tanggal default hari ini)...")
+    # Link data yang sudah ada sebelum SUBMIT (kalau ada) tidak boleh terambil
+    old_links = driver.find_elements(By.XPATH, DATIN_LINK_XPATH)
     try:
-        submit_btn = WebDriverWait(driver, 30).until(
-            EC.element_to_be_clickable(
-                (By.XPATH, "//button[contains(., 'SUBMIT')]")
-            )
+        submit_btn = wait_for(
+            driver, "DATIN tombol SUBMIT",
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'SUBMIT')]")),
         )
         submit_btn.click()
         print("   ✓ SUBMIT diklik, menunggu data tabel DATIN...")
@@ -389,27 +426,20 @@ def download_report_datin(driver):
         raise
 
     print("4️⃣ Tunggu tabel muncul & ambil link data href...")
-    time.sleep(8)  # boleh diganti WebDriverWait table tbody tr
     try:
-        data_link = WebDriverWait(driver, 60).until(
-            EC.presence_of_element_located(
-                (
-                    By.XPATH,
-                    "//a["
-                    "contains(@href, 'detailsugar25') "
-                    "and contains(@href, 'sumber=DATIN24') "
-                    "and contains(@href, 'regional=REGIONAL2') "
-                    "and contains(@href, 'witel=BANTEN') "
-                    "and contains(@href, 'kategori=grand_total')"
-                    "]",
-                )
-            )
+        if old_links:
+            wait_for(driver, "DATIN tabel lama diganti", EC.staleness_of(old_links[0]),
+                     timeout=30, raise_on_timeout=False)
+        data_link = wait_for(
+            driver, "DATIN link data",
+            EC.presence_of_element_located((By.XPATH, DATIN_LINK_XPATH)),
+            timeout=60,
         )
         href = data_link.get_attribute("href")
         print(f"   ✓ Link href ditemukan: {href}")
 
         if href.startswith("/"):
-            href = "https://telkomcare.telkom.co.id" + href
+            href = BASE_URL + href
             print(f"   ✓ URL absolute: {href}")
     except Exception as e:
         print(f"   ❌ Error ambil link data: {e}")
@@ -425,8 +455,6 @@ def download_report_datin(driver):
             pass
         raise
 
-    time.sleep(1)
-
     print("5️⃣ Navigate ke detail & download xls=1...")
     if "xls=1" not in href:
         download_url = href + ("&" if "?" in href else "?") + "xls=1"
@@ -436,52 +464,25 @@ def download_report_datin(driver):
     print(f"   📥 Download URL: {download_url}")
     driver.get(download_url)
 
-    wait_for_new_download(before_files)
-    wait_download_complete(DOWNLOADS_FOLDER_PATH)
+    downloaded_file = wait_for_new_download(download_dir)
     print("✅ Download DATIN24 selesai!")
+    return downloaded_file
 
 
 # ===================== DOWNLOAD TTR (DETAILRESCOMP25) =====================
 
-def _prepare_before_files():
-    return {
-        f
-        for f in os.listdir(DOWNLOADS_FOLDER)
-        if f.lower().endswith((".xls", ".xlsx"))
-    }
-
-
-def _get_start_end_today():
+def _build_ttr_url(sumber, startdate, enddate):
     """
-    Helper untuk dapatkan startdate = tanggal 1 bulan ini,
-    enddate = hari ini (YYYY-MM-DD).
+    URL export TTR (detailrescomp25?xls=1, tiket=TELKOMGAMAS) untuk satu sumber.
     """
-    today = date.today()
-    startdate = today.replace(day=1).strftime("%Y-%m-%d")
-    enddate = today.strftime("%Y-%m-%d")
-    return startdate, enddate
-
-
-def download_ttr_datin(driver):
-    """
-    Download TTR DATIN (detailrescomp25, sumber=DATIN24, tiket=TELKOMGAMAS).
-    Periode: dari tanggal 1 bulan ini sampai hari ini.
-    """
-    print("\n" + "=" * 70)
-    print("⬇️ DOWNLOAD TTR DATIN (detailrescomp25)")
-    print("=" * 70)
-
-    before_files = _prepare_before_files()
-    startdate, enddate = _get_start_end_today()
-
-    download_url = (
-        "https://telkomcare.telkom.co.id/assurance/lapebis25/detailrescomp25"
+    return (
+        f"{BASE_URL}/assurance/lapebis25/detailrescomp25"
         "?xls=1"
         "&read=all"
         "&param_teritory=TELKOMBARU"
         "&tahun="
         "&bulan="
-        "&sumber=DATIN24"
+        f"&sumber={sumber}"
         "&tiket=TELKOMGAMAS"
         f"&startdate={startdate}"
         f"&enddate={enddate}"
@@ -490,84 +491,122 @@ def download_ttr_datin(driver):
         "&kategori="
         "&tcomp="
     )
-    print(f"   📥 Download URL: {download_url}")
-    driver.get(download_url)
 
-    downloaded_file = wait_for_new_download(before_files)
-    wait_download_complete(DOWNLOADS_FOLDER_PATH)
-    print("✅ Download TTR DATIN selesai!")
+
+def _fetch_ttr_month(label, fetch, dest_path, workers=None):
+    """
+    Export TTR month-to-date di dest_path lewat fetch(start, end, path):
+    incremental (cache hari tutup + jendela trailing) kalau
+    TC_TTR_INCREMENTAL=1, selain itu tanggal 1 s/d hari ini dipotong per
+    TC_TTR_SLICE_DAYS (potongan digabung lokal).
+    """
+    if TTR_INCREMENTAL:
+        downloaded_file = fetch_month_to_date(label, fetch, dest_path, workers=workers)
+        print(f"✅ Download {label} selesai (incremental)!")
+        return downloaded_file
+
+    today = date.today()
+    downloaded_file = fetch_range(label, fetch, today.replace(day=1), today, dest_path, workers=workers)
+    print(f"✅ Download {label} selesai!")
     return downloaded_file
 
 
-def download_ttr_indibiz(driver):
+def _download_ttr_browser(driver, sumber, label, download_dir=None):
     """
-    Download TTR INDIBIZ (detailrescomp25, sumber=INDIBIZ, tiket=TELKOMGAMAS).
-    Periode: dari tanggal 1 bulan ini sampai hari ini.
+    Download TTR lewat Chrome, periode tanggal 1 bulan ini s/d hari ini.
+    Potongan / mode incremental sama dengan jalur HTTP, tapi potongan
+    di-download berurutan (satu driver). Tiap potongan mendarat di subfolder
+    sendiri supaya file yang muncul pasti milik potongan itu.
     """
     print("\n" + "=" * 70)
-    print("⬇️ DOWNLOAD TTR INDIBIZ (detailrescomp25)")
+    print(f"⬇️ DOWNLOAD {label} (detailrescomp25)")
     print("=" * 70)
 
-    before_files = _prepare_before_files()
-    startdate, enddate = _get_start_end_today()
+    download_dir = Path(download_dir or new_download_dir(label))
+    dest_path = download_dir / (label.lower().replace(" ", "_") + ".xls")
 
-    download_url = (
-        "https://telkomcare.telkom.co.id/assurance/lapebis25/detailrescomp25"
-        "?xls=1"
-        "&read=all"
-        "&param_teritory=TELKOMBARU"
-        "&tahun="
-        "&bulan="
-        "&sumber=INDIBIZ"
-        "&tiket=TELKOMGAMAS"
-        f"&startdate={startdate}"
-        f"&enddate={enddate}"
-        "&custpending="
-        "&regional=REGIONAL%202"
-        "&kategori="
-        "&tcomp="
-    )
-    print(f"   📥 Download URL: {download_url}")
-    driver.get(download_url)
+    def fetch(start, end, path):
+        piece_dir = download_dir / f"{start.isoformat()}_{end.isoformat()}"
+        piece_dir.mkdir(parents=True, exist_ok=True)
+        set_driver_download_dir(driver, piece_dir)
+        download_url = _build_ttr_url(sumber, start.isoformat(), end.isoformat())
+        print(f"   📥 Download URL: {download_url}")
+        driver.get(download_url)
+        os.replace(wait_for_new_download(piece_dir), path)
+        shutil.rmtree(piece_dir, ignore_errors=True)
+        return str(path)
 
-    downloaded_file = wait_for_new_download(before_files)
-    wait_download_complete(DOWNLOADS_FOLDER_PATH)
-    print("✅ Download TTR INDIBIZ selesai!")
-    return downloaded_file
+    return _fetch_ttr_month(label, fetch, dest_path, workers=1)
 
 
-def download_ttr_reseller(driver):
+def download_ttr_datin(driver, download_dir=None):
+    """
+    Download TTR DATIN (detailrescomp25, sumber=DATIN24, tiket=TELKOMGAMAS).
+    Periode: dari tanggal 1 bulan ini sampai hari ini.
+    """
+    return _download_ttr_browser(driver, "DATIN24", "TTR DATIN", download_dir)
+
+
+def download_ttr_indibiz(driver, download_dir=None):
+    """
+    Download TTR INDIBIZ (detailrescomp25, sumber=INDIBIZ, tiket=TELKOMGAMAS).
+    Periode: dari tanggal 1 bulan ini sampai hari ini.
+    """
+    return _download_ttr_browser(driver, "INDIBIZ", "TTR INDIBIZ", download_dir)
+
+
+def download_ttr_reseller(driver, download_dir=None):
     """
     Download TTR RESELLER (detailrescomp25, sumber=RESELLER, tiket=TELKOMGAMAS).
     Periode: dari tanggal 1 bulan ini sampai hari ini.
     """
+    return _download_ttr_browser(driver, "RESELLER", "TTR RESELLER", download_dir)
+
+
+# ===================== DOWNLOAD VIA HTTP (TANPA BROWSER) =====================
+
+def download_wecare_gaul_http(session, download_dir=None):
+    """
+    WECARE GAUL via HTTP: satu request ke detailsugar25?xls=1 pakai cookie session
+    (telkomcare_http.create_http_session), body di-stream langsung ke
+    <download_dir>/wecare_gaul.xls.
+    """
     print("\n" + "=" * 70)
-    print("⬇️ DOWNLOAD TTR RESELLER (detailrescomp25)")
+    print("⬇️ DOWNLOAD WECARE GAUL (HTTP, tanpa browser)")
     print("=" * 70)
 
-    before_files = _prepare_before_files()
-    startdate, enddate = _get_start_end_today()
-
-    download_url = (
-        "https://telkomcare.telkom.co.id/assurance/lapebis25/detailrescomp25"
-        "?xls=1"
-        "&read=all"
-        "&param_teritory=TELKOMBARU"
-        "&tahun="
-        "&bulan="
-        "&sumber=RESELLER"
-        "&tiket=TELKOMGAMAS"
-        f"&startdate={startdate}"
-        f"&enddate={enddate}"
-        "&custpending="
-        "&regional=REGIONAL%202"
-        "&kategori="
-        "&tcomp="
-    )
+    download_url = _build_gaul_url()
     print(f"   📥 Download URL: {download_url}")
-    driver.get(download_url)
-
-    downloaded_file = wait_for_new_download(before_files)
-    wait_download_complete(DOWNLOADS_FOLDER_PATH)
-    print("✅ Download TTR RESELLER selesai!")
+    download_dir = download_dir or new_download_dir("WECARE GAUL")
+    downloaded_file = fetch_to_file(session, download_url, Path(download_dir) / "wecare_gaul.xls")
+    print(f"✅ Download WECARE GAUL selesai: {downloaded_file}")
     return downloaded_file
+
+
+def _download_ttr_http(session, sumber, label, download_dir=None):
+    print("\n" + "=" * 70)
+    print(f"⬇️ DOWNLOAD {label} (HTTP detailrescomp25, tanpa browser)")
+    print("=" * 70)
+
+    download_dir = download_dir or new_download_dir(label)
+    dest_path = Path(download_dir) / (label.lower().replace(" ", "_") + ".xls")
+
+    def fetch(start, end, path):
+        url = _build_ttr_url(sumber, start.isoformat(), end.isoformat())
+        print(f"   📥 Download URL: {url}")
+        return fetch_to_file(session, url, path)
+
+    # Kalau TC_TTR_SLICE_DAYS diset: potongan paralel lewat session HTTP yang sama
+    return _fetch_ttr_month(label, fetch, dest_path)
+
+
+def download_ttr_datin_http(session, download_dir=None):
+    return _download_ttr_http(session, "DATIN24", "TTR DATIN", download_dir)
+
+
+def download_ttr_indibiz_http(session, download_dir=None):
+    return _download_ttr_http(session, "INDIBIZ", "TTR INDIBIZ", download_dir)
+
+
+def download_ttr_reseller_http(session, download_dir=None):
+    return _download_ttr_http(session, "RESELLER", "TTR RESELLER", download_dir)
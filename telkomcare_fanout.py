@@ -0,0 +1,248 @@
+# telkomcare_fanout.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from telkomcare_downloads import (
+    new_download_dir,
+    prune_old_cycles,
+    download_report_hsi,
+    download_report_datin,
+    download_ttr_datin,
+    download_ttr_indibiz,
+    download_ttr_reseller,
+    download_wecare_gaul,
+    download_ttr_datin_http,
+    download_ttr_indibiz_http,
+    download_ttr_reseller_http,
+    download_wecare_gaul_http,
+)
+from telkomcare_http import SessionExpiredError, record_session_verdict, refresh_session_cookie
+from telkomcare_watch import get_landing_time
+
+# Jumlah worker download paralel (bisa di-override lewat env)
+DEFAULT_DOWNLOAD_WORKERS = int(os.getenv("TC_DOWNLOAD_WORKERS", "4"))
+
+# Berapa folder cycle lama di ~/Downloads/telkomcare yang disimpan
+KEEP_CYCLES = int(os.getenv("TC_KEEP_CYCLES", "3"))
+
+# Report yang butuh UI (klik SUBMIT + cari link) → jalan berurutan di satu driver
+BROWSER_REPORTS = [
+    ("WECARE HSI", download_report_hsi),
+    ("WECARE DATIN", download_report_datin),
+]
+
+# Report dengan URL xls=1 langsung → HTTP paralel, fallback ke driver kalau cookie ditolak
+HTTP_REPORTS = [
+    ("WECARE GAUL", download_wecare_gaul_http, download_wecare_gaul),
+    ("TTR DATIN", download_ttr_datin_http, download_ttr_datin),
+    ("TTR INDIBIZ", download_ttr_indibiz_http, download_ttr_indibiz),
+    ("TTR RESELLER", download_ttr_reseller_http, download_ttr_reseller),
+]
+
+REPORT_ORDER = [
+    "WECARE HSI",
+    "WECARE GAUL",
+    "WECARE DATIN",
+    "TTR DATIN",
+    "TTR INDIBIZ",
+    "TTR RESELLER",
+]
+
+
+def _result(report, file_path=None, error=None, seconds=0.0):
+    return {
+        "report": report,
+        "ok": bool(file_path) and error is None,
+        "file": file_path,
+        "error": error,
+        "seconds": seconds,
+        "land_seconds": get_landing_time(file_path),
+    }
+
+
+def _run_one(report, func, *args):
+    start = time.time()
+    try:
+        file_path = func(*args)
+        error = None if file_path else "download tidak menghasilkan file"
+    except Exception as e:
+        file_path, error = None, f"{type(e).__name__}: {e}"
+    return _result(report, file_path, error, time.time() - start)
+
+
+def _get_driver_or_error(get_driver):
+    """(driver, None) atau (None, pesan error) kalau driver tidak bisa dibuat."""
+    if get_driver is None:
+        return None, "tidak ada driver"
+    try:
+        return get_driver(), None
+    except Exception as e:
+        return None, f"gagal start browser: {type(e).__name__}: {e}"
+
+
+def _run_browser_lane(get_driver, dirs, reports):
+    """Driver Selenium tidak thread-safe → semua report UI jalan berurutan di sini."""
+    driver, error = _get_driver_or_error(get_driver)
+    if driver is None:
+        return [_result(report, error=error) for report, _ in reports]
+    return [_run_one(report, func, driver, dirs[report]) for report, func in reports]
+
+
+def _is_expired(res):
+    return bool(res["error"]) and res["error"].startswith(SessionExpiredError.__name__)
+
+
+def _relogin_or_error(relogin):
+    """(driver baru yang sudah login, None) atau (None, pesan error)."""
+    try:
+        new_driver = relogin()
+    except Exception as e:
+        return None, f"login ulang gagal: {type(e).__name__}: {e}"
+    if new_driver is None:
+        return None, "login ulang gagal"
+    return new_driver, None
+
+
+def _refresh_cookie_or_error(http_session):
+    """None kalau cookie baru terpasang di http_session, selain itu pesan error."""
+    try:
+        refresh_session_cookie(http_session)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def download_all(driver, http_session, max_workers=None, driver_factory=None, relogin=None):
+    """
+    Download keenam report secara paralel:
+    - report UI (HSI, DATIN) berurutan di satu lane driver,
+    - report direct-URL (GAUL, TTR x3) via HTTP di thread pool dengan cookie bersama.
+    Kalau HTTP ditolak (SessionExpiredError), cookie yang sama juga akan
+    ditolak di browser. Jadi setelah lane browser selesai: relogin() (login
+    ulang, cookies.env diperbarui) dipanggil sekali, cookie http_session
+    di-refresh, report yang ditolak diulang via HTTP, dan yang masih gagal
+    (atau semuanya, kalau cookie baru tidak bisa dipasang) diulang via
+    driver hasil login ulang. Report UI yang gagal di lane
+    browser (cookie lama) ikut diulang di driver baru.
+    Tiap report punya folder download sendiri per cycle, jadi path yang
+    dikembalikan adalah file persis milik report itu (tanpa scan ~/Downloads).
+    driver boleh None kalau driver_factory diberikan: Chrome baru dibuat
+    saat ada report yang benar-benar butuh UI. relogin: callable() → driver
+    yang sudah login ulang; None = fallback memakai driver/cookie yang ada.
+
+    Return: dict report -> {"report", "ok", "file", "error", "seconds", "land_seconds"}
+    (land_seconds hanya terisi untuk download via browser yang ditunggu watcher)
+    """
+    max_workers = max_workers or DEFAULT_DOWNLOAD_WORKERS
+    cycle_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    prune_old_cycles(keep=KEEP_CYCLES)
+    dirs = {report: new_download_dir(report, cycle_id) for report in REPORT_ORDER}
+
+    print("\n" + "=" * 70)
+    print(f"⬇️ DOWNLOAD PARALEL {len(REPORT_ORDER)} REPORT (workers={max_workers})")
+    print("=" * 70)
+
+    if driver is not None:
+        get_driver = lambda: driver  # noqa: E731
+    else:
+        get_driver = driver_factory
+
+    start = time.time()
+    results = {}
+    fallback = []
+    expired = []
+    browser_reports = list(BROWSER_REPORTS)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        browser_future = None
+        if get_driver and browser_reports:
+            browser_future = pool.submit(_run_browser_lane, get_driver, dirs, browser_reports)
+
+        http_futures = {}
+        for report, http_func, driver_func in HTTP_REPORTS:
+            if http_session is None:
+                fallback.append((report, driver_func))
+                continue
+            http_futures[report] = (
+                pool.submit(_run_one, report, http_func, http_session, dirs[report]),
+                http_func,
+                driver_func,
+            )
+
+        for report, (future, http_func, driver_func) in http_futures.items():
+            res = future.result()
+            if _is_expired(res):
+                print(f"⚠️ {report}: HTTP ditolak ({res['error']}) → login ulang lalu ulangi.")
+                record_session_verdict(False)
+                expired.append((report, http_func, driver_func))
+            else:
+                results[report] = res
+
+        if browser_future is not None:
+            for res in browser_future.result():
+                results[res["report"]] = res
+
+    if expired:
+        if relogin is None:
+            fallback.extend((report, driver_func) for report, _http_func, driver_func in expired)
+        else:
+            # Lane browser sudah selesai → driver lama aman diganti
+            new_driver, error = _relogin_or_error(relogin)
+            if new_driver is None:
+                for report, _http_func, _driver_func in expired:
+                    results[report] = _result(report, error=f"cookie expired, {error}")
+            else:
+                get_driver = lambda: new_driver  # noqa: E731
+                retries = {}
+                error = _refresh_cookie_or_error(http_session)
+                if error:
+                    print(f"⚠️ Cookie baru tidak bisa dipasang ke session HTTP ({error}) "
+                          "→ report yang ditolak langsung ke browser.")
+                    fallback.extend((report, driver_func) for report, _http_func, driver_func in expired)
+                else:
+                    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                        retries = {
+                            report: (pool.submit(_run_one, report, http_func, http_session, dirs[report]),
+                                     driver_func)
+                            for report, http_func, driver_func in expired
+                        }
+                for report, (future, driver_func) in retries.items():
+                    res = future.result()
+                    if res["ok"]:
+                        results[report] = res
+                    else:
+                        print(f"⚠️ {report}: HTTP masih gagal setelah login ulang ({res['error']}) "
+                              "→ fallback ke browser.")
+                        fallback.append((report, driver_func))
+                # Report UI yang gagal dengan cookie lama diulang di driver baru
+                fallback.extend((r, f) for r, f in browser_reports
+                                if not results.get(r, {}).get("ok"))
+
+    for report, driver_func in fallback:
+        fallback_driver, error = _get_driver_or_error(get_driver)
+        if fallback_driver is None:
+            results[report] = _result(report, error=f"{error} untuk fallback")
+            continue
+        results[report] = _run_one(report, driver_func, fallback_driver, dirs[report])
+
+    for report, _ in BROWSER_REPORTS:
+        results.setdefault(report, _result(report, error="tidak ada driver"))
+
+    print_download_summary(results, time.time() - start)
+    return results
+
+
+def print_download_summary(results, wall_seconds):
+    print("\n📊 Ringkasan download:")
+    for report in REPORT_ORDER:
+        res = results.get(report)
+        if res is None:
+            continue
+        if res["ok"]:
+            print(f"   ✅ {report:<13} {res['seconds']:6.1f}s  {res['file']}")
+        else:
+            print(f"   ❌ {report:<13} {res['seconds']:6.1f}s  {res['error']}")
+    total = sum(r["seconds"] for r in results.values())
+    print(f"   ⏱  Wall time {wall_seconds:.1f}s (jumlah per-report {total:.1f}s)")
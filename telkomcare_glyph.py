@@ -0,0 +1,277 @@
+# telkomcare_glyph.py
+"""
+Backend captcha ringan tanpa torch: segmentasi OpenCV + klasifikasi glyph
+k-NN (NumPy) atas fitur gradien (ala HOG). Model (.npz) dilatih dari korpus captcha
+berlabel (screenshot asli yang diterima server, lihat TC_CAPTCHA_CORPUS_DIR)
+dan/atau captcha sintetis.
+
+  python telkomcare_glyph.py train --corpus captcha_corpus/ --synthetic 2000
+  python bench_captcha.py --corpus captcha_corpus/ --solver glyph
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+GLYPH_MODEL_PATH = Path(os.getenv("TC_GLYPH_MODEL", str(BASE_DIR / "captcha_glyph_model.npz")))
+
+GLYPH_SIZE = 24
+K_NEIGHBORS = 3
+
+# Komponen lebih kecil dari ini (piksel, setelah resize x2) dianggap noise
+MIN_COMPONENT_AREA = 30
+
+# Fitur: histogram orientasi gradien (9 bin) per sel 6x6 + piksel 12x12
+HOG_CELL = 6
+HOG_BINS = 9
+
+# Bobot fitur posisi vertikal / rasio glyph relatif terhadap fitur bentuk
+META_WEIGHT = 3.0
+
+_model = None
+
+
+# ===================== SEGMENTASI =====================
+
+def _binarize(img):
+    """Grayscale → mask teks (255) tanpa bintik dan garis tipis pengganggu."""
+    _, mask = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    # Garis noise 1px (2px setelah resize) hilang oleh opening; stroke huruf tetap
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))
+    return mask
+
+
+def _components(mask):
+    n, _labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    boxes = []
+    for i in range(1, n):
+        x, y, w, h, area = stats[i]
+        if area >= MIN_COMPONENT_AREA and h >= mask.shape[0] * 0.15:
+            boxes.append([int(x), int(x + w)])
+    boxes.sort()
+
+    # Komponen yang bertumpuk di sumbu x (titik huruf i/j, huruf patah) digabung
+    merged = []
+    for x0, x1 in boxes:
+        if merged and x0 < merged[-1][1] - 2:
+            merged[-1][1] = max(merged[-1][1], x1)
+        else:
+            merged.append([x0, x1])
+    return merged
+
+
+def _split_to(boxes, mask, expected):
+    """Pecah box terlebar (di titik proyeksi terendah) sampai jumlahnya = expected."""
+    boxes = [list(b) for b in boxes]
+    while len(boxes) < expected:
+        i = max(range(len(boxes)), key=lambda k: boxes[k][1] - boxes[k][0])
+        x0, x1 = boxes[i]
+        if x1 - x0 < 6:
+            break
+        proj = mask[:, x0:x1].sum(axis=0)
+        lo, hi = (x1 - x0) // 4, 3 * (x1 - x0) // 4
+        cut = x0 + lo + int(np.argmin(proj[lo:hi])) if hi > lo else (x0 + x1) // 2
+        boxes[i:i + 1] = [[x0, cut], [cut, x1]]
+    while len(boxes) > expected and len(boxes) > 1:
+        # Gabungkan pasangan bertetangga dengan celah terkecil
+        gaps = [boxes[k + 1][0] - boxes[k][1] for k in range(len(boxes) - 1)]
+        k = int(np.argmin(gaps))
+        boxes[k:k + 2] = [[boxes[k][0], boxes[k + 1][1]]]
+    return boxes
+
+
+def segment(img, expected=None):
+    """
+    Return list (glyph, meta) kiri → kanan: glyph array uint8 GLYPH_SIZE²,
+    meta = (atas, bawah, rasio lebar/tinggi) relatif terhadap tinggi teks,
+    supaya pasangan seperti p/o, n/h, q/9 tetap bisa dibedakan.
+    """
+    mask = _binarize(img)
+    boxes = _components(mask)
+    if expected and boxes:
+        boxes = _split_to(boxes, mask, expected)
+
+    ink_rows = np.where(mask.any(axis=1))[0]
+    if ink_rows.size == 0:
+        return []
+    top, text_h = ink_rows[0], max(1, ink_rows[-1] - ink_rows[0] + 1)
+
+    glyphs = []
+    for x0, x1 in boxes:
+        col = mask[:, x0:x1]
+        rows = np.where(col.any(axis=1))[0]
+        if rows.size == 0:
+            continue
+        crop = col[rows[0]:rows[-1] + 1]
+        meta = (
+            (rows[0] - top) / text_h,
+            (rows[-1] - top) / text_h,
+            (x1 - x0) / max(1, rows[-1] - rows[0] + 1),
+        )
+        glyphs.append((_normalize_glyph(crop), meta))
+    return glyphs
+
+
+def _normalize_glyph(crop):
+    h, w = crop.shape
+    side = max(h, w) + 4
+    canvas = np.zeros((side, side), np.uint8)
+    y0, x0 = (side - h) // 2, (side - w) // 2
+    canvas[y0:y0 + h, x0:x0 + w] = crop
+    return cv2.resize(canvas, (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA)
+
+
+def _glyph_vector(glyph, meta):
+    g = glyph.astype(np.float32) / 255.0
+    gx = cv2.Sobel(g, cv2.CV_32F, 1, 0, ksize=3)
+    gy = cv2.Sobel(g, cv2.CV_32F, 0, 1, ksize=3)
+    mag = np.hypot(gx, gy)
+    ang = (np.arctan2(gy, gx) % np.pi) / np.pi * HOG_BINS
+    bins = np.minimum(ang.astype(np.int32), HOG_BINS - 1)
+
+    cells = GLYPH_SIZE // HOG_CELL
+    hist = np.zeros((cells, cells, HOG_BINS), np.float32)
+    cy = np.arange(GLYPH_SIZE) // HOG_CELL
+    np.add.at(hist, (cy[:, None], cy[None, :], bins), mag)
+    hist /= np.linalg.norm(hist, axis=2, keepdims=True) + 1e-6
+
+    pixels = cv2.resize(g, (GLYPH_SIZE // 2, GLYPH_SIZE // 2), interpolation=cv2.INTER_AREA)
+    return np.concatenate([hist.ravel(), pixels.ravel(), np.array(meta, np.float32) * META_WEIGHT])
+
+
+def glyph_features(glyphs):
+    """Matriks fitur ter-normalisasi L2 (satu baris per glyph)."""
+    if not glyphs:
+        return np.zeros((0, 0), np.float32)
+    feats = np.stack([_glyph_vector(g, meta) for g, meta in glyphs]).astype(np.float32)
+    feats /= np.linalg.norm(feats, axis=1, keepdims=True) + 1e-6
+    return feats
+
+
+# ===================== MODEL =====================
+
+def train_model(samples, expected_length=None, path=GLYPH_MODEL_PATH, preprocess=None):
+    """
+    Latih model dari samples [(label, png_bytes, path)]. Captcha yang
+    segmentasinya tidak menghasilkan len(label) glyph dilewati.
+    """
+    feats, labels = [], []
+    skipped = 0
+    for label, png, _path in samples:
+        img = preprocess(png)
+        glyphs = segment(img, expected=len(label))
+        if len(glyphs) != len(label):
+            skipped += 1
+            continue
+        feats.append(glyph_features(glyphs))
+        labels.extend(label)
+    if not feats:
+        raise ValueError("Tidak ada captcha yang berhasil disegmentasi untuk training")
+
+    features = np.concatenate(feats)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        features=features,
+        labels=np.array(labels),
+        expected_length=np.array(expected_length or 0),
+    )
+    print(f"💾 Model glyph: {len(labels)} glyph dari {len(samples) - skipped} captcha "
+          f"({skipped} dilewati) → {path}")
+    return path
+
+
+def load_model(path=None):
+    """Model glyph (cache per proses), atau None kalau file belum ada."""
+    global _model
+    path = Path(path or GLYPH_MODEL_PATH)
+    if _model is None or _model["path"] != path:
+        if not path.exists():
+            return None
+        data = np.load(path)
+        _model = {
+            "path": path,
+            "features": data["features"],
+            "labels": data["labels"],
+            "expected_length": int(data["expected_length"]) or None,
+        }
+    return _model
+
+
+def classify(feats, model, k=K_NEIGHBORS):
+    """k-NN cosine; return list (char, confidence) per glyph."""
+    sims = feats @ model["features"].T
+    out = []
+    for row in sims:
+        top = np.argpartition(-row, min(k, row.size - 1))[:k]
+        votes = {}
+        for idx in top:
+            ch = str(model["labels"][idx])
+            votes[ch] = votes.get(ch, 0.0) + float(row[idx])
+        ch, score = max(votes.items(), key=lambda kv: kv[1])
+        out.append((ch, score / sum(max(v, 0.0) for v in votes.values()) if score > 0 else 0.0))
+    return out
+
+
+def solve_captcha_glyph(img, expected_length=None):
+    """
+    Solver dengan antarmuka sama seperti telkomcare_captcha.solve_captcha_image:
+    return (teks, info).
+    """
+    start = time.perf_counter()
+    model = load_model()
+    if model is None:
+        return "", {"strategy": None, "confidence": 0.0, "error": f"model {GLYPH_MODEL_PATH} belum ada",
+                    "ms": {}, "total_ms": 0.0}
+
+    expected = expected_length or model["expected_length"]
+    glyphs = segment(img, expected=expected)
+    t_seg = time.perf_counter()
+    chars = classify(glyph_features(glyphs), model) if glyphs else []
+    t_cls = time.perf_counter()
+
+    text = "".join(ch for ch, _conf in chars)
+    return text, {
+        "strategy": "glyph",
+        "confidence": min((conf for _ch, conf in chars), default=0.0),
+        "ms": {"segment": (t_seg - start) * 1000, "classify": (t_cls - t_seg) * 1000},
+        "total_ms": (t_cls - start) * 1000,
+    }
+
+
+# ===================== CLI TRAINING =====================
+
+def main():
+    from telkomcare_captcha import load_corpus, preprocess_captcha
+    from telkomcare_captcha_synth import generate_corpus
+
+    parser = argparse.ArgumentParser(description="Latih model glyph captcha TelkomCare")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    train = sub.add_parser("train")
+    train.add_argument("--corpus", action="append", default=[], help="folder PNG berlabel")
+    train.add_argument("--synthetic", type=int, default=0, help="tambah captcha sintetis")
+    train.add_argument("--seed", type=int, default=1000)
+    train.add_argument("--length", type=int, default=0, help="panjang captcha (0 = dari label)")
+    train.add_argument("--out", default=str(GLYPH_MODEL_PATH))
+    args = parser.parse_args()
+
+    samples = []
+    for corpus in args.corpus:
+        samples += load_corpus(corpus)
+    if args.synthetic:
+        samples += generate_corpus(args.synthetic, seed=args.seed, length=args.length or 5)
+    if not samples:
+        parser.error("isi --corpus dan/atau --synthetic")
+
+    lengths = {len(label) for label, _png, _path in samples}
+    expected = args.length or (lengths.pop() if len(lengths) == 1 else None)
+    train_model(samples, expected_length=expected, path=args.out, preprocess=preprocess_captcha)
+
+
+if __name__ == "__main__":
+    main()
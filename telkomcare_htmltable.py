@@ -0,0 +1,734 @@
+# telkomcare_htmltable.py
+"""
+Pembaca tabel streaming untuk file .xls TelkomCare (sebenarnya HTML bertabel).
+
+pd.read_html() membangun seluruh DOM + semua tabel di memori, lalu
+df.fillna("").values.tolist() membuat salinan penuh lagi. Modul ini memakai
+lxml.etree.iterparse: setiap <tr> diproses lalu langsung dibuang dari tree,
+jadi yang tertahan di memori hanya teks sel tabel target (teks yang
+berulang, mis. WITEL / STATUS, disimpan sekali per kolom), bukan DOM.
+
+Output read_table_columns() / read_table() sama dengan
+    pd.read_html(path)[i].fillna("").values.tolist()
+(aturan header <thead>/<th>, colspan/rowspan, display:none, thousands=",",
+nilai NA default pandas, serta inferensi int/float/bool per kolom).
+File dibaca sekali: statistik tipe tiap kolom diperbarui per sel sambil
+teksnya dikumpulkan, dan selama kolom masih numerik nilai hasil parse
+langsung masuk array('d'), jadi kolom float tidak di-parse ulang. Tabel
+yang bukan target dibuang begitu selesai; untuk "first" pembacaan berhenti
+di akhir tabel pertama.
+"""
+import html
+import math
+import os
+import re
+from array import array
+
+import numpy as np
+from lxml import etree
+
+from telkomcare_columnar import ColumnTable, column_array
+
+# Nilai yang dianggap NA oleh pandas (STR_NA_VALUES)
+NA_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+TRUE_VALUES = {"True", "TRUE", "true"}
+FALSE_VALUES = {"False", "FALSE", "false"}
+
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+_RE_HAS_TEXT = re.compile(r".+")
+_RE_THOUSANDS_NUM = re.compile(r"^[\-\+]?([0-9]+,|[0-9])*(\.[0-9]*)?([0-9]?(E|e)\-?[0-9]+)?$")
+_ASCII_SPACE = " \t\n\v\f\r"
+_POW10 = [float(f"1e{i}") for i in range(309)]
+_INF_STRINGS = {"inf", "+inf", "infinity", "+infinity"}
+_NEG_INF_STRINGS = {"-inf", "-infinity"}
+_NAN = float("nan")
+
+# Teks unik per kolom yang di-dedup; kolom dengan lebih banyak nilai unik
+# (ID tiket, nama pelanggan) tidak di-dedup
+MEMO_MAX_VALUES = 4096
+
+
+# ===================== TEKS & ANGKA =====================
+
+def _remove_whitespace(s):
+    s = s.strip()
+    # \s selain spasi ASCII tidak printable → regex hanya perlu jalan kalau
+    # ada dua spasi berturut-turut atau karakter whitespace lain
+    if "  " in s or not s.isprintable():
+        return _RE_WHITESPACE.sub(" ", s)
+    return s
+
+
+def _is_hidden(el):
+    return "display:none" in (el.get("style") or "").replace(" ", "")
+
+
+def _cell_text(el):
+    """Setara lxml text_content() setelah pandas membuang <style> & display:none."""
+    parts = []
+
+    def walk(node):
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            tag = child.tag
+            if isinstance(tag, str) and tag != "style" and not _is_hidden(child):
+                if tag == "br":
+                    parts.append("\n")
+                walk(child)
+            elif tag == "br":
+                parts.append("\n")
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(el)
+    return "".join(parts)
+
+
+def _fix_thousands(s):
+    if "," in s and _RE_THOUSANDS_NUM.search(s.strip()):
+        return s.replace(",", "")
+    return s
+
+
+def _parse_number(s):
+    """
+    Port precise_xstrtod + floatify pandas.
+    Return (float_value, maybe_int) atau None kalau bukan angka.
+    """
+    n = len(s)
+    i = 0
+    while i < n and s[i] in _ASCII_SPACE:
+        i += 1
+
+    negative = False
+    if i < n and s[i] in "+-":
+        negative = s[i] == "-"
+        i += 1
+
+    number = 0.0
+    exponent = 0
+    num_digits = 0
+    num_decimals = 0
+    maybe_int = True
+
+    while i < n and "0" <= s[i] <= "9":
+        if num_digits < 17:
+            number = number * 10.0 + (ord(s[i]) - 48)
+            num_digits += 1
+        else:
+            exponent += 1
+        i += 1
+
+    if i < n and s[i] == ".":
+        maybe_int = False
+        i += 1
+        while num_digits < 17 and i < n and "0" <= s[i] <= "9":
+            number = number * 10.0 + (ord(s[i]) - 48)
+            i += 1
+            num_digits += 1
+            num_decimals += 1
+        if num_digits >= 17:
+            while i < n and "0" <= s[i] <= "9":
+                i += 1
+        exponent -= num_decimals
+
+    if num_digits == 0:
+        return _parse_inf(s)
+
+    if negative:
+        number = -number
+
+    if i < n and s[i] in "eE":
+        maybe_int = False
+        i += 1
+        exp_negative = False
+        if i < n and s[i] in "+-":
+            exp_negative = s[i] == "-"
+            i += 1
+        exp_digits = 0
+        exp_value = 0
+        while exp_digits < 17 and i < n and "0" <= s[i] <= "9":
+            exp_value = exp_value * 10 + (ord(s[i]) - 48)
+            exp_digits += 1
+            i += 1
+        exponent += -exp_value if exp_negative else exp_value
+        if exp_digits == 0:
+            i -= 1
+
+    if exponent > 308:
+        number = math.copysign(math.inf, number) if number else number
+    elif exponent > 0:
+        number *= _POW10[exponent]
+    elif exponent < -308:
+        if exponent < -616:
+            number = 0.0
+        else:
+            number /= _POW10[-308 - exponent]
+            number /= _POW10[308]
+    else:
+        number /= _POW10[-exponent]
+
+    while i < n and s[i] in _ASCII_SPACE:
+        i += 1
+    if i != n:
+        return _parse_inf(s)
+    return number, maybe_int
+
+
+def _parse_inf(s):
+    low = s.lower()
+    if low in _INF_STRINGS:
+        return math.inf, False
+    if low in _NEG_INF_STRINGS:
+        return -math.inf, False
+    return None
+
+
+# ===================== STREAM <tr> =====================
+
+def _row_section(tr, table):
+    """Section pandas untuk <tr>: 'header' (thead/tr), 'footer', 'body', atau None."""
+    parent = tr.getparent()
+    if parent is table:
+        return "body"
+    if parent is not None and parent.tag == "thead":
+        return "header"
+    node = parent
+    while node is not None and node is not table:
+        if node.tag == "tbody":
+            return "body"
+        if node.tag == "tfoot":
+            return "footer"
+        node = node.getparent()
+    return None
+
+
+def _has_hidden_ancestor(el, table):
+    node = el
+    while node is not None and node is not table:
+        if _is_hidden(node):
+            return True
+        node = node.getparent()
+    return False
+
+
+def _span(value):
+    try:
+        return int(value or 1)
+    except ValueError:
+        return 1
+
+
+def _row_cells(row):
+    cells = []
+    for td in row:
+        tag = td.tag
+        if tag != "td" and tag != "th":
+            continue
+        # Sel polos (tanpa atribut / anak) tidak perlu cek style & walk
+        if td.keys():
+            if _is_hidden(td):
+                continue
+            rowspan, colspan = _span(td.get("rowspan")), _span(td.get("colspan"))
+        else:
+            rowspan = colspan = 1
+        text = _cell_text(td) if len(td) else (td.text or "")
+        cells.append((tag, _remove_whitespace(text), rowspan, colspan))
+    return cells
+
+
+def _text_matches(el):
+    return any(_RE_HAS_TEXT.search(t) for t in el.itertext())
+
+
+def _release(el, tables):
+    """
+    Buang <tr> yang sudah diproses (dan saudara sebelumnya) dari tree.
+    Baris tabel bersarang (tabel di dalam sel) dibiarkan sampai <tr> tabel
+    luar dibuang, karena teks sel luar ikut berisi teks tabel dalam
+    (text_content() di pandas).
+    """
+    if len(tables) > 1:
+        return
+    el.clear()
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
+
+
+def _iter_row_events(file_path):
+    """
+    Yield event per tabel (urutan dokumen):
+      ("row", table_id, section, cells)
+      ("end", table_id, has_text)
+    Tabel display:none dan baris/cell tersembunyi dilewati seperti pandas.
+    """
+    tables = []  # stack (element, table_id | None, info)
+    next_id = 0
+    # section & status tersembunyi dihitung sekali per parent <tr> (tbody/thead/...)
+    last_parent = None
+    last_placement = None
+
+    context = etree.iterparse(
+        str(file_path),
+        events=("start", "end"),
+        tag=("table", "tr", "thead"),
+        html=True,
+        recover=True,
+        huge_tree=True,
+    )
+    for event, el in context:
+        tag = el.tag
+        if event == "start":
+            if tag == "table":
+                if _is_hidden(el):
+                    tables.append((el, None, None))
+                else:
+                    tables.append((el, next_id, {"has_text": False}))
+                    next_id += 1
+            continue
+
+        if tag == "table":
+            table_el, table_id, info = tables.pop()
+            if table_id is not None:
+                has_text = info["has_text"] or bool(
+                    table_el.text and _RE_HAS_TEXT.search(table_el.text)
+                ) or _text_matches(table_el)
+                yield ("end", table_id, has_text)
+            continue
+
+        if not tables:
+            continue
+        table_el, table_id, info = tables[-1]
+        if table_id is None:
+            if tag == "tr":
+                _release(el, tables)
+            continue
+
+        if tag == "thead":
+            # HACK pandas: <thead><th>..</th></thead> tanpa <tr> dianggap satu baris
+            if el.getparent() is not None and not _has_hidden_ancestor(el, table_el):
+                direct = [c for c in el if c.tag in ("td", "th")]
+                if direct:
+                    yield ("row", table_id, "header", _row_cells(el))
+            continue
+
+        # tag == "tr"
+        if not info["has_text"] and (
+            _text_matches(el) or (el.tail and _RE_HAS_TEXT.search(el.tail))
+        ):
+            info["has_text"] = True
+        parent = el.getparent()
+        if parent is not last_parent:
+            last_parent = parent
+            last_placement = (_row_section(el, table_el), _has_hidden_ancestor(parent, table_el))
+        section, parent_hidden = last_placement
+        if section is not None and not parent_hidden and not _is_hidden(el):
+            yield ("row", table_id, section, _row_cells(el))
+        _release(el, tables)
+
+    del context
+
+
+# ===================== EXPAND COLSPAN/ROWSPAN & HEADER =====================
+
+class _TableRows:
+    """
+    State satu tabel: expand colspan/rowspan per baris (sama dengan
+    pandas _expand_colspan_rowspan) dan pisahkan baris header dari data.
+    """
+
+    def __init__(self):
+        self.remainder = []
+        self.head = []
+        self.header = []
+        self.head_done = False
+        self.saw_thead = False
+        self.body_all_th = True
+        self.footer_raw = []
+        self.width = 0
+
+    def _expand(self, cells):
+        remainder = self.remainder
+        if not remainder and all(c[2] == 1 and c[3] == 1 for c in cells):
+            texts = [c[1] for c in cells]
+            self.width = max(self.width, len(texts))
+            return texts
+        texts = []
+        next_remainder = []
+        index = 0
+        for _tag, text, rowspan, colspan in cells:
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+        self.remainder = next_remainder
+        self.width = max(self.width, len(texts))
+        return texts
+
+    def _flush_remainder(self):
+        rows = []
+        while self.remainder:
+            next_remainder = []
+            texts = []
+            for prev_i, prev_text, prev_rowspan in self.remainder:
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+            rows.append(texts)
+            self.width = max(self.width, len(texts))
+            self.remainder = next_remainder
+        return rows
+
+    def _finish_head(self):
+        """Baris head setelah baris header terakhir yang berisi teks ikut jadi data."""
+        self.head_done = True
+        head, self.head = self.head, []
+        if len(head) <= 1:
+            self.header = head
+            return []
+        filled = [i for i, row in enumerate(head) if any(row)]
+        if not filled:
+            return head
+        self.header = head[:filled[-1] + 1]
+        return head[filled[-1] + 1:]
+
+    def feed(self, section, cells):
+        """Return baris data (list teks) yang siap dikeluarkan dari baris ini."""
+        if section == "footer":
+            self.footer_raw.append(cells)
+            return []
+
+        if section == "header":
+            self.saw_thead = True
+            self.head.append(self._expand(cells))
+            return []
+
+        # body
+        if not self.head_done:
+            if not self.saw_thead and self.body_all_th and all(c[0] == "th" for c in cells):
+                self.head.append(self._expand(cells))
+                return []
+            self.body_all_th = False
+            rows = self._finish_head()
+            rows.append(self._expand(cells))
+            return rows
+        return [self._expand(cells)]
+
+    def finish(self):
+        rows = self._finish_head() if not self.head_done else []
+        if not self.footer_raw:
+            rows.extend(self._flush_remainder())
+        for cells in self.footer_raw:
+            rows.append(self._expand(cells))
+        rows.extend(self._flush_remainder())
+        return rows
+
+
+def _iter_table_rows(file_path):
+    """Yield (table_id, rows) per <tr>, dan (table_id, None, has_text) di akhir tabel."""
+    states = {}
+    for event in _iter_row_events(file_path):
+        if event[0] == "row":
+            _, table_id, section, cells = event
+            state = states.setdefault(table_id, _TableRows())
+            rows = state.feed(section, cells)
+            if rows:
+                yield table_id, rows, None
+        else:
+            _, table_id, has_text = event
+            state = states.pop(table_id, None) or _TableRows()
+            rows = state.finish()
+            yield table_id, rows, {"has_text": has_text, "width": state.width, "header": state.header}
+
+
+# ===================== KOLOM & INFERENSI TIPE (SATU PASS) =====================
+
+class _ColumnBuffer:
+    """
+    Satu kolom tabel selama pass tunggal: teks sel (setelah thousands=","),
+    statistik tipe yang diperbarui per sel, dan nilai float hasil parse
+    selama kolom masih numerik (numbers None = sudah ketemu teks non-angka).
+    """
+    __slots__ = ("values", "numbers", "memo", "present", "na", "na_blank", "is_float", "nonbool")
+
+    def __init__(self, n_rows=0):
+        # Baris sebelum kolom ini muncul = sel kosong (padding "")
+        self.values = [""] * n_rows
+        self.numbers = array("d", [_NAN]) * n_rows
+        self.memo = {}
+        self.present = 0
+        self.na = 0
+        self.na_blank = 0
+        self.is_float = False
+        self.nonbool = False
+
+    def pad(self):
+        self.values.append("")
+        if self.numbers is not None:
+            self.numbers.append(_NAN)
+
+
+class _TableColumns:
+    """Akumulator kolom satu tabel (baris hasil _TableRows, urut dokumen)."""
+
+    def __init__(self):
+        self.buffers = []
+        self.n_rows = 0
+        self.blank_rows = []
+
+    def add(self, row):
+        blank = _is_blank(row)
+        if blank:
+            self.blank_rows.append(self.n_rows)
+        buffers = self.buffers
+        while len(buffers) < len(row):
+            buffers.append(_ColumnBuffer(self.n_rows))
+        for buf, raw in zip(buffers, row):
+            value = _fix_thousands(raw)
+            memo = buf.memo
+            if memo is not None:
+                value = memo.setdefault(value, value)
+                if len(memo) > MEMO_MAX_VALUES:
+                    buf.memo = None
+            buf.values.append(value)
+            buf.present += 1
+            numbers = buf.numbers
+            if value in NA_VALUES:
+                buf.na += 1
+                if blank:
+                    buf.na_blank += 1
+                if numbers is not None:
+                    numbers.append(_NAN)
+                continue
+            if not buf.nonbool and value not in TRUE_VALUES and value not in FALSE_VALUES:
+                buf.nonbool = True
+            if numbers is None:
+                continue
+            parsed = _parse_number(value)
+            if parsed is None:
+                buf.numbers = None
+            else:
+                numbers.append(parsed[0])
+                if not parsed[1]:
+                    buf.is_float = True
+        for buf in buffers[len(row):]:
+            buf.pad()
+        self.n_rows += 1
+
+    def finish(self, width):
+        while len(self.buffers) < width:
+            self.buffers.append(_ColumnBuffer(self.n_rows))
+
+
+def _column_kinds(buffers, n_rows, n_blank):
+    """
+    Tentukan tipe tiap kolom: int / float / bool / object, lalu tiru
+    df.values: kalau semua kolom numerik tanpa NA dan ada yang float,
+    kolom int ikut jadi float.
+    """
+    drop_blank = len(buffers) == 1
+    total = n_rows - (n_blank if drop_blank else 0)
+    kinds = []
+    filled_dtypes = []
+    for col, buf in enumerate(buffers):
+        na = buf.na - (buf.na_blank if drop_blank else 0)
+        present = buf.present - (n_blank if drop_blank and col == 0 else 0)
+        has_na = na > 0 or present < total
+        if buf.numbers is not None:
+            kind = "float" if (has_na or buf.is_float or total == 0) else "int"
+        elif not buf.nonbool:
+            kind = "bool"
+        else:
+            kind = "object"
+        kinds.append(kind)
+        # dtype kolom setelah fillna(""): kolom dengan NA jadi object
+        filled_dtypes.append("object" if has_na or kind == "object" else kind)
+
+    if set(filled_dtypes) == {"int", "float"}:
+        kinds = ["int_as_float" if k == "int" else k for k in kinds]
+    return kinds
+
+
+def _column_result(buf, kind, keep=None):
+    """
+    Buffer kolom → array NumPy, nilai sama dengan _convert per sel versi
+    dua pass. keep: index baris yang dipertahankan (None = semua).
+    """
+    values = buf.values if keep is None else [buf.values[i] for i in keep]
+    if kind == "float":
+        numbers = buf.numbers if keep is None else array("d", (buf.numbers[i] for i in keep))
+        if buf.na == 0 and len(numbers) == len(values) and "" not in values:
+            return np.frombuffer(numbers, dtype=np.float64).copy()
+        out = ["" if v in NA_VALUES else x for v, x in zip(values, numbers)]
+    elif kind == "int":
+        out = [int(v) for v in values]
+    elif kind == "int_as_float":
+        out = [float(int(v)) for v in values]
+    elif kind == "bool":
+        out = ["" if v in NA_VALUES else v in TRUE_VALUES for v in values]
+    else:
+        out = ["" if v in NA_VALUES else v for v in values]
+    return column_array(out, kind)
+
+
+def _is_blank(row):
+    return len(row) == 0 or (len(row) == 1 and not row[0].strip())
+
+
+# ===================== API =====================
+
+class _TableText:
+    """Akumulator teks mentah satu tabel (untuk read_table_text)."""
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def finish(self, width):
+        pass
+
+
+def _collect_table(file_path, table, make):
+    """
+    Satu pass iterparse: tiap tabel dikumpulkan oleh akumulator make(), lalu
+    dibuang begitu selesai kalau bukan target. Urutan tabel = urutan tag
+    pembuka di dokumen (seperti pandas), hanya yang berisi teks; tabel
+    bersarang yang selesai lebih dulu ditahan sampai tabel luarnya selesai.
+    table = "first" (berhenti di tabel pertama), "widest" (kolom terbanyak,
+    GAUL) atau index integer. Return (akumulator, end_info) tabel target.
+    """
+    running = {}
+    ended = {}  # table_id → (acc, end_info) | None, menunggu giliran urutan dokumen
+    next_id = 0
+    found = []
+    best = None
+    for table_id, rows, end_info in _iter_table_rows(file_path):
+        acc = running.get(table_id)
+        if acc is None:
+            acc = running[table_id] = make()
+        for row in rows:
+            acc.add(row)
+        if end_info is None:
+            continue
+        del running[table_id]
+        if end_info["has_text"]:
+            acc.finish(end_info["width"])
+            ended[table_id] = (acc, end_info)
+        else:
+            ended[table_id] = None
+        while next_id in ended:
+            done = ended.pop(next_id)
+            next_id += 1
+            if done is None:
+                continue
+            if table == "first" or table == len(found):
+                return done
+            if table == "widest":
+                if best is None or done[1]["width"] > best[1]["width"]:
+                    best = done
+                found.append(None)
+            else:
+                # index negatif baru bisa dipilih setelah semua tabel terbaca
+                found.append(done if isinstance(table, int) and table < 0 else None)
+    if not found:
+        raise ValueError("No tables found matching regex '.+'")
+    if table == "widest":
+        return best
+    target = found[table]
+    if target is None:
+        raise IndexError("list index out of range")
+    return target
+
+
+def read_table_columns(file_path, table="first"):
+    """
+    Tabel target sebagai ColumnTable (satu array per kolom), dalam satu pass:
+    kolom numerik langsung jadi int64/float64/bool, kolom lain array object.
+    Nama kolom diambil dari baris header (header bertingkat digabung).
+    """
+    acc, end_info = _collect_table(file_path, table, _TableColumns)
+    width = end_info["width"]
+    n_blank = len(acc.blank_rows)
+    kinds = _column_kinds(acc.buffers, acc.n_rows, n_blank)
+    keep = None
+    if width == 1 and n_blank:
+        blank = set(acc.blank_rows)
+        keep = [i for i in range(acc.n_rows) if i not in blank]
+
+    columns = []
+    for i, kind in enumerate(kinds):
+        columns.append(_column_result(acc.buffers[i], kind, keep))
+        acc.buffers[i] = None  # teks kolom yang sudah dikonversi dilepas
+    header = end_info["header"]
+    names = [
+        " / ".join(dict.fromkeys(row[i] for row in header if i < len(row) and row[i]))
+        for i in range(width)
+    ]
+    return ColumnTable(columns, names=names)
+
+
+def read_table(file_path, table="first"):
+    """
+    Semua baris tabel target sebagai list of list: table = "first" (seperti
+    dfs[0]), "widest" (kolom terbanyak, GAUL), atau index integer. Baris
+    header tidak ikut, sama seperti df.fillna("").values.tolist().
+    Untuk tabel besar lebih hemat pakai read_table_columns() langsung.
+    """
+    return read_table_columns(file_path, table).rows()
+
+
+def read_table_text(file_path, table="first"):
+    """
+    (header_rows, rows) teks mentah tabel target setelah colspan/rowspan,
+    tanpa konversi tipe. Dipakai untuk menggabungkan beberapa export
+    (mis. potongan tanggal TTR) lalu menulisnya ulang dengan write_table_html().
+    Hanya baris tabel yang sedang dibaca / kandidat target yang ditahan.
+    """
+    acc, end_info = _collect_table(file_path, table, _TableText)
+    return end_info["header"], acc.rows
+
+
+def write_table_html(path, header_rows, rows):
+    """
+    Tulis satu tabel (baris header di <thead>, baris teks di <tbody>) sebagai
+    .xls HTML seperti export TelkomCare, secara atomik. Hasilnya dibaca
+    kembali oleh read_table*/read_table_columns dengan nilai yang sama.
+    """
+    def cell(tag, value):
+        text = str(value)
+        if "&" in text or "<" in text or ">" in text:
+            text = html.escape(text, quote=False)
+        return f"<{tag}>{text}</{tag}>"
+
+    tmp = f"{path}.part"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write('<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8">'
+                '</head><body>\n<table border="1">\n<thead>\n')
+        for row in header_rows:
+            f.write("<tr>" + "".join(cell("th", v) for v in row) + "</tr>\n")
+        f.write("</thead>\n<tbody>\n")
+        for row in rows:
+            f.write("<tr>" + "".join(cell("td", v) for v in row) + "</tr>\n")
+        f.write("</tbody>\n</table>\n</body></html>\n")
+    os.replace(tmp, path)
+    return str(path)
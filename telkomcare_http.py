@@ -0,0 +1,214 @@
+# telkomcare_http.py
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from telkomcare_session import BASE_URL, load_session_from_env
+from telkomcare_state import STATE_DIR, read_json, write_json
+
+LOGIN_PATH = "/public/login"
+
+# Halaman ringan yang butuh login; dipakai untuk probe validitas cookie
+PROBE_PATH = "/assurance/dashboard/alertresponse"
+
+# Verdict probe disimpan per cookie, berlaku selama TTL ini (detik)
+PROBE_CACHE_PATH = STATE_DIR / "session_probe.json"
+PROBE_TTL_SECONDS = int(os.getenv("TC_SESSION_PROBE_TTL", "300"))
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Penanda halaman login TelkomCare (kalau server balas 200 tapi isinya form login)
+LOGIN_PAGE_MARKERS = (b"captcha-element", b"captcha-input", b'id="uname"')
+
+
+class SessionExpiredError(RuntimeError):
+    """Server mengarahkan request ke /public/login → cookie session tidak valid."""
+
+
+# ===================== SESSION HTTP =====================
+
+def create_http_session(pool_size=10):
+    """
+    Buat requests.Session (connection pool) yang membawa cookie
+    newtelkomcareapache dari cookies.env (telkomcare_session.load_session_from_env).
+    """
+    name, domain, value = load_session_from_env()
+    if not value:
+        raise SessionExpiredError("TC_SESSION_VALUE kosong, belum ada cookie session.")
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "User-Agent": USER_AGENT,
+            "Accept": "application/vnd.ms-excel,text/html,*/*",
+        }
+    )
+    session.cookies.set(name, value, domain=domain, path="/")
+    return session
+
+
+def refresh_session_cookie(session):
+    """
+    Muat ulang cookie session dari cookies.env ke requests.Session yang
+    sudah ada (mis. setelah login ulang menulis cookie baru).
+    """
+    name, domain, value = load_session_from_env()
+    if not value:
+        raise SessionExpiredError("TC_SESSION_VALUE kosong, belum ada cookie session.")
+    session.cookies.set(name, value, domain=domain, path="/")
+    return session
+
+
+# ===================== DETEKSI REDIRECT LOGIN =====================
+
+def is_login_redirect(response, head=b""):
+    """
+    True kalau response (atau salah satu redirect-nya) berakhir di /public/login,
+    atau isi awal body ternyata form login TelkomCare.
+    """
+    for r in list(response.history) + [response]:
+        if LOGIN_PATH in (r.url or "").lower():
+            return True
+        location = (r.headers.get("Location") or "").lower()
+        if LOGIN_PATH in location:
+            return True
+
+    if head:
+        sample = head[:8192]
+        return any(marker in sample for marker in LOGIN_PAGE_MARKERS)
+    return False
+
+
+# ===================== FETCH KE FILE =====================
+
+def fetch_to_file(session, url, dest_path, timeout=(30, 300), chunk_size=1024 * 256):
+    """
+    Download satu URL export (xls=1) langsung ke dest_path (streaming, tanpa browser).
+    File ditulis ke <dest>.part lalu di-rename, jadi importer tidak pernah
+    melihat file setengah jadi.
+
+    Return: path file (str).
+    Raise : SessionExpiredError kalau server redirect ke /public/login.
+    """
+    dest_path = Path(dest_path)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_name(dest_path.name + ".part")
+
+    start = time.time()
+    with session.get(url, stream=True, timeout=timeout) as resp:
+        if is_login_redirect(resp):
+            raise SessionExpiredError(f"Redirect ke halaman login: {resp.url}")
+        resp.raise_for_status()
+
+        chunks = resp.iter_content(chunk_size=chunk_size)
+        head = next((c for c in chunks if c), b"")
+        if is_login_redirect(resp, head=head):
+            raise SessionExpiredError("Response berisi halaman login TelkomCare.")
+
+        total = len(head)
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(head)
+                for chunk in chunks:
+                    if chunk:
+                        f.write(chunk)
+                        total += len(chunk)
+            os.replace(tmp_path, dest_path)
+        except BaseException:
+            # Stream putus / timeout / Ctrl+C → jangan tinggalkan .part setengah jadi
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    elapsed = time.time() - start
+    print(f"   ✓ HTTP download {total / 1024:.1f} KB dalam {elapsed:.1f}s → {dest_path}")
+    return str(dest_path)
+
+
+# ===================== PROBE SESSION =====================
+
+def _cookie_fingerprint(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _cached_verdict(fingerprint):
+    cached = read_json(PROBE_CACHE_PATH)
+    if not cached or cached.get("cookie") != fingerprint:
+        return None
+    if time.time() - cached.get("checked_at", 0) > PROBE_TTL_SECONDS:
+        return None
+    return cached.get("valid")
+
+
+def record_session_verdict(valid, value=None):
+    """
+    Simpan hasil cek cookie (dari probe, atau dari download HTTP yang
+    ditolak / login ulang yang sukses).
+    """
+    if value is None:
+        _name, _domain, value = load_session_from_env()
+    if not value:
+        return
+    write_json(
+        PROBE_CACHE_PATH,
+        {"cookie": _cookie_fingerprint(value), "valid": bool(valid), "checked_at": time.time()},
+    )
+
+
+def probe_session(session=None, timeout=(10, 20), use_cache=True):
+    """
+    Cek apakah cookie di cookies.env masih valid dengan satu GET ke halaman
+    dashboard (body tidak diunduh penuh). Redirect diikuti: hanya redirect
+    ke /public/login (atau body berisi form login) yang berarti expired;
+    redirect biasa (trailing slash, load balancer) tidak.
+
+    Return True (valid) / False (expired / kosong) / None (jaringan error,
+    tidak bisa dipastikan). Verdict True/False di-cache per cookie selama
+    TC_SESSION_PROBE_TTL detik.
+    """
+    _name, _domain, value = load_session_from_env()
+    if not value:
+        return False
+
+    fingerprint = _cookie_fingerprint(value)
+    if use_cache:
+        cached = _cached_verdict(fingerprint)
+        if cached is not None:
+            print(f"🔎 Probe session (cache): cookie {'valid' if cached else 'expired'}")
+            return cached
+
+    own_session = session is None
+    start = time.time()
+    try:
+        if own_session:
+            session = create_http_session(pool_size=1)
+        with session.get(BASE_URL + PROBE_PATH, stream=True, timeout=timeout) as resp:
+            if is_login_redirect(resp):
+                valid = False
+            elif resp.status_code != 200:
+                print(f"⚠️ Probe session: HTTP {resp.status_code}, status cookie tidak pasti.")
+                return None
+            else:
+                head = next(resp.iter_content(chunk_size=8192), b"")
+                valid = not is_login_redirect(resp, head=head)
+    except requests.RequestException as e:
+        print(f"⚠️ Probe session gagal ({type(e).__name__}: {e})")
+        return None
+    finally:
+        if own_session and session is not None:
+            session.close()
+
+    print(f"🔎 Probe session: cookie {'valid' if valid else 'expired'} "
+          f"({(time.time() - start) * 1000:.0f}ms)")
+    record_session_verdict(valid, value)
+    return valid
+
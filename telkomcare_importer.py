@@ -0,0 +1,345 @@
+# telkomcare_importer.py
+import os
+import glob
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import gspread
+from google.oauth2.service_account import Credentials
+
+from telkomcare_archive import archive_report
+from telkomcare_columnar import ColumnTable, as_column_table
+from telkomcare_htmltable import read_table_columns
+from telkomcare_metrics import record_span, span
+from telkomcare_sheetdiff import changed_ranges, drop_shadow, load_shadow, save_shadow
+from telkomcare_snapshot import drop_snapshot, is_unchanged, record_snapshot
+from telkomcare_upload import last_upload_stats, send_row_ranges, with_retry
+from telkomcare_warehouse import ingest_report
+
+BASE_DIR = Path(__file__).resolve().parent
+CREDENTIALS_PATH = BASE_DIR / "credentials.json"
+
+SPREADSHEET_ID = '1TaxVb8GrPndXHGhjNWVzQm8QcLBwBqJ5b_-yYS1EC6g'
+
+DOWNLOADS_FOLDER = str(Path.home() / "Downloads")
+
+# ===================== REGISTRY REPORT =====================
+# report -> sheet tujuan + cara parse
+#   parser "first_table"   : HTML → tabel pertama, selain itu xlrd/openpyxl
+#   parser "html_fallback" : seperti first_table, tapi parse HTML gagal → coba xlrd
+#   parser "widest_table"  : HTML → tabel dengan kolom terbanyak (GAUL)
+# Semua parser return list baris (hasil setara df.fillna("").values.tolist()).
+# HTML dibaca streaming oleh telkomcare_htmltable (tanpa DataFrame / DOM penuh).
+# Ukuran chunk upload ditentukan oleh byte payload (telkomcare_upload), bukan per report.
+
+REPORTS = {
+    "WECARE HSI": {"sheet": "WECARE HSI", "parser": "first_table"},
+    "WECARE GAUL": {"sheet": "WECARE GAUL", "parser": "widest_table"},
+    "WECARE DATIN": {"sheet": "WECARE DATIN", "parser": "html_fallback"},
+    "TTR DATIN": {"sheet": "TTR DATIN", "parser": "first_table"},
+    "TTR INDIBIZ": {"sheet": "TTR INDIBIZ", "parser": "first_table"},
+    "TTR RESELLER": {"sheet": "TTR RESELLER", "parser": "first_table"},
+}
+
+# Client gspread yang sudah authorize, dipakai ulang selama proses hidup
+_gsheets_client = None
+
+# Hasil import terakhir per report: "uploaded" / "skipped" / "failed"
+import_status = {}
+
+
+def col_idx_to_a1(col_idx: int) -> str:
+    result = ""
+    while col_idx > 0:
+        col_idx, rem = divmod(col_idx - 1, 26)
+        result = chr(ord('A') + rem) + result
+    return result
+
+
+def find_latest_download():
+    xls_files = glob.glob(os.path.join(DOWNLOADS_FOLDER, "*.xls*"))
+    if not xls_files:
+        print("❌ Tidak ada file Excel/HTML di folder Downloads")
+        return None
+
+    latest_file = max(xls_files, key=os.path.getmtime)
+    print(f"✓ File: {latest_file}")
+    print(f"  Modified: {datetime.fromtimestamp(os.path.getmtime(latest_file))}")
+    return latest_file
+
+
+# ===================== PARSE =====================
+
+def _is_html_like(file_path):
+    with open(file_path, 'rb') as f:
+        header = f.read(2000).decode('utf-8', errors='ignore').lower()
+    return ('<table' in header) or ('<html' in header)
+
+
+def _read_excel_native(file_path):
+    if file_path.lower().endswith('.xls'):
+        print("  📄 XLS asli → pandas.read_excel(engine='xlrd')")
+        return _frame_to_table(pd.read_excel(file_path, engine='xlrd'))
+    print("  📄 XLSX → pandas.read_excel(engine='openpyxl')")
+    return _frame_to_table(pd.read_excel(file_path, engine='openpyxl'))
+
+
+def _frame_to_table(df):
+    # Kolumnar langsung dari DataFrame, tanpa df.fillna("").values.tolist()
+    return ColumnTable.from_frame(df)
+
+
+def _parse_first_table(file_path):
+    if _is_html_like(file_path):
+        print("  🌐 HTML TABLE (.xls TelkomCare) → streaming lxml (tabel pertama)")
+        return read_table_columns(file_path, "first")
+    return _read_excel_native(file_path)
+
+
+def _parse_html_fallback(file_path):
+    if not _is_html_like(file_path):
+        return _read_excel_native(file_path)
+
+    print("  🌐 HTML TABLE (.xls TelkomCare) → streaming lxml (tabel pertama)")
+    try:
+        return read_table_columns(file_path, "first")
+    except Exception as e:
+        print(f"  ❌ Error parse HTML: {e}")
+        print("  ⚠️ Coba fallback ke read_excel(engine='xlrd')...")
+        return _frame_to_table(pd.read_excel(file_path, engine='xlrd'))
+
+
+def _parse_widest_table(file_path):
+    # Semua file GAUL ternyata HTML bertabel; ambil tabel dengan kolom
+    # terbanyak (biasanya tabel data utama)
+    print("  🌐 HTML TABLE (.xls TelkomCare GAUL) → streaming lxml (tabel terlebar)")
+    data = read_table_columns(file_path, "widest")
+    print(f"  ℹ️ Dipilih tabel dengan shape: ({len(data)}, {data.n_cols})")
+    return data
+
+
+PARSERS = {
+    "first_table": _parse_first_table,
+    "html_fallback": _parse_html_fallback,
+    "widest_table": _parse_widest_table,
+}
+
+
+def read_excel_data(file_path, parser="first_table"):
+    print(f"\n📖 Membaca: {os.path.basename(file_path)}")
+    try:
+        data = PARSERS[parser](file_path)
+
+        if not data:
+            print("⚠️ Tabel kosong, tidak ada data di file ini.")
+            return []
+
+        print(f"✓ {len(data)} baris × {data.n_cols} kolom")
+
+        if data:
+            print("📋 Preview:")
+            print(f"Header: {data[0][:10]}{'...' if len(data[0]) > 10 else ''}")
+            if len(data) > 1:
+                print(f"Row 2:  {data[1][:10]}{'...' if len(data[1]) > 10 else ''}")
+        return data
+
+    except Exception as e:
+        print(f"❌ Error baca file: {e}")
+        print("💡 Pastikan sudah install: py -m pip install pandas xlrd openpyxl lxml html5lib")
+        return None
+
+
+# ===================== GOOGLE SHEETS =====================
+
+def setup_gsheets():
+    """
+    Authorize service account sekali per proses; panggilan berikutnya
+    memakai client yang sama (credentials.json tidak dibaca ulang).
+    """
+    global _gsheets_client
+    if _gsheets_client is not None:
+        return _gsheets_client
+
+    try:
+        scopes = [
+            'https://www.googleapis.com/auth/spreadsheets',
+            'https://www.googleapis.com/auth/drive'
+        ]
+        creds = Credentials.from_service_account_file(str(CREDENTIALS_PATH), scopes=scopes)
+        _gsheets_client = gspread.authorize(creds)
+        return _gsheets_client
+    except Exception as e:
+        print(f"❌ Google Sheets error: {e}")
+        print("Pastikan 'credentials.json' ada dan formatnya benar.")
+        return None
+
+
+def _write_full(ws, table, sheet_name):
+    """Clear A2:<col>100000 lalu tulis ulang semua baris. Return statistik upload."""
+    last_col_letter = col_idx_to_a1(table.n_cols)
+    clear_range = f"A2:{last_col_letter}100000"
+    print(f"🧹 Clear range data lama (tanpa header): {clear_range}")
+    with_retry(lambda: ws.batch_clear([clear_range]), f"clear {clear_range}")
+
+    print(f"✓ Upload {len(table)} baris × {table.n_cols} kolom (tulis penuh)")
+    return send_row_ranges(ws, table, [(0, len(table))], last_col_letter, sheet_name,
+                           row_sizes=table.digest()["row_sizes"])
+
+
+def _write_diff(ws, table, old_hashes, new_hashes, sheet_name):
+    """
+    Kirim hanya range baris yang berubah, lalu clear ekor kalau jumlah
+    baris menyusut. Return statistik upload.
+    """
+    last_col_letter = col_idx_to_a1(table.n_cols)
+    ranges = changed_ranges(old_hashes, new_hashes)
+    changed = sum(end - start for start, end in ranges)
+    print(f"🔍 Diff vs shadow: {len(ranges)} range, {changed} dari {len(table)} baris berubah")
+
+    stats = send_row_ranges(ws, table, ranges, last_col_letter, sheet_name,
+                            row_sizes=table.digest()["row_sizes"])
+
+    if len(new_hashes) < len(old_hashes):
+        tail = f"A{len(new_hashes) + 2}:{last_col_letter}{len(old_hashes) + 1}"
+        print(f"🧹 Report menyusut {len(old_hashes)} → {len(new_hashes)} baris, clear {tail}")
+        with_retry(lambda: ws.batch_clear([tail]), f"clear {tail}")
+    return stats
+
+
+def upload_to_sheets(data, spreadsheet_id, sheet_name):
+    """
+    Upload data ke sheet mulai baris 2 (header baris 1 dipertahankan).
+    Kalau ada shadow copy dari upload sebelumnya (telkomcare_sheetdiff),
+    hanya baris yang berubah yang dikirim; tanpa shadow → clear + tulis penuh.
+    Pengiriman lewat telkomcare_upload: chunk per ukuran byte, paralel, retry.
+    data: ColumnTable (atau list baris); baris Python hanya dibuat per chunk.
+    """
+    print(f"\n📤 Upload ke sheet '{sheet_name}'...")
+
+    if not data:
+        print("❌ Data kosong, tidak ada yang diupload.")
+        return False
+
+    table = as_column_table(data)
+    try:
+        gc = setup_gsheets()
+        if not gc:
+            return False
+
+        sh = gc.open_by_key(spreadsheet_id)
+
+        shadow = load_shadow(spreadsheet_id, sheet_name)
+        try:
+            ws = sh.worksheet(sheet_name)
+            print(f"✓ Sheet '{sheet_name}' ditemukan, header baris 1 akan dipertahankan.")
+        except gspread.exceptions.WorksheetNotFound:
+            print(f"⚠️ Sheet '{sheet_name}' tidak ditemukan, membuat baru...")
+            ws = sh.add_worksheet(title=sheet_name, rows=len(table) + 10, cols=table.n_cols + 10)
+            shadow = None
+
+        # Lebar kolom sudah seragam di ColumnTable; hash baris dari satu pass digest()
+        max_cols = table.n_cols
+        new_hashes = table.digest()["row_hashes"]
+        total_rows = len(table)
+
+        # Shadow dihapus dulu: kalau upload putus di tengah, run berikutnya tulis penuh
+        drop_shadow(spreadsheet_id, sheet_name)
+        if shadow is not None and shadow.get("cols") == max_cols:
+            stats = _write_diff(ws, table, shadow["hashes"], new_hashes, sheet_name)
+        else:
+            if shadow is not None:
+                print(f"   ℹ️ Jumlah kolom berubah {shadow.get('cols')} → {max_cols}, tulis ulang penuh.")
+            stats = _write_full(ws, table, sheet_name)
+        save_shadow(spreadsheet_id, sheet_name, max_cols, new_hashes)
+
+        print(f"\n✅ Data berhasil diupload!")
+        print(f"   Total: {total_rows} baris × {max_cols} kolom (mulai baris 2), dikirim {stats['rows']} baris")
+        print(f"   Header baris 1 dipertahankan.")
+        print(f"   Sheet: {sheet_name}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Upload error: {e}")
+        print("💡 Cek: jaringan, ukuran data, dan status API jika ada error lain.")
+        return False
+
+
+# ===================== ENTRY POINT =====================
+
+def import_report(report, file_path=None):
+    """
+    Import satu report (nama dari REPORTS) ke Google Sheets.
+    file_path None → pakai file terbaru di Downloads (perilaku script lama).
+    Kalau isi hasil parse sama persis dengan upload sukses terakhir
+    (telkomcare_snapshot), upload dilewati.
+    Return True kalau upload sukses atau dilewati karena tidak berubah;
+    detailnya di import_status[report].
+    """
+    spec = REPORTS[report]
+    import_status[report] = "failed"
+
+    print("=" * 70)
+    print(f"🚀 IMPORT TELKOMCARE (.xls HTML) KE GOOGLE SHEETS ({report})")
+    print("=" * 70)
+
+    # Path eksplisit (dari run_cycle) lebih diutamakan daripada file terbaru di Downloads
+    if file_path:
+        print(f"✓ File: {file_path}")
+    else:
+        file_path = find_latest_download()
+    if not file_path:
+        return False
+
+    with span("parse", report) as rec:
+        data = read_excel_data(file_path, spec["parser"])
+        rec["rows"] = len(data) if data else 0
+        rec["ok"] = bool(data)
+    if not data:
+        print("❌ Tidak ada data untuk diupload.")
+        return False
+
+    data = as_column_table(data)
+    digest = data.digest()["content_hash"]
+
+    # Arsip Parquet tiap snapshot (juga kalau isinya sama dengan upload terakhir)
+    try:
+        with span("archive", report) as rec:
+            archived = archive_report(report, data)
+            rec.update(rows=archived["rows"] if archived else 0,
+                       bytes=archived["bytes"] if archived else 0,
+                       status="archived" if archived else "skipped")
+    except Exception as e:
+        print(f"⚠️ Gagal menulis arsip {report}: {e}")
+
+    # Upsert per tiket ke gudang SQLite (hanya tiket baru / berubah / hilang yang ditulis)
+    try:
+        with span("warehouse", report) as rec:
+            ingested = ingest_report(report, data)
+            rec.update(rows=(ingested["inserted"] + ingested["updated"] + ingested["gone"]) if ingested else 0,
+                       status=ingested["status"] if ingested else "skipped")
+    except Exception as e:
+        print(f"⚠️ Gagal ingest gudang tiket {report}: {e}")
+    if is_unchanged(report, digest):
+        import_status[report] = "skipped"
+        record_span("upload", 0.0, report, rows=0, status="skipped")
+        print(f"\n⏭  Isi {report} sama dengan upload terakhir (hash {digest[:12]}), upload dilewati.")
+        print("=" * 70)
+        return True
+
+    last_upload_stats.pop(spec["sheet"], None)
+    with span("upload", report) as rec:
+        success = upload_to_sheets(data, SPREADSHEET_ID, spec["sheet"])
+        stats = last_upload_stats.get(spec["sheet"], {})
+        rec.update(ok=success, rows=stats.get("rows", 0), bytes=stats.get("bytes", 0),
+                   status="uploaded" if success else "failed")
+    if success:
+        import_status[report] = "uploaded"
+        record_snapshot(report, digest, len(data), data.n_cols)
+    else:
+        drop_snapshot(report)
+
+    print("\n" + "=" * 70)
+    print("✅ SELESAI!" if success else "❌ GAGAL!")
+    print("=" * 70)
+    return success
@@ -7,11 +7,7 @@ os.environ["KMP_DUPLICATE_LIB_OK"] = "True"
 warnings.filterwarnings("ignore", message=".*pin_memory.*")
 warnings.filterwarnings("ignore", message=".*CUDA not available.*")
 
-import time
 import pyotp
-import easyocr
-import cv2
-import numpy as np
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -23,7 +19,10 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 from shutil import which
 
-from telkomcare_session import save_session_cookie_from_driver  # <=== penting
+from telkomcare_session import BASE_URL, save_session_cookie_from_driver  # <=== penting
+from telkomcare_browser import PERSISTENT_BROWSER, close_driver, get_persistent_driver
+from telkomcare_captcha import get_solver, preprocess_captcha, save_captcha_sample
+from telkomcare_wait import wait_for, wait_page_settled, wait_until
 
 # ==================== LOGGING & ENV ====================
 
@@ -42,14 +41,13 @@ if not USERNAME or not PASSWORD or not TOTP_SECRET:
         "Env TELKOM_USERNAME / TELKOM_PASSWORD / TELKOM_TOTP_SECRET belum di-set"
     )
 
-# EasyOCR untuk bahasa Indonesia
-reader = easyocr.Reader(["id"], gpu=False)
-
-
 # ==================== DRIVER SETUP ====================
 
 
 def setup_driver():
+    if PERSISTENT_BROWSER:
+        return get_persistent_driver()
+
     chrome_prefs = {
         "credentials_enable_service": False,
         "profile.password_manager_enabled": False,
@@ -72,43 +70,24 @@ def setup_driver():
 
 
 def solve_captcha_ai(element):
-    """Baca CAPTCHA Telkomcare sebagai lowercase+angka (murni OCR)."""
-    img_bytes = element.screenshot_as_png
-    nparr = np.frombuffer(img_bytes, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
-
-    img = cv2.resize(img, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_LINEAR)
-    img = cv2.GaussianBlur(img, (3, 3), 0)
-
-    candidates = []
-
-    # Config 1: lowercase + digit
-    r1 = reader.readtext(img, detail=0, allowlist="0123456789abcdefghijklmnopqrstuvwxyz")
-    if r1:
-        candidates.append("".join(r1))
-
-    # Config 2: digit only
-    r2 = reader.readtext(img, detail=0, allowlist="0123456789")
-    if r2:
-        candidates.append("".join(r2))
-
-    # Config 3: full bebas
-    r3 = reader.readtext(img, detail=0)
-    if r3:
-        candidates.append("".join(r3))
-
-    best = ""
-    for raw in candidates:
-        teks = raw.lower().replace(" ", "")
-        teks = "".join(ch for ch in teks if ch.isalnum())
-        if len(teks) > len(best):
-            best = teks
+    """
+    Baca CAPTCHA Telkomcare sebagai lowercase+angka (murni OCR).
+    element boleh WebElement <img> atau bytes PNG screenshot-nya.
+    """
+    img_bytes = element if isinstance(element, bytes) else element.screenshot_as_png
+    img = preprocess_captcha(img_bytes)
+    backend, solver = get_solver()
+    best, info = solver(img)
 
+    steps = ", ".join(f"{k}={v:.0f}ms" for k, v in info["ms"].items())
     if best:
-        logging.info(f"CAPTCHA OCR -> '{best}'")
+        logging.info(
+            f"CAPTCHA OCR [{backend}] -> '{best}' (strategy={info['strategy']}, "
+            f"conf={info['confidence']:.2f}, {info['total_ms']:.0f}ms: {steps})"
+        )
         return best
 
-    logging.warning("CAPTCHA OCR: no text detected")
+    logging.warning(f"CAPTCHA OCR [{backend}]: no text detected ({info['total_ms']:.0f}ms: {steps})")
     return ""
 
 
@@ -124,7 +103,8 @@ def close_password_manager_popup(driver):
             if any(word in txt for word in ("ok", "got it", "oke", "dismiss")):
                 driver.execute_script("arguments[0].click();", btn)
                 logging.info(f"Closed password manager popup: {btn.text}")
-                time.sleep(1)
+                wait_for(driver, "popup password manager", EC.invisibility_of_element(btn),
+                         timeout=3, raise_on_timeout=False)
                 return
     except Exception:
         pass
@@ -171,7 +151,15 @@ def login_otomatis():
         wait = WebDriverWait(driver, 20)
         logging.info("=== Telkomcare – FULL AUTO LOGIN START ===")
 
-        driver.get("https://telkomcare.telkom.co.id")
+        driver.get(BASE_URL)
+
+        # Profil Chrome persisten bisa saja masih login → lewati CAPTCHA/OTP
+        if not driver.find_elements(By.ID, "uname") and check_login_success(
+            driver, WebDriverWait(driver, 3)
+        ):
+            logging.info("Profil browser masih login, CAPTCHA/OTP dilewati.")
+            save_session_cookie_from_driver(driver)
+            return driver
 
         # ---------- LOGIN + CAPTCHA ----------
         attempt = 0
@@ -192,11 +180,11 @@ def login_otomatis():
                 EC.presence_of_element_located((By.CSS_SELECTOR, "#captcha-element img"))
             )
 
-            teks_captcha = solve_captcha_ai(captcha_img)
+            captcha_png = captcha_img.screenshot_as_png
+            teks_captcha = solve_captcha_ai(captcha_png)
             if not teks_captcha:
                 logging.warning("OCR empty, refresh page & retry")
                 driver.refresh()
-                time.sleep(2)
                 continue
 
             captcha_input = driver.find_element(By.ID, "captcha-input")
@@ -209,20 +197,22 @@ def login_otomatis():
             submit_btn = driver.find_element(By.ID, "submit")
             driver.execute_script("arguments[0].click();", submit_btn)
 
-            time.sleep(3)
+            # Form login di-POST → tunggu halaman berikutnya selesai load
+            wait_page_settled(driver, "submit CAPTCHA", timeout=10, idle=1.0)
 
             # Kalau masih ada field captcha-input -> gagal
             if driver.find_elements(By.ID, "captcha-input"):
                 logging.warning(f"Server reject CAPTCHA '{teks_captcha}', retry loop")
-                time.sleep(1.5)
+                save_captcha_sample(captcha_png, teks_captcha, accepted=False)
                 continue
 
             logging.info("CAPTCHA accepted! Proceed to OTP stage.")
+            save_captcha_sample(captcha_png, teks_captcha, accepted=True)
             break
 
         # ---------- OTP ----------
         logging.info("Waiting OTP page...")
-        time.sleep(3)
+        wait_page_settled(driver, "halaman OTP", timeout=10)
         close_password_manager_popup(driver)
 
         # Coba ambil field OTP; jika tidak ada tapi sudah di dashboard -> sukses
@@ -287,9 +277,9 @@ def login_otomatis():
         max_otp_retries = 5
         for retry in range(1, max_otp_retries + 1):
             driver.execute_script("arguments[0].focus();", otp_first)
-            time.sleep(0.5)
 
-            token = pyotp.TOTP(TOTP_SECRET).now()[-6:]
+            totp = pyotp.TOTP(TOTP_SECRET)
+            token = totp.now()[-6:]
             logging.info(f"[OTP] Attempt {retry}: {token}")
 
             for i, digit in enumerate(token):
@@ -297,7 +287,12 @@ def login_otomatis():
                 driver.execute_script("arguments[0].scrollIntoView(true);", box)
                 box.clear()
                 box.send_keys(digit)
-                time.sleep(0.1)
+                # Field OTP pindah fokus otomatis lewat JS → tunggu digit benar-benar masuk
+                wait_until(
+                    "isi digit OTP",
+                    lambda: box.get_attribute("value") == digit,
+                    timeout=2, poll=0.02, raise_on_timeout=False,
+                )
 
             otp_btn = wait_otp_button_enabled()
             if otp_btn is None:
@@ -308,14 +303,18 @@ def login_otomatis():
             driver.execute_script("arguments[0].scrollIntoView(true);", otp_btn)
             driver.execute_script("arguments[0].click();", otp_btn)
 
-            time.sleep(5)
-            if check_login_success(driver, wait):
+            wait_page_settled(driver, "verify OTP", timeout=10, idle=1.0)
+            if check_login_success(driver, WebDriverWait(driver, 5)):
                 logging.info("=== FULL LOGIN SUCCESS (CAPTCHA + OTP AUTO) ===")
                 save_session_cookie_from_driver(driver)
                 return driver
 
             logging.warning("OTP rejected / page not changed, wait next TOTP window")
-            time.sleep(25)
+            wait_until(
+                "TOTP window berikutnya",
+                lambda: totp.now()[-6:] != token,
+                timeout=totp.interval + 1, poll=0.5, raise_on_timeout=False,
+            )
 
         raise Exception("OTP failed after auto retries")
 
@@ -330,5 +329,5 @@ def login_otomatis():
                     return driver
             except Exception:
                 pass
-            driver.quit()
+            close_driver(driver)
         return None
@@ -0,0 +1,169 @@
+# telkomcare_metrics.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from telkomcare_state import STATE_DIR
+
+# Timing per tahap cycle (probe session, login, download, parse, upload) per
+# report. Di akhir cycle ditulis sebagai file textfile-collector Prometheus
+# (node_exporter --collector.textfile.directory) dan satu baris JSON yang
+# di-append ke history lokal.
+METRICS_TEXTFILE = Path(os.getenv("TC_METRICS_TEXTFILE", str(STATE_DIR / "telkomcare.prom")))
+METRICS_HISTORY = Path(os.getenv("TC_METRICS_HISTORY", str(STATE_DIR / "metrics_history.jsonl")))
+
+# [{"stage", "report", "seconds", "ok", ...}] untuk cycle yang sedang jalan
+spans = []
+_lock = threading.Lock()
+
+
+def record_span(stage, seconds, report=None, ok=True, **extra):
+    """Catat satu span yang durasinya sudah diukur di tempat lain."""
+    rec = {"stage": stage, "report": report, "seconds": seconds, "ok": ok, **extra}
+    with _lock:
+        spans.append(rec)
+    return rec
+
+
+@contextmanager
+def span(stage, report=None, **extra):
+    """
+    Ukur blok sebagai span. Yang di-yield adalah dict span, jadi blok bisa
+    mengisi field tambahan (mis. rec["rows"]) atau menandai rec["ok"] = False.
+    Exception di dalam blok → ok=False, lalu diteruskan.
+    """
+    rec = {"stage": stage, "report": report, "ok": True, **extra}
+    start = time.perf_counter()
+    try:
+        yield rec
+    except BaseException:
+        rec["ok"] = False
+        raise
+    finally:
+        rec["seconds"] = time.perf_counter() - start
+        with _lock:
+            spans.append(rec)
+
+
+def reset_spans():
+    with _lock:
+        spans.clear()
+
+
+# ===================== RINGKASAN CYCLE =====================
+
+def build_cycle_metrics(started_at, wall_seconds, records=None):
+    """
+    Gabungkan span jadi satu dict cycle:
+    {"started_at", "wall_seconds", "stages": {stage: detik},
+     "reports": {report: {stage: {"seconds", "ok", "rows", "rows_per_s"}}}}
+    """
+    stages = {}
+    reports = {}
+    for rec in spans if records is None else records:
+        report = rec.get("report")
+        if report is None:
+            stages[rec["stage"]] = stages.get(rec["stage"], 0.0) + rec["seconds"]
+            continue
+        entry = {"seconds": rec["seconds"], "ok": rec["ok"]}
+        if rec.get("rows") is not None:
+            entry["rows"] = rec["rows"]
+            entry["rows_per_s"] = rec["rows"] / rec["seconds"] if rec["seconds"] > 0 else 0.0
+        for key in ("status", "bytes"):
+            if key in rec:
+                entry[key] = rec[key]
+        reports.setdefault(report, {})[rec["stage"]] = entry
+    return {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "timestamp": started_at.timestamp(),
+        "wall_seconds": wall_seconds,
+        "stages": stages,
+        "reports": reports,
+    }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(cycle):
+    """Format exposition Prometheus (text) untuk satu cycle."""
+    lines = [
+        "# HELP telkomcare_cycle_seconds Durasi wall-clock cycle terakhir.",
+        "# TYPE telkomcare_cycle_seconds gauge",
+        f"telkomcare_cycle_seconds {cycle['wall_seconds']:.3f}",
+        "# HELP telkomcare_cycle_timestamp_seconds Waktu mulai cycle terakhir (unix).",
+        "# TYPE telkomcare_cycle_timestamp_seconds gauge",
+        f"telkomcare_cycle_timestamp_seconds {cycle['timestamp']:.0f}",
+        "# HELP telkomcare_stage_seconds Durasi tahap cycle (di luar per-report).",
+        "# TYPE telkomcare_stage_seconds gauge",
+    ]
+    for stage, seconds in sorted(cycle["stages"].items()):
+        lines.append(f'telkomcare_stage_seconds{{stage="{_label(stage)}"}} {seconds:.3f}')
+
+    families = [
+        ("telkomcare_report_stage_seconds", "Durasi tahap per report.", "seconds", "{:.3f}"),
+        ("telkomcare_report_stage_ok", "1 kalau tahap report sukses.", "ok", "{:d}"),
+        ("telkomcare_report_stage_rows", "Jumlah baris yang diproses tahap report.", "rows", "{:d}"),
+        ("telkomcare_report_stage_rows_per_second", "Throughput baris per detik.", "rows_per_s", "{:.1f}"),
+    ]
+    for name, help_text, key, fmt in families:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for report, stages in sorted(cycle["reports"].items()):
+            for stage, entry in sorted(stages.items()):
+                if key not in entry:
+                    continue
+                value = int(entry[key]) if fmt == "{:d}" else entry[key]
+                lines.append(
+                    f'{name}{{report="{_label(report)}",stage="{_label(stage)}"}} {fmt.format(value)}'
+                )
+    return "\n".join(lines) + "\n"
+
+
+def write_cycle_metrics(cycle, textfile=None, history=None):
+    """
+    Tulis textfile Prometheus (atomik: node_exporter tidak boleh membaca file
+    setengah jadi) dan append satu baris JSON ke history.
+    """
+    textfile = Path(textfile or METRICS_TEXTFILE)
+    history = Path(history or METRICS_HISTORY)
+
+    textfile.parent.mkdir(parents=True, exist_ok=True)
+    tmp = textfile.with_name(textfile.name + ".tmp")
+    tmp.write_text(render_prometheus(cycle), encoding="utf-8")
+    os.replace(tmp, textfile)
+
+    history.parent.mkdir(parents=True, exist_ok=True)
+    with open(history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(cycle, ensure_ascii=False) + "\n")
+    print(f"📈 Metrik cycle → {textfile} + {history}")
+
+
+def print_cycle_metrics(cycle):
+    print(f"\n⏱  Timing cycle: {cycle['wall_seconds']:.1f}s total")
+    for stage, seconds in cycle["stages"].items():
+        print(f"   {stage:<16} {seconds:7.1f}s")
+    for report, stages in cycle["reports"].items():
+        parts = []
+        for stage, entry in stages.items():
+            part = f"{stage} {entry['seconds']:.1f}s"
+            if entry.get("rows"):
+                part += f" ({entry['rows_per_s']:.0f} baris/s)"
+            if not entry["ok"]:
+                part += " ❌"
+            parts.append(part)
+        print(f"   {report:<16} " + ", ".join(parts))
+
+
+def finish_cycle(started_at, wall_seconds):
+    """Bangun metrik dari span cycle ini, cetak, dan tulis ke disk (error tidak fatal)."""
+    cycle = build_cycle_metrics(started_at, wall_seconds)
+    print_cycle_metrics(cycle)
+    try:
+        write_cycle_metrics(cycle)
+    except OSError as e:
+        print(f"⚠️ Gagal menulis metrik cycle: {e}")
+    return cycle
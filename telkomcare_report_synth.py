@@ -0,0 +1,274 @@
+# telkomcare_report_synth.py
+import argparse
+import html
+import os
+import random
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Generator report sintetis berbentuk export TelkomCare (.xls yang isinya
+# HTML <table>) maupun .xls/.xlsx asli, untuk server tiruan
+# (mock_telkomcare.py) dan benchmark parser (bench_parse.py).
+# Isi deterministik per (report, seed, version); `churn` = fraksi baris yang
+# isinya berubah tiap version naik, meniru tiket yang di-update antar cycle.
+
+BASE_COLUMNS = [
+    "NO", "INCIDENT", "CUSTOMER NAME", "SERVICE NO", "SUMMARY", "REPORTED DATE",
+    "STATUS", "TTR CUSTOMER", "REGIONAL", "WITEL", "WORKZONE", "SEGMEN",
+    "PRODUCT", "CLOSE DESC", "JAM", "COMPLY",
+]
+
+STATUSES = ["OPEN", "BACKEND", "RESOLVED", "CLOSED", "MEDIACARE", "SALAMSIM"]
+WORKZONES = ["SRG", "CLG", "TNG", "CKD", "PDG", "RKS", "LBK", "MRK"]
+PRODUCTS = ["INTERNET", "VOICE", "IPTV", "ASTINET", "VPN IP", "METRO-E", "WIFI.ID"]
+
+# Prefix tiket & jumlah tabel kecil sebelum tabel data (GAUL: tabel terlebar)
+REPORT_SHAPES = {
+    "WECARE HSI": {"prefix": "INC", "leading_tables": 0},
+    "WECARE GAUL": {"prefix": "INC", "leading_tables": 1},
+    "WECARE DATIN": {"prefix": "IND", "leading_tables": 0},
+    "TTR DATIN": {"prefix": "IND", "leading_tables": 0},
+    "TTR INDIBIZ": {"prefix": "INB", "leading_tables": 0},
+    "TTR RESELLER": {"prefix": "INR", "leading_tables": 0},
+}
+
+_EPOCH = datetime(2025, 1, 1)
+
+
+def report_columns(cols=len(BASE_COLUMNS)):
+    """Header report: kolom TelkomCare umum, ditambah KOLOM_<n> sampai `cols`."""
+    header = BASE_COLUMNS[:cols]
+    header += [f"KOLOM_{i}" for i in range(len(header) + 1, cols + 1)]
+    return header
+
+
+def _cell(col, ci, i, rng, prefix):
+    name = col if col in BASE_COLUMNS else None
+    if name == "NO":
+        return i + 1
+    if name == "INCIDENT":
+        return f"{prefix}{40000000 + i}"
+    if name == "CUSTOMER NAME":
+        return f"PELANGGAN {rng.randrange(1, 50000):05d}"
+    if name == "SERVICE NO":
+        return f"1{rng.randrange(10**10, 10**11)}"
+    if name == "SUMMARY":
+        return f"Gangguan {rng.choice(PRODUCTS).lower()} & <loss> {rng.randrange(1, 99)}"
+    if name == "REPORTED DATE":
+        return (_EPOCH + timedelta(minutes=rng.randrange(0, 600000))).strftime("%Y-%m-%d %H:%M:%S")
+    if name == "STATUS":
+        return rng.choice(STATUSES)
+    if name == "TTR CUSTOMER":
+        return round(rng.uniform(0, 72), 2)
+    if name == "REGIONAL":
+        return "REGIONAL 2"
+    if name == "WITEL":
+        return "BANTEN"
+    if name == "WORKZONE":
+        return rng.choice(WORKZONES)
+    if name == "SEGMEN":
+        return rng.choice(["DBS", "DES", "DGS", "RBS"])
+    if name == "PRODUCT":
+        return rng.choice(PRODUCTS)
+    if name == "CLOSE DESC":
+        # Kosong di sebagian baris (meniru sel NaN → "" di importer)
+        return "" if rng.random() < 0.3 else f"Perbaikan {rng.choice(['ODP', 'ONT', 'DROPCORE'])}"
+    if name == "JAM":
+        return rng.randrange(0, 24)
+    if name == "COMPLY":
+        return rng.choice(["COMPLY", "NOT COMPLY"])
+    # Kolom tambahan: tipe bergantian per kolom (angka, kode, desimal kosong)
+    kind = ci % 3
+    if kind == 0:
+        return rng.randrange(0, 100000)
+    if kind == 1:
+        return f"V{rng.randrange(0, 10**6)}"
+    return "" if rng.random() < 0.2 else round(rng.uniform(0, 1000), 3)
+
+
+def report_date(i, rows, date_span):
+    """REPORTED DATE baris ke-i kalau tanggal disebar rata: date_span = (mulai, jumlah hari)."""
+    start, days = date_span
+    return start + timedelta(minutes=i * days * 1440 // rows)
+
+
+def date_index_range(rows, date_span, startdate, enddate):
+    """[lo, hi) index baris yang REPORTED DATE-nya jatuh di tanggal startdate..enddate (inklusif)."""
+    start, days = date_span
+    total = days * 1440
+
+    def first_index(day):
+        minutes = (datetime.combine(day, datetime.min.time()) - start).total_seconds() // 60
+        minutes = min(max(minutes, 0), total)
+        return min(rows, -(-int(minutes) * rows // total))
+
+    return first_index(startdate), first_index(enddate + timedelta(days=1))
+
+
+def iter_report_rows(report, rows, cols=len(BASE_COLUMNS), seed=0, version=0, churn=0.0,
+                     date_span=None, index_range=None):
+    """
+    Yield baris (list nilai) report sintetis. date_span = (datetime mulai,
+    jumlah hari) → REPORTED DATE urut rata di rentang itu (untuk export TTR
+    per tanggal); index_range = (lo, hi) → hanya baris index lo..hi-1.
+    """
+    prefix = REPORT_SHAPES.get(report, {"prefix": "INC"})["prefix"]
+    header = report_columns(cols)
+    base_seed = zlib.crc32(f"{report}|{seed}".encode("utf-8"))
+    date_col = header.index("REPORTED DATE") if date_span and "REPORTED DATE" in header else None
+    no_col = header.index("NO") if "NO" in header else None
+    lo, hi = index_range or (0, rows)
+    for i in range(lo, hi):
+        # Isi baris ditentukan version terakhir yang mengenai baris ini (churn)
+        row_version = 0
+        if churn:
+            for v in range(version, 0, -1):
+                if random.Random(base_seed ^ (v * 7919) ^ (i * 104729)).random() < churn:
+                    row_version = v
+                    break
+        rng = random.Random(base_seed + i * 1000003 + row_version * 31)
+        row = [_cell(col, ci, i, rng, prefix) for ci, col in enumerate(header)]
+        if date_col is not None:
+            row[date_col] = report_date(i, rows, date_span).strftime("%Y-%m-%d %H:%M:%S")
+        if no_col is not None:
+            row[no_col] = i - lo + 1  # nomor urut mulai 1 per export
+        yield row
+
+
+def _html_cell(value):
+    return html.escape(str(value), quote=False)
+
+
+def iter_html_report(report, rows, cols=len(BASE_COLUMNS), seed=0, version=0, churn=0.0,
+                     batch_rows=2000, date_span=None, index_range=None):
+    """Yield potongan bytes export HTML-as-xls (tidak pernah menahan seluruh file di memori)."""
+    header = report_columns(cols)
+    out = [
+        "<html><head><meta http-equiv=\"Content-Type\" content=\"text/html; charset=utf-8\">"
+        "</head><body>\n"
+    ]
+    for _ in range(REPORT_SHAPES.get(report, {}).get("leading_tables", 0)):
+        # Tabel ringkasan kecil (lebih sempit dari tabel data)
+        out.append(f"<table border=\"1\"><tr><th>KATEGORI</th><th>JUMLAH</th></tr>"
+                   f"<tr><td>{html.escape(report)}</td><td>{rows}</td></tr></table>\n")
+    out.append("<table border=\"1\">\n<thead><tr>")
+    out.append("".join(f"<th>{_html_cell(h)}</th>" for h in header))
+    out.append("</tr></thead>\n<tbody>\n")
+    yield "".join(out).encode("utf-8")
+
+    buf = []
+    for n, row in enumerate(iter_report_rows(report, rows, cols, seed, version, churn,
+                                             date_span, index_range), 1):
+        buf.append("<tr>" + "".join(f"<td>{_html_cell(v)}</td>" for v in row) + "</tr>\n")
+        if n % batch_rows == 0:
+            yield "".join(buf).encode("utf-8")
+            buf = []
+    buf.append("</tbody>\n</table>\n</body></html>\n")
+    yield "".join(buf).encode("utf-8")
+
+
+def render_html_report(report, rows, **kwargs):
+    return b"".join(iter_html_report(report, rows, **kwargs))
+
+
+def write_html_report(path, report, rows, **kwargs):
+    """Tulis export HTML-as-xls ke path; return jumlah byte."""
+    total = 0
+    with open(path, "wb") as f:
+        for chunk in iter_html_report(report, rows, **kwargs):
+            f.write(chunk)
+            total += len(chunk)
+    return total
+
+
+# ===================== XLS / XLSX ASLI =====================
+
+# Batas baris format BIFF8 (.xls), termasuk header
+XLS_MAX_ROWS = 65536
+
+
+def write_xlsx_report(path, report, rows, cols=len(BASE_COLUMNS), **kwargs):
+    """Tulis report sebagai .xlsx asli (openpyxl write-only, streaming); return jumlah byte."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(report[:31])
+    ws.append(report_columns(cols))
+    for row in iter_report_rows(report, rows, cols, **kwargs):
+        ws.append(row)
+    wb.save(path)
+    return Path(path).stat().st_size
+
+
+def write_xls_report(path, report, rows, cols=len(BASE_COLUMNS), **kwargs):
+    """
+    Tulis report sebagai .xls BIFF8 asli (butuh xlwt, opsional); return jumlah byte.
+    Raise ImportError kalau xlwt tidak ada, ValueError kalau baris > batas .xls.
+    """
+    if rows + 1 > XLS_MAX_ROWS:
+        raise ValueError(f".xls maksimal {XLS_MAX_ROWS - 1} baris data (diminta {rows})")
+    try:
+        import xlwt
+    except ImportError as e:
+        raise ImportError("xlwt belum ter-install (pip install xlwt) untuk membuat .xls asli") from e
+
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet(report[:31])
+    for c, name in enumerate(report_columns(cols)):
+        ws.write(0, c, name)
+    for r, row in enumerate(iter_report_rows(report, rows, cols, **kwargs), 1):
+        for c, value in enumerate(row):
+            ws.write(r, c, value)
+    wb.save(str(path))
+    return Path(path).stat().st_size
+
+
+WRITERS = {
+    "html": (".xls", write_html_report),
+    "xlsx": (".xlsx", write_xlsx_report),
+    "xls": (".xls", write_xls_report),
+}
+
+
+def synth_report_path(directory, report, rows, cols, fmt, seed=0):
+    """Nama file standar untuk cache report sintetis."""
+    ext = WRITERS[fmt][0]
+    slug = report.lower().replace(" ", "_")
+    suffix = "" if fmt == "html" else f"_{fmt}"
+    return Path(directory) / f"{slug}_{rows}x{cols}_s{seed}{suffix}{ext}"
+
+
+def ensure_report_file(directory, report, rows, cols=len(BASE_COLUMNS), fmt="html", seed=0):
+    """Buat file report sintetis kalau belum ada di directory; return path."""
+    path = synth_report_path(directory, report, rows, cols, fmt, seed)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".part")
+        start = time.perf_counter()
+        size = WRITERS[fmt][1](tmp, report, rows, cols=cols, seed=seed)
+        os.replace(tmp, path)
+        print(f"🧪 {path.name}: {rows} baris × {cols} kolom, {size / 1e6:.1f} MB "
+              f"({time.perf_counter() - start:.1f}s)")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator report TelkomCare sintetis")
+    parser.add_argument("--report", default="TTR DATIN", choices=sorted(REPORT_SHAPES))
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--cols", type=int, default=len(BASE_COLUMNS))
+    parser.add_argument("--format", choices=sorted(WRITERS), default="html")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=".", help="folder tujuan")
+    args = parser.parse_args()
+    try:
+        path = ensure_report_file(args.out, args.report, args.rows, args.cols, args.format, args.seed)
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
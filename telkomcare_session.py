@@ -1,15 +1,22 @@
 # telkomcare_session.py
-import time
+import os
 from pathlib import Path
 
 from selenium.common.exceptions import WebDriverException
 
+from telkomcare_browser import close_driver
+from telkomcare_wait import wait_page_settled
+
 BASE_DIR = Path(__file__).resolve().parent
-COOKIES_ENV_PATH = BASE_DIR / "cookies.env"
+COOKIES_ENV_PATH = Path(os.getenv("TC_COOKIES_ENV", str(BASE_DIR / "cookies.env")))
 
 SESSION_COOKIE_NAME = "newtelkomcareapache"
 BASE_DOMAIN = "telkomcare.telkom.co.id"
 
+# Bisa diarahkan ke server tiruan (mock_telkomcare.py) untuk benchmark offline
+BASE_URL = os.getenv("TC_BASE_URL", f"https://{BASE_DOMAIN}").rstrip("/")
+LOGIN_URL = f"{BASE_URL}/public/login?&modules=assurance"
+
 
 def save_session_cookie_from_driver(driver):
     """
@@ -64,27 +71,68 @@ def load_session_from_env():
     return name, domain, value
 
 
-def ensure_logged_in(driver, login_func, first_cycle=False):
+def attach_session_cookie(driver):
+    """
+    Pasang cookie session dari cookies.env ke driver (tanpa cek validitas).
+    Satu kali buka halaman login supaya domain cookie cocok.
+    """
+    name, domain, value = load_session_from_env()
+    driver.get(LOGIN_URL)
+    if value:
+        driver.add_cookie(
+            {
+                "name": name,
+                "value": value,
+                "domain": domain,
+                "path": "/",
+                "secure": True,
+                "httpOnly": False,
+                "sameSite": "Lax",
+            }
+        )
+    return driver
+
+
+def ensure_logged_in(driver, login_func, first_cycle=False, probe=True):
     """
     Coba pakai cookie dari cookies.env.
-    Kalau masih mentok di /public/login -> jalankan login_func()
+    Validitas cookie dicek dulu lewat probe HTTP (telkomcare_http.probe_session);
+    hanya kalau probe tidak bisa memastikan (jaringan error) driver membuka
+    dashboard untuk mengecek.
+    Kalau cookie expired -> jalankan login_func()
     (telkomcare_login.login_otomatis) untuk login ulang + refresh cookies.env.
+    probe=False: pemanggil sudah menjalankan probe dan hasilnya tidak pasti,
+    jadi langsung cek lewat browser tanpa round trip HTTP kedua.
 
     Return:
         - driver lama (kalau cookie masih valid)
         - driver baru hasil login_func() kalau cookie expired/invalid atau driver lama error
     """
+    from telkomcare_http import probe_session  # import lokal: telkomcare_http memakai modul ini
+
+    verdict = probe_session() if probe else None
+    if verdict is False:
+        print("⚠️ Cookie expired/invalid (probe HTTP) → jalankan login otomatis...")
+        close_driver(driver)
+        return login_func()
+    if verdict is True:
+        try:
+            attach_session_cookie(driver)
+        except WebDriverException:
+            print("⚠️ Driver lama error/mati, pakai login otomatis langsung...")
+            return login_func()
+        print("✅ Cookie valid (probe HTTP), cookie dipasang ke driver.")
+        return driver
+
     name, domain, value = load_session_from_env()
 
     # 1) Buka halaman login supaya domain match
     try:
-        driver.get("https://telkomcare.telkom.co.id/public/login?&modules=assurance")
+        driver.get(LOGIN_URL)
     except WebDriverException:
         print("⚠️ Driver lama error/mati, pakai login otomatis langsung...")
         return login_func()
 
-    time.sleep(2)
-
     # 2) Kalau ada value -> inject cookie
     if value:
         driver.add_cookie(
@@ -98,27 +146,20 @@ def ensure_logged_in(driver, login_func, first_cycle=False):
                 "sameSite": "Lax",
             }
         )
-        driver.get(
-            "https://telkomcare.telkom.co.id/assurance/dashboard/alertresponse"
-        )
-        time.sleep(3)
+        driver.get(f"{BASE_URL}/assurance/dashboard/alertresponse")
+        # Halaman dashboard bisa redirect (JS) ke login kalau cookie ditolak
+        wait_page_settled(driver, "dashboard (cookie env)", timeout=15)
     else:
         # Tidak ada value sama sekali di cookies.env → langsung login otomatis
         print("⚠️ TC_SESSION_VALUE kosong → login otomatis...")
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        close_driver(driver)
         return login_func()
 
     cur = (driver.current_url or "").lower()
     if "public/login" in cur or "modules=assurance" in cur:
         print("⚠️ Cookie expired/invalid → jalankan login otomatis...")
         # Tutup driver lama, karena login_otomatis bikin driver baru sendiri
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        close_driver(driver)
 
         new_driver = login_func()
         return new_driver
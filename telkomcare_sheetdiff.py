@@ -0,0 +1,81 @@
+# telkomcare_sheetdiff.py
+"""
+Shadow copy isi Google Sheet terakhir yang ditulis + diff baris.
+
+Tiap sheet disimpan sebagai daftar hash per baris (bukan isi selnya) di
+.telkomcare_state/shadow/, jadi upload berikutnya cukup mengirim range
+baris yang berubah dan membersihkan ekor kalau report menyusut.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+
+from telkomcare_state import STATE_DIR, read_json, write_json
+
+SHADOW_DIR = STATE_DIR / "shadow"
+
+# Shadow lebih tua dari ini → tulis ulang penuh (menyembuhkan edit manual di sheet)
+SHADOW_MAX_AGE_HOURS = float(os.getenv("TC_SHADOW_MAX_AGE_HOURS", "24"))
+
+# Dua range yang terpisah <= sekian baris sama digabung jadi satu range
+MERGE_GAP_ROWS = 2
+
+
+def _shadow_path(spreadsheet_id, sheet_name):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", sheet_name).strip("_").lower()
+    return SHADOW_DIR / f"{spreadsheet_id[:12]}_{slug}.json"
+
+
+def row_hash(row):
+    """Hash pendek satu baris (nilai sudah dinormalisasi lebar kolomnya)."""
+    raw = json.dumps(row, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def load_shadow(spreadsheet_id, sheet_name):
+    """
+    Shadow terakhir: {"cols", "hashes", "written_at"} atau None kalau belum
+    ada / rusak / kedaluwarsa.
+    """
+    shadow = read_json(_shadow_path(spreadsheet_id, sheet_name))
+    if not shadow:
+        return None
+
+    age_hours = (time.time() - shadow.get("written_at", 0)) / 3600
+    if age_hours > SHADOW_MAX_AGE_HOURS:
+        print(f"   ℹ️ Shadow '{sheet_name}' berumur {age_hours:.1f} jam → tulis ulang penuh.")
+        return None
+    return shadow
+
+
+def save_shadow(spreadsheet_id, sheet_name, cols, hashes):
+    write_json(
+        _shadow_path(spreadsheet_id, sheet_name),
+        {"cols": cols, "hashes": hashes, "written_at": time.time()},
+    )
+
+
+def drop_shadow(spreadsheet_id, sheet_name):
+    """Hapus shadow (dipakai kalau upload gagal di tengah → isi sheet tidak pasti)."""
+    try:
+        _shadow_path(spreadsheet_id, sheet_name).unlink()
+    except FileNotFoundError:
+        pass
+
+
+def changed_ranges(old_hashes, new_hashes, merge_gap=MERGE_GAP_ROWS):
+    """
+    Index baris (0-based) yang berubah, dikelompokkan jadi range [start, end).
+    Baris baru di luar panjang shadow lama selalu dianggap berubah.
+    """
+    ranges = []
+    for i, h in enumerate(new_hashes):
+        if i < len(old_hashes) and old_hashes[i] == h:
+            continue
+        if ranges and i - ranges[-1][1] <= merge_gap:
+            ranges[-1][1] = i + 1
+        else:
+            ranges.append([i, i + 1])
+    return [(start, end) for start, end in ranges]
@@ -0,0 +1,70 @@
+# telkomcare_snapshot.py
+import hashlib
+import json
+import os
+import time
+
+from telkomcare_sheetdiff import SHADOW_MAX_AGE_HOURS
+from telkomcare_state import STATE_DIR, read_json, write_json
+
+SNAPSHOT_PATH = STATE_DIR / "snapshots.json"
+
+# TC_FORCE_UPLOAD=1 → selalu upload walaupun isi report sama
+FORCE_UPLOAD = os.getenv("TC_FORCE_UPLOAD", "") not in ("", "0", "false", "False")
+
+
+def content_hash(rows):
+    """
+    Hash isi report dari baris hasil parse (bukan HTML mentah, yang memuat
+    timestamp generate). Urutan baris ikut dihitung.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for row in rows:
+        h.update(json.dumps(row, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _load_all():
+    return read_json(SNAPSHOT_PATH, {})
+
+
+def _save_all(snapshots):
+    write_json(SNAPSHOT_PATH, snapshots, indent=2, sort_keys=True)
+
+
+def get_snapshot(report):
+    """Snapshot terakhir yang sukses diupload: {"hash", "rows", "cols", "uploaded_at"} atau None."""
+    return _load_all().get(report)
+
+
+def is_unchanged(report, digest):
+    """
+    True kalau isi report sama dengan upload sukses terakhir dan snapshot itu
+    belum lebih tua dari TC_SHADOW_MAX_AGE_HOURS.
+    """
+    if FORCE_UPLOAD:
+        return False
+    snap = get_snapshot(report)
+    if not snap or snap.get("hash") != digest:
+        return False
+    age_hours = (time.time() - snap.get("uploaded_at", 0)) / 3600
+    return age_hours <= SHADOW_MAX_AGE_HOURS
+
+
+def record_snapshot(report, digest, rows, cols):
+    snapshots = _load_all()
+    snapshots[report] = {
+        "hash": digest,
+        "rows": rows,
+        "cols": cols,
+        "uploaded_at": time.time(),
+    }
+    _save_all(snapshots)
+
+
+def drop_snapshot(report):
+    """Upload gagal → isi sheet tidak pasti, jangan ada skip di cycle berikutnya."""
+    snapshots = _load_all()
+    if snapshots.pop(report, None) is not None:
+        _save_all(snapshots)
@@ -0,0 +1,29 @@
+# telkomcare_state.py
+import json
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# State lokal antar cycle (shadow sheet, snapshot report, cache probe session, ...).
+# Di GitHub Actions folder ini dipulihkan lewat actions/cache.
+STATE_DIR = Path(os.getenv("TC_STATE_DIR", str(BASE_DIR / ".telkomcare_state")))
+
+
+def read_json(path, default=None):
+    """Isi file JSON, atau default kalau belum ada / rusak."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data, **dump_kwargs):
+    """Tulis JSON secara atomik (<path>.tmp lalu rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_kwargs)
+    os.replace(tmp, path)
@@ -0,0 +1,287 @@
+# telkomcare_ttr.py
+"""
+Fetch report TTR (detailrescomp25) month-to-date secara incremental.
+
+Tanpa mode ini setiap cycle meminta startdate = tanggal 1 s/d hari ini, jadi
+menjelang akhir bulan export berisi ~30 hari tiket yang di-generate dan
+di-parse ulang 24x sehari. Dengan TC_TTR_INCREMENTAL=1:
+  - hari yang sudah "tutup" (sebelum jendela trailing) di-fetch sekali per
+    rentang, lalu teks tabelnya disimpan di cache lokal
+    (<TC_STATE_DIR>/ttr_days/<report>/<start>_<end>.json.gz),
+  - tiap cycle hanya jendela trailing TC_TTR_TRAILING_DAYS hari terakhir
+    (termasuk hari ini) yang diminta ke TelkomCare,
+  - report month-to-date utuh disusun ulang secara lokal (gabung cache +
+    jendela, de-duplikasi per ID tiket, NO diurut ulang) dan ditulis sebagai
+    .xls HTML biasa, jadi importer tidak berubah.
+
+Asumsi: tiket di hari yang sudah lewat jendela trailing tidak berubah lagi.
+Kalau TelkomCare masih meng-update tiket lama, besarkan TC_TTR_TRAILING_DAYS
+atau set TC_TTR_CACHE_MAX_AGE_HOURS supaya cache di-fetch ulang berkala.
+
+Opsional, TC_TTR_SLICE_DAYS=N (default 0 = satu request per rentang):
+rentang dipotong per N hari lewat fetch_range / fetch_ranges, potongan
+di-fetch paralel (maks TC_TTR_SLICE_WORKERS per report, tiap potongan
+di-retry), lalu digabung & di-de-duplikasi jadi satu dataset; file
+potongan dihapus begitu teksnya terbaca. Export detailrescomp25 yang besar
+(sering lewat batas 180 detik) jadi beberapa export kecil yang cepat.
+Selama slicing aktif, rentang yang cukup satu potongan pun lewat langkah
+gabung yang sama, jadi isi report tidak tergantung tanggal di bulan itu.
+Jalur browser memakai potongan yang sama, hanya berurutan (satu Chrome,
+workers=1).
+"""
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+from telkomcare_columnar import ROW_NUMBER_COLUMNS, field_columns
+from telkomcare_htmltable import read_table_text, write_table_html
+from telkomcare_http import SessionExpiredError
+from telkomcare_state import STATE_DIR
+
+TTR_INCREMENTAL = os.getenv("TC_TTR_INCREMENTAL", "0") not in ("", "0", "false", "False")
+
+# Jumlah hari terakhir (termasuk hari ini) yang selalu di-fetch ulang
+TRAILING_DAYS = int(os.getenv("TC_TTR_TRAILING_DAYS", "3"))
+
+# Cache hari tutup yang lebih tua dari ini di-fetch ulang (0 = tidak pernah)
+CACHE_MAX_AGE_HOURS = float(os.getenv("TC_TTR_CACHE_MAX_AGE_HOURS", "0"))
+
+CACHE_DIR = STATE_DIR / "ttr_days"
+
+# Panjang potongan rentang tanggal per request (0 = satu request per rentang)
+SLICE_DAYS = int(os.getenv("TC_TTR_SLICE_DAYS", "0"))
+
+# Request potongan yang jalan bersamaan per report
+SLICE_WORKERS = int(os.getenv("TC_TTR_SLICE_WORKERS", "3"))
+
+SLICE_RETRIES = 3
+
+
+def _slug(label):
+    return label.lower().replace(" ", "_")
+
+
+def _days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def contiguous_ranges(days):
+    """[date, ...] → [(start, end), ...] untuk hari yang berurutan."""
+    ranges = []
+    for day in sorted(days):
+        if ranges and day == ranges[-1][1] + timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def split_range(start, end, slice_days=None):
+    """(start, end) inklusif → potongan maksimal slice_days hari (0 = tidak dipotong)."""
+    slice_days = SLICE_DAYS if slice_days is None else slice_days
+    if slice_days <= 0:
+        return [(start, end)]
+    out = []
+    while start <= end:
+        stop = min(end, start + timedelta(days=slice_days - 1))
+        out.append((start, stop))
+        start = stop + timedelta(days=1)
+    return out
+
+
+# ===================== SLICE (TEKS TABEL SATU EXPORT) =====================
+
+def load_slice(file_path):
+    """Export TTR → {"header", "rows"} (teks mentah). Export tanpa tabel = slice kosong."""
+    try:
+        header, rows = read_table_text(file_path, "first")
+    except ValueError:
+        # "No tables found": rentang tanpa tiket
+        header, rows = [], []
+    return {"header": header, "rows": rows}
+
+
+def merge_slices(slices):
+    """
+    Gabung beberapa slice (urut waktu) jadi satu tabel: header dari slice
+    terakhir yang punya header, tiket dobel → versi slice paling akhir
+    (posisi pertama dipertahankan), kolom nomor urut diisi ulang 1..n.
+    Return (header_rows, rows, jumlah_dobel).
+    """
+    header = next((s["header"] for s in reversed(slices) if s["header"]), [])
+    names = header[-1] if header else []
+    key = field_columns(names).get("ticket_id")
+
+    merged = {}
+    total = 0
+    for n, piece in enumerate(slices):
+        for i, row in enumerate(piece["rows"]):
+            total += 1
+            ticket_id = row[key].strip() if key is not None and key < len(row) else ""
+            merged[ticket_id or (n, i)] = row
+    rows = list(merged.values())
+    if names and names[0].strip().upper() in ROW_NUMBER_COLUMNS:
+        rows = [[str(no), *row[1:]] for no, row in enumerate(rows, 1)]
+    return header, rows, total - len(rows)
+
+
+# ===================== FETCH POTONGAN PARALEL =====================
+
+def _fetch_piece(label, fetch, start, end, path):
+    for attempt in range(1, SLICE_RETRIES + 1):
+        try:
+            return load_slice(fetch(start, end, path))
+        except SessionExpiredError:
+            raise
+        except Exception as e:
+            if attempt == SLICE_RETRIES:
+                raise
+            wait = 2 ** attempt
+            print(f"   ⚠️ {label} {start}..{end} gagal ({type(e).__name__}: {e}), "
+                  f"retry {attempt}/{SLICE_RETRIES - 1} dalam {wait}s")
+            time.sleep(wait)
+
+
+def fetch_ranges(label, fetch, ranges, work_dir, workers=None, on_piece=None):
+    """
+    Fetch beberapa rentang (start, end) secara paralel (maks `workers`),
+    tiap rentang jadi slice {"header", "rows"}. on_piece(start, end, slice)
+    dipanggil begitu satu potongan selesai (mis. untuk cache), jadi progres
+    tidak hilang kalau potongan lain gagal. File export potongan di work_dir
+    dihapus setelah dibaca. Return [(start, slice)] urut tanggal.
+    """
+    workers = max(1, min(workers or SLICE_WORKERS, len(ranges) or 1))
+    started = time.time()
+
+    def run(start, end):
+        path = Path(work_dir) / f"{_slug(label)}_{start}_{end}.xls"
+        try:
+            piece = _fetch_piece(label, fetch, start, end, str(path))
+        finally:
+            path.unlink(missing_ok=True)
+        if on_piece:
+            on_piece(start, end, piece)
+        return start, piece
+
+    if workers == 1:
+        pieces = [run(start, end) for start, end in ranges]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"ttr-{_slug(label)}") as pool:
+            pieces = list(pool.map(lambda r: run(*r), ranges))
+    if len(ranges) > 1:
+        print(f"   ⚡ {label}: {len(ranges)} potongan di-fetch dalam {time.time() - started:.1f}s "
+              f"(workers={workers})")
+    return sorted(pieces, key=lambda p: p[0])
+
+
+def fetch_range(label, fetch, start, end, dest_path, slice_days=None, workers=None):
+    """
+    Export TTR start..end di dest_path. slice_days 0 → satu export mentah;
+    selain itu rentang di-fetch per potongan (paralel) lalu digabung
+    (de-duplikasi per ID tiket), juga kalau hanya satu potongan.
+    Return dest_path (str).
+    """
+    slice_days = SLICE_DAYS if slice_days is None else slice_days
+    if slice_days <= 0:
+        return fetch(start, end, dest_path)
+    ranges = split_range(start, end, slice_days)
+    work_dir = os.path.dirname(os.path.abspath(dest_path))
+    pieces = fetch_ranges(label, fetch, ranges, work_dir, workers)
+    header, rows, dupes = merge_slices([piece for _start, piece in pieces])
+    write_table_html(dest_path, header, rows)
+    print(f"   🧩 {label}: {len(ranges)} potongan {start}..{end} → {len(rows)} baris"
+          + (f" ({dupes} tiket dobel dibuang)" if dupes else ""))
+    return str(dest_path)
+
+
+# ===================== CACHE HARI TUTUP =====================
+
+def _cache_path(label, start, end):
+    return CACHE_DIR / _slug(label) / f"{start.isoformat()}_{end.isoformat()}.json.gz"
+
+
+def save_cached_slice(label, start, end, piece):
+    path = _cache_path(label, start, end)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump({"start": start.isoformat(), "end": end.isoformat(), **piece}, f,
+                  ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_cached_slice(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    return {"header": data["header"], "rows": data["rows"]}
+
+
+def cached_ranges(label):
+    """[(start, end, path)] semua slice di cache report, urut tanggal mulai."""
+    folder = CACHE_DIR / _slug(label)
+    if not folder.is_dir():
+        return []
+    out = []
+    for path in folder.glob("*.json.gz"):
+        try:
+            start, end = (date.fromisoformat(p) for p in path.name[:-len(".json.gz")].split("_"))
+        except ValueError:
+            continue
+        out.append((start, end, path))
+    return sorted(out)
+
+
+def prune_cache(label, before):
+    """Hapus slice cache yang berakhir sebelum tanggal `before` (mis. bulan lalu)."""
+    for _start, end, path in cached_ranges(label):
+        if end < before:
+            path.unlink(missing_ok=True)
+
+
+# ===================== MONTH-TO-DATE INCREMENTAL =====================
+
+def fetch_month_to_date(label, fetch, dest_path, today=None, trailing_days=None, workers=None):
+    """
+    Susun export TTR month-to-date di dest_path dari cache hari tutup +
+    fetch jendela trailing. fetch(startdate, enddate, path) → path file
+    export untuk satu rentang (date, inklusif). Hari tutup yang belum ada di
+    cache dan jendela trailing di-fetch bersamaan (dipotong per SLICE_DAYS,
+    maks `workers`; jalur browser memakai workers=1). Return dest_path (str).
+    """
+    today = today or date.today()
+    trailing_days = max(1, trailing_days or TRAILING_DAYS)
+    month_start = today.replace(day=1)
+    window_start = max(month_start, today - timedelta(days=trailing_days - 1))
+    work_dir = os.path.dirname(os.path.abspath(dest_path))
+    prune_cache(label, month_start)
+
+    max_age = CACHE_MAX_AGE_HOURS * 3600
+    cached = [
+        (start, end, path) for start, end, path in cached_ranges(label)
+        if start >= month_start and end < window_start
+        and not (max_age and time.time() - path.stat().st_mtime > max_age)
+    ]
+    covered = {day for start, end, _ in cached for day in _days(start, end)}
+    missing = [day for day in _days(month_start, window_start - timedelta(days=1)) if day not in covered]
+
+    def cache_closed(start, end, piece):
+        if end < window_start:
+            save_cached_slice(label, start, end, piece)
+            print(f"   🗓️ {label}: hari tutup {start}..{end} di-fetch & di-cache ({len(piece['rows'])} baris)")
+
+    ranges = [r for start, end in contiguous_ranges(missing) for r in split_range(start, end)]
+    ranges += split_range(window_start, today)
+    pieces = [(start, load_cached_slice(path)) for start, _end, path in cached]
+    pieces += fetch_ranges(label, fetch, ranges, work_dir, workers, on_piece=cache_closed)
+    pieces.sort(key=lambda p: p[0])
+
+    header, rows, dupes = merge_slices([piece for _start, piece in pieces])
+    write_table_html(dest_path, header, rows)
+    print(f"   🧩 {label} incremental: {len(covered)} hari dari cache, fetch {window_start}..{today}"
+          + (f" + {len(missing)} hari tutup baru" if missing else "")
+          + f" → {len(rows)} baris month-to-date" + (f" ({dupes} tiket dobel dibuang)" if dupes else ""))
+    return str(dest_path)
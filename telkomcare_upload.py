@@ -0,0 +1,205 @@
+# telkomcare_upload.py
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.client import RemoteDisconnected
+
+import gspread
+import requests
+from googleapiclient.errors import HttpError
+
+# Target ukuran payload JSON satu request values.batchUpdate
+# (Google menyarankan < 2 MB per request; sisakan ruang untuk overhead)
+CHUNK_BYTES = int(os.getenv("TC_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+# Jumlah request batchUpdate yang jalan bersamaan
+UPLOAD_WORKERS = int(os.getenv("TC_UPLOAD_WORKERS", "3"))
+
+# Kuota tulis Sheets API: 60 request/menit per user per project
+WRITES_PER_MINUTE = int(os.getenv("TC_SHEETS_WRITES_PER_MIN", "60"))
+
+MAX_RETRIES = 5
+
+# Statistik upload terakhir per sheet: {"rows", "bytes", "requests", "seconds", ...}
+last_upload_stats = {}
+
+
+# ===================== KUOTA & RETRY =====================
+
+class _RateLimiter:
+    """Sliding window sederhana: maksimal `per_minute` request dalam 60 detik."""
+
+    def __init__(self, per_minute):
+        self.per_minute = max(1, per_minute)
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.sent = [t for t in self.sent if now - t < 60]
+                if len(self.sent) < self.per_minute:
+                    self.sent.append(now)
+                    return
+                wait = 60 - (now - self.sent[0])
+            time.sleep(max(wait, 0.05))
+
+
+_limiter = _RateLimiter(WRITES_PER_MINUTE)
+
+
+def _is_quota_error(e):
+    code = getattr(e, "code", None)  # gspread.exceptions.APIError
+    if code is None:
+        code = getattr(getattr(e, "response", None), "status_code", None)
+    if code is None:
+        code = getattr(getattr(e, "resp", None), "status", None)
+    return code == 429
+
+
+def with_retry(action, label, max_retries=3):
+    """
+    Jalankan action() dengan retry kalau koneksi / API Sheets gagal.
+    HTTP 429 (kuota habis) → backoff eksponensial + jitter.
+    """
+    for attempt in range(1, max_retries + 1):
+        try:
+            _limiter.acquire()
+            return action()
+        except (RemoteDisconnected,
+                requests.exceptions.ConnectionError,
+                HttpError,
+                gspread.exceptions.APIError) as e:
+            print(f"⚠️ Upload {label} gagal (attempt {attempt}): {e}")
+            if attempt == max_retries:
+                print("❌ Gagal upload chunk setelah retry maksimum.")
+                raise
+            if _is_quota_error(e):
+                sleep_s = min(64, 2 ** attempt) + random.uniform(0, 1)
+                print(f"   ⏳ Kuota Sheets penuh, retry setelah {sleep_s:.1f} detik...")
+            else:
+                sleep_s = 5 * attempt
+                print(f"   ⏳ Retry setelah {sleep_s} detik...")
+            time.sleep(sleep_s)
+
+
+def safe_batch_update(ws, payload, max_retries=MAX_RETRIES):
+    """Beberapa range sekaligus dalam satu request values.batchUpdate (dengan retry)."""
+    label = f"batch {payload[0]['range']} ({len(payload)} range)"
+    with_retry(lambda: ws.batch_update(payload), label, max_retries)
+
+
+# ===================== CHUNKING BERDASARKAN BYTE =====================
+
+def _row_bytes(row):
+    return len(json.dumps(row, ensure_ascii=False, default=str).encode("utf-8")) + 1
+
+
+def plan_chunks(rows, row_ranges, chunk_bytes=CHUNK_BYTES, row_sizes=None):
+    """
+    Pecah range baris (start, end) jadi request batchUpdate yang masing-masing
+    payload-nya <= chunk_bytes. Satu request bisa berisi beberapa range.
+    row_sizes (opsional, mis. ColumnTable.digest()["row_sizes"]) dipakai
+    kalau ada, supaya baris tidak perlu di-serialize hanya untuk diukur.
+    Return list of (pieces, n_rows, n_bytes) dengan pieces = [(i, j), ...];
+    payload-nya baru dibuat saat dikirim (build_payload).
+    """
+    chunks = []
+    pieces, n_rows, n_bytes = [], 0, 0
+    for start, end in row_ranges:
+        piece_start = start
+        for i in range(start, end):
+            size = int(row_sizes[i]) if row_sizes is not None else _row_bytes(rows[i])
+            if n_bytes and n_bytes + size > chunk_bytes:
+                # Chunk penuh → tutup, baris ini membuka chunk baru
+                if i > piece_start:
+                    pieces.append((piece_start, i))
+                chunks.append((pieces, n_rows, n_bytes))
+                pieces, n_rows, n_bytes = [], 0, 0
+                piece_start = i
+            n_rows += 1
+            n_bytes += size
+        if end > piece_start:
+            pieces.append((piece_start, end))
+    if pieces:
+        chunks.append((pieces, n_rows, n_bytes))
+    return chunks
+
+
+def _a1_range(i, j, last_col_letter, first_row=2):
+    return f"A{i + first_row}:{last_col_letter}{j + first_row - 1}"
+
+
+def build_payload(rows, pieces, last_col_letter, first_row=2):
+    """Payload batchUpdate untuk satu chunk; baris baru dimaterialisasi di sini."""
+    return [
+        {"range": _a1_range(i, j, last_col_letter, first_row), "values": rows[i:j]}
+        for i, j in pieces
+    ]
+
+
+def _send_chunk(ws, rows, pieces, last_col_letter):
+    # Dibangun di thread worker: paling banyak `workers` chunk ada di memori sekaligus
+    safe_batch_update(ws, build_payload(rows, pieces, last_col_letter))
+
+
+# ===================== UPLOAD PARALEL =====================
+
+def send_row_ranges(ws, rows, row_ranges, last_col_letter, sheet_name="", workers=None,
+                    chunk_bytes=CHUNK_BYTES, row_sizes=None):
+    """
+    Kirim range baris ke worksheet: chunk berbasis ukuran payload, beberapa
+    request jalan paralel (dibatasi kuota tulis per menit), tiap chunk di-retry.
+    rows boleh list baris atau ColumnTable (cukup mendukung rows[i:j]).
+
+    Return dict statistik {"rows", "bytes", "requests", "seconds",
+    "rows_per_s", "bytes_per_s"}; raise kalau ada chunk yang tetap gagal.
+    """
+    workers = workers or UPLOAD_WORKERS
+    chunks = plan_chunks(rows, row_ranges, chunk_bytes, row_sizes)
+    total_rows = sum(c[1] for c in chunks)
+    total_bytes = sum(c[2] for c in chunks)
+
+    if chunks:
+        print(f"   📦 {len(chunks)} request, {total_rows} baris, {total_bytes / 1024:.1f} KB "
+              f"(≤{chunk_bytes // 1024} KB/request, workers={workers})")
+
+    start = time.time()
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(_send_chunk, ws, rows, pieces, last_col_letter): (pieces, n_rows)
+            for pieces, n_rows, _n_bytes in chunks
+        }
+        for future in as_completed(futures):
+            pieces, n_rows = futures[future]
+            label = _a1_range(*pieces[0], last_col_letter)
+            if len(pieces) > 1:
+                label += f" (+{len(pieces) - 1} range)"
+            try:
+                future.result()
+                print(f"   📤 {label}: {n_rows} baris OK")
+            except Exception as e:
+                errors.append(e)
+    seconds = time.time() - start
+
+    stats = {
+        "rows": total_rows,
+        "bytes": total_bytes,
+        "requests": len(chunks),
+        "seconds": seconds,
+        "rows_per_s": total_rows / seconds if seconds > 0 else 0.0,
+        "bytes_per_s": total_bytes / seconds if seconds > 0 else 0.0,
+    }
+    if sheet_name:
+        last_upload_stats[sheet_name] = stats
+    if chunks:
+        print(f"   ⚡ Throughput: {stats['rows_per_s']:.0f} baris/s, "
+              f"{stats['bytes_per_s'] / 1024:.1f} KB/s dalam {seconds:.1f}s")
+    if errors:
+        raise errors[0]
+    return stats
@@ -0,0 +1,143 @@
+# telkomcare_wait.py
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Pengganti time.sleep(n) tetap: tunggu kondisi (DOM, URL, jaringan idle,
+# state elemen) dengan polling pendek, dan catat berapa lama tiap tunggu
+# benar-benar makan waktu.
+
+POLL_INTERVAL = 0.1
+
+# Jaringan dianggap idle kalau tidak ada resource baru / XHR jQuery aktif selama ini
+NETWORK_IDLE_SECONDS = 0.5
+
+# [{"name", "seconds", "ok"}] untuk semua tunggu di proses ini
+wait_records = []
+_lock = threading.Lock()
+
+
+def _record(name, seconds, ok):
+    with _lock:
+        wait_records.append({"name": name, "seconds": seconds, "ok": ok})
+    mark = "✓" if ok else "⌛"
+    print(f"   {mark} wait {name}: {seconds:.2f}s")
+
+
+def wait_until(name, predicate, timeout=30, poll=POLL_INTERVAL, raise_on_timeout=True):
+    """
+    Tunggu predicate() truthy (tanpa driver). Return nilai predicate, atau
+    None kalau timeout dan raise_on_timeout=False.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    while True:
+        value = predicate()
+        if value:
+            _record(name, time.monotonic() - start, True)
+            return value
+        if time.monotonic() >= deadline:
+            _record(name, time.monotonic() - start, False)
+            if raise_on_timeout:
+                raise TimeoutException(f"Timeout {timeout}s menunggu {name}")
+            return None
+        time.sleep(poll)
+
+
+def wait_for(driver, name, condition, timeout=30, poll=POLL_INTERVAL, raise_on_timeout=True):
+    """
+    WebDriverWait(driver, timeout, poll).until(condition) yang tercatat.
+    condition = expected_conditions apa pun (atau callable(driver)).
+    """
+    start = time.monotonic()
+    try:
+        value = WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+    except TimeoutException:
+        _record(name, time.monotonic() - start, False)
+        if raise_on_timeout:
+            raise
+        return None
+    _record(name, time.monotonic() - start, True)
+    return value
+
+
+# ===================== KONDISI =====================
+
+def document_ready(driver):
+    try:
+        return driver.execute_script("return document.readyState") == "complete"
+    except WebDriverException:
+        return False
+
+
+_NETWORK_STATE_JS = """
+return [
+    document.readyState,
+    (window.jQuery && window.jQuery.active) || 0,
+    (performance.getEntriesByType ? performance.getEntriesByType('resource').length : 0)
+];
+"""
+
+
+class network_idle:
+    """
+    Kondisi: document complete, tidak ada request jQuery aktif, dan jumlah
+    resource yang dimuat tidak bertambah selama `idle` detik.
+    """
+
+    def __init__(self, idle=NETWORK_IDLE_SECONDS):
+        self.idle = idle
+        self.last_count = None
+        self.stable_since = None
+
+    def __call__(self, driver):
+        try:
+            ready, active, count = driver.execute_script(_NETWORK_STATE_JS)
+        except WebDriverException:
+            # Halaman sedang berpindah → belum idle
+            self.last_count, self.stable_since = None, None
+            return False
+        now = time.monotonic()
+        if ready != "complete" or active or count != self.last_count:
+            self.last_count, self.stable_since = count, now
+            return False
+        return now - self.stable_since >= self.idle
+
+
+# ===================== PINTASAN =====================
+
+def wait_document_ready(driver, name="document ready", timeout=30):
+    return wait_for(driver, name, document_ready, timeout=timeout)
+
+
+def wait_page_settled(driver, name="page settled", timeout=30, idle=NETWORK_IDLE_SECONDS,
+                      raise_on_timeout=False):
+    """Tunggu halaman selesai load + jaringan idle (default tidak raise kalau timeout)."""
+    return wait_for(driver, name, network_idle(idle), timeout=timeout,
+                    raise_on_timeout=raise_on_timeout)
+
+
+# ===================== RINGKASAN =====================
+
+def summarize_waits(records=None):
+    """dict name -> {"count", "total", "max", "timeouts"}."""
+    summary = {}
+    for rec in wait_records if records is None else records:
+        s = summary.setdefault(rec["name"], {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+        s["count"] += 1
+        s["total"] += rec["seconds"]
+        s["max"] = max(s["max"], rec["seconds"])
+        s["timeouts"] += 0 if rec["ok"] else 1
+    return summary
+
+
+def print_wait_summary():
+    summary = summarize_waits()
+    if not summary:
+        return
+    print("\n⏳ Ringkasan waktu tunggu halaman:")
+    for name, s in sorted(summary.items(), key=lambda kv: -kv[1]["total"]):
+        extra = f", {s['timeouts']} timeout" if s["timeouts"] else ""
+        print(f"   {name:<32} {s['total']:6.2f}s total, max {s['max']:.2f}s ({s['count']}x{extra})")
@@ -0,0 +1,360 @@
+# telkomcare_warehouse.py
+"""
+Gudang tiket lokal (SQLite): report TTR / WECARE disimpan per tiket, bukan
+sebagai grid yang diganti penuh tiap cycle.
+
+Tabel utama `tickets`, kunci (report, ticket_id):
+  row_hash      hash isi baris tanpa kolom nomor urut (NO), untuk deteksi perubahan
+  data          JSON {kolom: nilai} baris terakhir
+  status, witel, reported_at, reported_day, ttr_hours, comply
+                kolom yang dipromosikan untuk query dashboard (ber-index)
+  first_seen    pertama kali tiket muncul di snapshot
+  last_changed  terakhir isi tiket berubah
+  gone_at       snapshot pertama tiket tidak ada lagi (NULL = masih ada)
+  last_seen     terakhir terlihat; NULL selama tiket masih ada (view
+                v_tickets mengisinya dengan waktu ingest terakhir report)
+
+Ingest satu snapshot hanya MENULIS tiket yang baru / berubah / hilang, jadi
+biayanya sebanding dengan jumlah tiket yang berubah, bukan ukuran report.
+Snapshot yang isinya identik dengan ingest terakhir (content hash sama)
+dilewati tanpa membaca tabel tiket.
+
+Contoh query:
+    from telkomcare_warehouse import open_tickets_by_witel, ttr_compliance_by_day
+    open_tickets_by_witel("TTR DATIN")
+    ttr_compliance_by_day("TTR DATIN", start="2026-10-01")
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+
+from telkomcare_columnar import ROW_NUMBER_COLUMNS, field_columns
+from telkomcare_state import STATE_DIR
+
+WAREHOUSE_PATH = os.getenv("TC_WAREHOUSE_DB", str(STATE_DIR / "tickets.sqlite"))
+
+# TC_WAREHOUSE=0 → tidak ingest ke gudang tiket
+WAREHOUSE_ENABLED = os.getenv("TC_WAREHOUSE", "1") not in ("", "0", "false", "False")
+
+# Status yang dianggap tiket sudah selesai (selain itu = open)
+CLOSED_STATUSES = ("CLOSED", "RESOLVED", "FINALCHECK", "CANCELED", "CANCELLED")
+
+_COMPLY_VALUES = {"COMPLY": 1, "YA": 1, "Y": 1, "YES": 1, "1": 1, "TRUE": 1,
+                  "NOT COMPLY": 0, "NOT_COMPLY": 0, "TIDAK": 0, "N": 0, "NO": 0,
+                  "0": 0, "FALSE": 0}
+
+_DATE_FORMATS = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y", "%d-%m-%Y %H:%M:%S",
+                 "%d-%m-%Y %H:%M", "%d-%m-%Y")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    report        TEXT NOT NULL,
+    ticket_id     TEXT NOT NULL,
+    row_hash      TEXT NOT NULL,
+    data          TEXT NOT NULL,
+    status        TEXT,
+    witel         TEXT,
+    reported_at   TEXT,
+    reported_day  TEXT,
+    ttr_hours     REAL,
+    comply        INTEGER,
+    first_seen    TEXT NOT NULL,
+    last_changed  TEXT NOT NULL,
+    last_seen     TEXT,
+    gone_at       TEXT,
+    PRIMARY KEY (report, ticket_id)
+) WITHOUT ROWID;
+
+-- Tiket yang masih ada per witel/status (open tickets by witel)
+CREATE INDEX IF NOT EXISTS idx_tickets_present_witel
+    ON tickets (report, witel, status) WHERE gone_at IS NULL;
+-- Kepatuhan TTR per hari lapor
+CREATE INDEX IF NOT EXISTS idx_tickets_reported_day
+    ON tickets (report, reported_day, comply);
+CREATE INDEX IF NOT EXISTS idx_tickets_last_changed
+    ON tickets (report, last_changed);
+
+CREATE TABLE IF NOT EXISTS ingests (
+    report        TEXT NOT NULL,
+    ingested_at   TEXT NOT NULL,
+    content_hash  TEXT NOT NULL,
+    rows          INTEGER NOT NULL,
+    inserted      INTEGER NOT NULL,
+    updated       INTEGER NOT NULL,
+    gone          INTEGER NOT NULL,
+    seconds       REAL NOT NULL,
+    PRIMARY KEY (report, ingested_at)
+);
+
+CREATE VIEW IF NOT EXISTS v_tickets AS
+SELECT t.*,
+       COALESCE(t.last_seen,
+                (SELECT MAX(i.ingested_at) FROM ingests i WHERE i.report = t.report)) AS seen_until
+FROM tickets t;
+"""
+
+
+def connect(path=None):
+    """Koneksi SQLite ke gudang (skema dibuat kalau belum ada)."""
+    path = path or WAREHOUSE_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# ===================== NORMALISASI FIELD =====================
+
+def _text(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() or None
+
+
+def _timestamp(value):
+    """Nilai tanggal report → 'YYYY-MM-DD HH:MM:SS' (atau None kalau tidak dikenali)."""
+    if isinstance(value, datetime):
+        return None if value != value else value.strftime("%Y-%m-%d %H:%M:%S")
+    text = _text(value)
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
+    return None
+
+
+def _hours(value):
+    """TTR dalam jam: angka apa adanya, atau 'H:MM[:SS]' → jam desimal."""
+    if isinstance(value, bool) or value == "" or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", ".")
+    if ":" in text:
+        try:
+            parts = [float(p) for p in text.split(":")]
+        except ValueError:
+            return None
+        return sum(p / 60 ** i for i, p in enumerate(parts))
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _comply(value):
+    if isinstance(value, bool):
+        return int(value)
+    text = _text(value)
+    return _COMPLY_VALUES.get(text.upper()) if text else None
+
+
+# ===================== INGEST =====================
+
+def _last_ingest(conn, report):
+    return conn.execute(
+        "SELECT ingested_at, content_hash FROM ingests WHERE report = ? "
+        "ORDER BY ingested_at DESC LIMIT 1", (report,)
+    ).fetchone()
+
+
+def _snapshot_hashes(table, key_index):
+    """
+    {ticket_id: (row_hash, index baris)} untuk satu snapshot. Tiket dobel:
+    baris terakhir yang dipakai. Kolom nomor urut tidak ikut hash.
+    """
+    keep = [i for i, name in enumerate(table.names) if name.strip().upper() not in ROW_NUMBER_COLUMNS]
+    dumps = json.JSONEncoder(ensure_ascii=False, default=str, separators=(",", ":")).encode
+    tickets = {}
+    for index, row in enumerate(table):
+        ticket_id = _text(row[key_index])
+        if ticket_id is None:
+            continue
+        raw = dumps([row[i] for i in keep]).encode("utf-8")
+        tickets[ticket_id] = (hashlib.blake2b(raw, digest_size=8).hexdigest(), index)
+    return tickets
+
+
+def _ticket_record(report, ticket_id, row_hash, row, names, fields, seen_at):
+    def get(field):
+        index = fields.get(field)
+        return row[index] if index is not None else None
+
+    reported_at = _timestamp(get("reported_at"))
+    return (
+        report, ticket_id, row_hash,
+        json.dumps(dict(zip(names, row)), ensure_ascii=False, default=str),
+        _text(get("status")), _text(get("witel")), reported_at,
+        reported_at[:10] if reported_at else None,
+        _hours(get("ttr_hours")), _comply(get("comply")),
+        seen_at, seen_at,
+    )
+
+
+_UPSERT = """
+INSERT INTO tickets (report, ticket_id, row_hash, data, status, witel, reported_at,
+                     reported_day, ttr_hours, comply, first_seen, last_changed)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (report, ticket_id) DO UPDATE SET
+    row_hash = excluded.row_hash, data = excluded.data, status = excluded.status,
+    witel = excluded.witel, reported_at = excluded.reported_at,
+    reported_day = excluded.reported_day, ttr_hours = excluded.ttr_hours,
+    comply = excluded.comply, last_changed = excluded.last_changed,
+    last_seen = NULL, gone_at = NULL
+"""
+
+
+def ingest_report(report, table, seen_at=None, path=None):
+    """
+    Upsert snapshot report (ColumnTable) ke gudang tiket. Return dict
+    {"rows", "inserted", "updated", "gone", "seconds", "status"} atau None
+    kalau gudang mati / report tidak punya kolom ID tiket. inserted = tiket
+    baru atau yang muncul lagi setelah sempat hilang (first_seen tetap).
+    """
+    if not WAREHOUSE_ENABLED or not table:
+        return None
+    fields = field_columns(table.names)
+    if "ticket_id" not in fields:
+        print(f"ℹ️ {report}: kolom ID tiket tidak ditemukan, gudang tiket dilewati")
+        return None
+
+    start = time.perf_counter()
+    seen_at = (seen_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    digest = table.digest()["content_hash"]
+    stats = {"rows": len(table), "inserted": 0, "updated": 0, "gone": 0}
+
+    with closing(connect(path)) as conn, conn:
+        last = _last_ingest(conn, report)
+        if last and last[1] == digest:
+            # Isi identik: tidak ada tiket yang berubah, cukup catat ingest-nya
+            status = "unchanged"
+        else:
+            status = "ingested"
+            snapshot = _snapshot_hashes(table, fields["ticket_id"])
+            present = dict(conn.execute(
+                "SELECT ticket_id, row_hash FROM tickets WHERE report = ? AND gone_at IS NULL",
+                (report,),
+            ))
+            changed = [(tid, h, i) for tid, (h, i) in snapshot.items() if present.get(tid) != h]
+            gone = [tid for tid in present if tid not in snapshot]
+            stats["inserted"] = sum(1 for tid, _h, _i in changed if tid not in present)
+            stats["updated"] = len(changed) - stats["inserted"]
+            stats["gone"] = len(gone)
+
+            conn.executemany(_UPSERT, (
+                _ticket_record(report, tid, h, table[i], table.names, fields, seen_at)
+                for tid, h, i in changed
+            ))
+            # Terakhir terlihat = ingest sebelumnya; hilang sejak ingest ini
+            last_seen = last[0] if last else seen_at
+            conn.executemany(
+                "UPDATE tickets SET gone_at = ?, last_seen = ? WHERE report = ? AND ticket_id = ?",
+                ((seen_at, last_seen, report, tid) for tid in gone),
+            )
+
+        stats["seconds"] = time.perf_counter() - start
+        conn.execute(
+            "INSERT OR REPLACE INTO ingests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (report, seen_at, digest, stats["rows"], stats["inserted"], stats["updated"],
+             stats["gone"], stats["seconds"]),
+        )
+
+    stats["status"] = status
+    print(f"🗃️ Gudang tiket {report}: {stats['inserted']} baru, {stats['updated']} berubah, "
+          f"{stats['gone']} hilang dari {stats['rows']} baris ({stats['seconds']:.2f}s"
+          + (", isi sama" if status == "unchanged" else "") + ")")
+    return stats
+
+
+# ===================== QUERY DASHBOARD =====================
+
+def open_tickets_by_witel(report=None, path=None):
+    """[(report, witel, jumlah)] tiket yang masih ada dan statusnya belum selesai."""
+    placeholders = ", ".join("?" for _ in CLOSED_STATUSES)
+    sql = (
+        "SELECT report, witel, COUNT(*) FROM tickets "
+        f"WHERE gone_at IS NULL AND COALESCE(UPPER(status), '') NOT IN ({placeholders})"
+    )
+    params = list(CLOSED_STATUSES)
+    if report:
+        sql += " AND report = ?"
+        params.append(report)
+    sql += " GROUP BY report, witel ORDER BY report, COUNT(*) DESC"
+    with closing(connect(path)) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def ttr_compliance_by_day(report, start=None, end=None, path=None):
+    """
+    [(hari, jumlah tiket, comply, persen comply)] per hari lapor, hanya tiket
+    yang punya nilai comply. start/end: 'YYYY-MM-DD' (inklusif).
+    """
+    sql = ("SELECT reported_day, COUNT(*), SUM(comply), ROUND(100.0 * AVG(comply), 2) "
+           "FROM tickets WHERE report = ? AND comply IS NOT NULL AND reported_day IS NOT NULL")
+    params = [report]
+    if start:
+        sql += " AND reported_day >= ?"
+        params.append(str(start)[:10])
+    if end:
+        sql += " AND reported_day <= ?"
+        params.append(str(end)[:10])
+    sql += " GROUP BY reported_day ORDER BY reported_day"
+    with closing(connect(path)) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def ingest_history(report, limit=24, path=None):
+    """Ingest terakhir report: [(ingested_at, rows, inserted, updated, gone, seconds)]."""
+    with closing(connect(path)) as conn:
+        return conn.execute(
+            "SELECT ingested_at, rows, inserted, updated, gone, seconds FROM ingests "
+            "WHERE report = ? ORDER BY ingested_at DESC LIMIT ?", (report, limit),
+        ).fetchall()
+
+
+# ===================== CLI =====================
+
+def main():
+    parser = argparse.ArgumentParser(description="Query gudang tiket TelkomCare (SQLite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_open = sub.add_parser("open", help="tiket open per witel")
+    p_open.add_argument("--report")
+    p_ttr = sub.add_parser("ttr", help="kepatuhan TTR per hari")
+    p_ttr.add_argument("report")
+    p_ttr.add_argument("--start")
+    p_ttr.add_argument("--end")
+    p_hist = sub.add_parser("history", help="riwayat ingest")
+    p_hist.add_argument("report")
+    p_hist.add_argument("--limit", type=int, default=24)
+    args = parser.parse_args()
+
+    print(f"🗃️ {WAREHOUSE_PATH}")
+    if args.command == "open":
+        for report, witel, count in open_tickets_by_witel(args.report):
+            print(f"   {report:<14} {witel or '-':<20} {count:>7}")
+    elif args.command == "ttr":
+        for day, total, comply, pct in ttr_compliance_by_day(args.report, args.start, args.end):
+            print(f"   {day}  {total:>6} tiket  {comply:>6} comply  {pct:>6.2f}%")
+    else:
+        for ingested_at, rows, inserted, updated, gone, seconds in ingest_history(args.report, args.limit):
+            print(f"   {ingested_at}  {rows:>7} baris  +{inserted} ~{updated} -{gone}  {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# telkomcare_watch.py
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# Konstanta inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+DOWNLOAD_SUFFIXES = (".xls", ".xlsx")
+
+# Interval polling kalau inotify tidak tersedia (macOS/Windows/container aneh)
+FALLBACK_POLL_INTERVAL = 0.2
+
+# path file -> berapa detik sejak mulai menunggu sampai file mendarat
+landing_times = {}
+
+_libc = None
+
+
+def _load_libc():
+    """libc dengan inotify_init1, atau None kalau platform tidak mendukung."""
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+def _first_match(directory, suffixes):
+    names = sorted(
+        f for f in os.listdir(directory) if f.lower().endswith(suffixes)
+    )
+    return str(Path(directory) / names[0]) if names else None
+
+
+def _wait_inotify(libc, directory, suffixes, timeout):
+    fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        return None, False
+    try:
+        wd = libc.inotify_add_watch(
+            fd, os.fsencode(str(directory)), IN_CLOSE_WRITE | IN_MOVED_TO
+        )
+        if wd < 0:
+            return None, False
+
+        # File bisa saja sudah mendarat sebelum watch terpasang
+        existing = _first_match(directory, suffixes)
+        if existing:
+            return existing, True
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, True
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            try:
+                buf = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+
+            offset = 0
+            while offset < len(buf):
+                _wd, _mask, _cookie, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + name_len].rstrip(b"\0").decode(errors="ignore")
+                offset += name_len
+                if name.lower().endswith(suffixes):
+                    return str(Path(directory) / name), True
+    finally:
+        os.close(fd)
+
+
+def _wait_polling(directory, suffixes, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        found = _first_match(directory, suffixes)
+        if found:
+            return found
+        time.sleep(FALLBACK_POLL_INTERVAL)
+    return None
+
+
+def wait_for_file(directory, timeout=180, suffixes=DOWNLOAD_SUFFIXES):
+    """
+    Tunggu file final (.xls/.xlsx) muncul di directory.
+    Linux: event inotify IN_CLOSE_WRITE / IN_MOVED_TO (Chrome rename
+    .crdownload → .xls, fetcher HTTP rename .part → .xls), jadi terdeteksi
+    dalam hitungan milidetik. Platform lain: polling tiap 0.2 detik.
+
+    Return: (path, detik_menunggu). Raise TimeoutError kalau tidak ada file.
+    """
+    directory = Path(directory)
+    start = time.monotonic()
+
+    path, used_events = None, False
+    libc = _load_libc()
+    if libc is not None:
+        path, used_events = _wait_inotify(libc, directory, suffixes, timeout)
+    if not used_events:
+        path = _wait_polling(directory, suffixes, timeout - (time.monotonic() - start))
+
+    elapsed = time.monotonic() - start
+    if not path:
+        raise TimeoutError(f"Timeout {timeout}s menunggu file di {directory}")
+
+    landing_times[path] = elapsed
+    mode = "inotify" if used_events else "polling"
+    print(f"✓ File mendarat dalam {elapsed:.3f}s ({mode}): {path}")
+    return path, elapsed
+
+
+def get_landing_time(path):
+    """Detik yang dibutuhkan file untuk mendarat (None kalau tidak lewat wait_for_file)."""
+    return landing_times.get(str(path)) if path else None
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# Modul telkomcare_* ada di root repo (bukan package)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,75 @@
+# tests/test_archive.py
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import telkomcare_archive as archive
+from telkomcare_columnar import ColumnTable, column_array
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", tmp_path)
+    monkeypatch.setattr(archive, "ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(archive, "ARCHIVE_KEEP_DAYS", 90)
+    return tmp_path
+
+
+def _table(*rows):
+    return ColumnTable.from_rows([list(row) for row in rows])
+
+
+def test_backfilled_day_survives_later_cycle_archive(archive_dir, monkeypatch):
+    old_day = date.today() - timedelta(days=200)
+    backfilled = archive.archive_report("TTR DATIN", _table(["INC1", "CLOSED"]),
+                                        captured_at=datetime.combine(old_day, time(23, 59, 59)),
+                                        backfill=True)
+    # Snapshot cycle lama di partisi yang sama (ditulis tanpa retensi)
+    monkeypatch.setattr(archive, "ARCHIVE_KEEP_DAYS", 0)
+    cycle_old = archive.archive_report("TTR DATIN", _table(["INC1", "OPEN"]),
+                                       captured_at=datetime.combine(old_day, time(9, 0)))
+    monkeypatch.setattr(archive, "ARCHIVE_KEEP_DAYS", 90)
+
+    # Cycle biasa hari ini menulis arsip → retensi 90 hari jalan
+    archive.archive_report("TTR DATIN", _table(["INC3", "OPEN"]))
+
+    snapshots = archive.list_snapshots("TTR DATIN", old_day, old_day)
+    assert [str(path) for _at, path in snapshots] == [backfilled["path"]]
+    assert archive.read_archive("TTR DATIN", old_day, old_day).num_rows == 1
+    assert not archive.list_snapshots("TTR DATIN", old_day, old_day, backfill=False)
+    assert cycle_old["path"] not in {str(path) for _at, path in archive.list_snapshots("TTR DATIN")}
+
+
+def test_list_snapshots_filters_backfill(archive_dir):
+    day = date.today() - timedelta(days=1)
+    archive.archive_report("TTR DATIN", _table(["INC1"]), captured_at=datetime.combine(day, time(10, 0)))
+    archive.archive_report("TTR DATIN", _table(["INC1"]),
+                           captured_at=datetime.combine(day, time(23, 59, 59)), backfill=True)
+
+    assert len(archive.list_snapshots("TTR DATIN", day, day)) == 2
+    [(captured_at, path)] = archive.list_snapshots("TTR DATIN", day, day, backfill=True)
+    assert captured_at.time() == time(23, 59, 59)
+    assert archive.is_backfill_snapshot(path)
+    [(captured_at, _path)] = archive.list_snapshots("TTR DATIN", day, day, backfill=False)
+    assert captured_at.time() == time(10, 0)
+
+
+def _ttr_snapshot(value):
+    return ColumnTable([column_array(["INC1"]), column_array([value])], names=["INCIDENT", "TTR"])
+
+
+def test_read_archive_mixes_empty_and_typed_columns(archive_dir):
+    day = date.today() - timedelta(days=1)
+    # Jam 08: kolom TTR kosong semua; jam 09: float; jam 10: int
+    for hour, value in ((8, ""), (9, 2.5), (10, 3)):
+        archive.archive_report("TTR DATIN", _ttr_snapshot(value), captured_at=datetime.combine(day, time(hour, 0)))
+
+    ttr = archive.read_archive("TTR DATIN", day, day, columns=["TTR"])
+    assert ttr.column("TTR").to_pylist() == [None, 2.5, 3.0]
+
+    # Jam 11: teks → kolom dibaca sebagai string
+    archive.archive_report("TTR DATIN", _ttr_snapshot("n/a"), captured_at=datetime.combine(day, time(11, 0)))
+    ttr = archive.read_archive("TTR DATIN", day, day, columns=["TTR"])
+    assert ttr.column("TTR").to_pylist() == [None, "2.5", "3", "n/a"]
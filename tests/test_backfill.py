@@ -0,0 +1,29 @@
+# tests/test_backfill.py
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import telkomcare_archive as archive
+import telkomcare_backfill as backfill
+from telkomcare_columnar import ColumnTable
+
+
+def test_pending_days_ignores_cycle_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "ARCHIVE_DIR", tmp_path / "archive")
+    monkeypatch.setattr(archive, "ARCHIVE_ENABLED", True)
+    table = ColumnTable.from_rows([["INC1", "OPEN"]])
+    day1, day2, day3 = (date.today() - timedelta(days=n) for n in (3, 2, 1))
+
+    # day1: hanya snapshot cycle month-to-date (belum tutup) → tetap di-backfill
+    archive.archive_report("TTR DATIN", table, captured_at=datetime.combine(day1, time(10, 0)))
+    # day2: sudah di-backfill → dilewati
+    archive.archive_report("TTR DATIN", table, captured_at=datetime.combine(day2, time(23, 59, 59)),
+                           backfill=True)
+    # day3: tercatat kosong di progres → dilewati
+    progress = backfill.Progress(tmp_path / "backfill.json")
+    progress.set("TTR DATIN", day3, status="empty", rows=0)
+
+    assert backfill.pending_days("TTR DATIN", day1, day3, progress) == [day1]
+    assert backfill.pending_days("TTR DATIN", day1, day3, progress, force=True) == [day1, day2, day3]
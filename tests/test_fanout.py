@@ -0,0 +1,100 @@
+# tests/test_fanout.py
+import pytest
+
+import telkomcare_fanout as fanout
+import telkomcare_http
+from telkomcare_http import SessionExpiredError, create_http_session
+
+
+@pytest.fixture
+def cookie(monkeypatch):
+    """cookies.env palsu: nilai cookie berubah setelah login ulang."""
+    state = {"value": "old-cookie"}
+    monkeypatch.setattr(telkomcare_http, "load_session_from_env",
+                        lambda: ("newtelkomcareapache", "127.0.0.1", state["value"]))
+    return state
+
+
+@pytest.fixture
+def cycle(tmp_path, monkeypatch):
+    monkeypatch.setattr(fanout, "prune_old_cycles", lambda keep: None)
+    monkeypatch.setattr(fanout, "new_download_dir", lambda report, cycle_id: str(tmp_path / report))
+    monkeypatch.setattr(fanout, "record_session_verdict", lambda valid, value=None: None)
+    monkeypatch.setattr(fanout, "BROWSER_REPORTS", [])
+
+
+def _http_func(report, calls):
+    def download(session, download_dir):
+        value = session.cookies.get("newtelkomcareapache")
+        calls.append((report, value))
+        if value != "new-cookie":
+            raise SessionExpiredError("Redirect ke halaman login")
+        return f"{download_dir}/{report}.xls"
+    return download
+
+
+def test_expired_fetch_relogins_and_refreshes_http_cookie(cookie, cycle, monkeypatch):
+    # Probe bilang valid (cookie lama dipakai membuat session), tapi export ditolak
+    calls = []
+    browser = []
+    monkeypatch.setattr(fanout, "HTTP_REPORTS", [
+        ("TTR DATIN", _http_func("TTR DATIN", calls), lambda d, dd: browser.append(d)),
+        ("TTR INDIBIZ", _http_func("TTR INDIBIZ", calls), lambda d, dd: browser.append(d)),
+    ])
+    session = create_http_session(pool_size=2)
+    relogins = []
+
+    def relogin():
+        relogins.append(1)
+        cookie["value"] = "new-cookie"  # login_otomatis menulis cookies.env baru
+        return "new-driver"
+
+    results = fanout.download_all("old-driver", session, max_workers=2, relogin=relogin)
+
+    assert relogins == [1]
+    assert session.cookies.get("newtelkomcareapache") == "new-cookie"
+    assert all(results[r]["ok"] for r in ("TTR DATIN", "TTR INDIBIZ"))
+    assert sorted(calls) == [("TTR DATIN", "new-cookie"), ("TTR DATIN", "old-cookie"),
+                             ("TTR INDIBIZ", "new-cookie"), ("TTR INDIBIZ", "old-cookie")]
+    assert browser == []
+
+
+def test_browser_fallback_uses_relogged_driver(cookie, cycle, monkeypatch):
+    def always_expired(session, download_dir):
+        raise SessionExpiredError("Redirect ke halaman login")
+
+    used = []
+    monkeypatch.setattr(fanout, "HTTP_REPORTS", [
+        ("WECARE GAUL", always_expired, lambda driver, d: used.append(driver) or f"{d}/gaul.xls"),
+    ])
+    session = create_http_session(pool_size=1)
+
+    def relogin():
+        cookie["value"] = "new-cookie"
+        return "new-driver"
+
+    results = fanout.download_all("old-driver", session, max_workers=1, relogin=relogin)
+
+    assert used == ["new-driver"]
+    assert results["WECARE GAUL"]["ok"]
+
+
+def test_rejected_cookie_refresh_goes_to_browser_and_keeps_results(cookie, cycle, monkeypatch):
+    def always_expired(session, download_dir):
+        raise SessionExpiredError("Redirect ke halaman login")
+
+    used = []
+    monkeypatch.setattr(fanout, "HTTP_REPORTS", [
+        ("WECARE GAUL", lambda session, d: f"{d}/gaul.xls", None),
+        ("TTR DATIN", always_expired, lambda driver, d: used.append(driver) or f"{d}/ttr.xls"),
+    ])
+    session = create_http_session(pool_size=2)
+
+    def relogin():
+        cookie["value"] = ""  # login ulang tidak menghasilkan cookie → refresh_session_cookie raise
+        return "new-driver"
+
+    results = fanout.download_all("old-driver", session, max_workers=2, relogin=relogin)
+
+    assert used == ["new-driver"]
+    assert results["WECARE GAUL"]["ok"] and results["TTR DATIN"]["ok"]
@@ -0,0 +1,80 @@
+# tests/test_htmltable.py
+import pandas as pd
+import pytest
+
+from telkomcare_htmltable import read_table, read_table_columns, read_table_text, write_table_html
+
+EDGE_HTML = """<html><body>
+<table style="display: none"><tr><td>hidden</td></tr></table>
+<table><tr><td></td></tr></table>
+<table border=1>
+<thead><tr><th colspan=2>A</th><th rowspan=2>C</th></tr><tr><th>a1</th><th>a2</th></tr></thead>
+<tbody>
+<tr><td>1,000</td><td>x</td><td>True</td></tr>
+<tr><td rowspan=2>2</td><td>NA</td><td>false</td></tr>
+<tr><td>y<br>z</td><td>TRUE</td></tr>
+<tr style="display:none"><td>9</td><td>9</td><td>9</td></tr>
+<tr><td>3.5</td><td><span style="display:none">h</span>vis  ible</td><td>False</td></tr>
+</tbody>
+<tfoot><tr><td>tot</td><td colspan=2>f</td></tr></tfoot>
+</table>
+<table><tr><th>h1</th><th>h2</th><th>h3</th><th>h4</th></tr>
+<tr><td>1</td><td>2</td><td></td><td>007</td></tr>
+<tr><td>3</td><td>4</td><td>5</td><td>1e3</td></tr>
+<tr><td>inf</td><td>-1</td><td>n/a</td><td>12345678901234567890123</td></tr>
+</table>
+<table><thead><th>only</th><th>th</th></thead><tr><td>a</td><td>1</td></tr><tr><td>b</td><td>2</td></tr></table>
+<table><tr><td>1</td></tr><tr><td> </td></tr><tr><td>2</td></tr></table>
+</body></html>
+"""
+
+NESTED_HTML = """<html><body>
+<table><tr><th>A</th><th>B</th></tr>
+<tr><td>out</td><td><table><tr><td>in</td></tr><tr><td>in2</td></tr></table></td></tr>
+<tr><td>1</td><td>2</td></tr>
+</table>
+<table><tr><td>after</td><td>3</td></tr></table>
+</body></html>
+"""
+
+
+@pytest.fixture
+def edge_file(tmp_path):
+    path = tmp_path / "edge.xls"
+    path.write_text(EDGE_HTML, encoding="utf-8")
+    return str(path)
+
+
+def test_matches_pandas_read_html(edge_file):
+    frames = pd.read_html(edge_file)
+    for i, df in enumerate(frames):
+        assert read_table(edge_file, i) == df.fillna("").values.tolist()
+    assert read_table(edge_file, "first") == frames[0].fillna("").values.tolist()
+    assert read_table(edge_file, "widest") == frames[1].fillna("").values.tolist()
+    assert read_table(edge_file, -1) == frames[-1].fillna("").values.tolist()
+    with pytest.raises(IndexError):
+        read_table(edge_file, len(frames))
+
+
+def test_nested_tables_follow_document_order(tmp_path):
+    path = tmp_path / "nested.xls"
+    path.write_text(NESTED_HTML, encoding="utf-8")
+    frames = pd.read_html(str(path))
+    assert len(frames) == 3
+    for i, df in enumerate(frames):
+        assert read_table(path, i) == df.fillna("").values.tolist()
+    assert read_table(path, "first") == frames[0].fillna("").values.tolist()
+    assert read_table(path, -1) == frames[-1].fillna("").values.tolist()
+
+
+def test_columns_are_typed(edge_file):
+    table = read_table_columns(edge_file, 1)
+    assert [c.dtype.kind for c in table.columns] == ["f", "i", "O", "f"]
+    assert table.names == ["h1", "h2", "h3", "h4"]
+
+
+def test_text_round_trip(tmp_path, edge_file):
+    header, rows = read_table_text(edge_file, 1)
+    out = write_table_html(tmp_path / "out.xls", header, rows)
+    assert read_table_text(out) == (header, rows)
+    assert read_table(out) == read_table(edge_file, 1)
@@ -0,0 +1,85 @@
+# tests/test_http.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import telkomcare_http
+
+DASHBOARD = b"<html><body>dashboard</body></html>"
+LOGIN_PAGE = b'<html><body><input id="uname"><div class="captcha-element"></div></body></html>'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # path → (status, Location | body)
+    routes = {
+        "/ok/assurance/dashboard/alertresponse": (200, DASHBOARD),
+        "/slash/assurance/dashboard/alertresponse": (301, "/slash/assurance/dashboard/alertresponse/"),
+        "/slash/assurance/dashboard/alertresponse/": (200, DASHBOARD),
+        "/expired/assurance/dashboard/alertresponse": (302, "/public/login?&modules=assurance"),
+        "/public/login": (200, LOGIN_PAGE),
+    }
+
+    def do_GET(self):
+        if self.path == "/truncated.xls":
+            # Content-Length lebih panjang dari body lalu koneksi ditutup → stream putus,
+            self.send_response(200)
+            self.send_header("Content-Length", str(1024 * 1024))
+            self.end_headers()
+            # > chunk_size fetch_to_file, jadi potongan pertama sudah tertulis ke .part
+            self.wfile.write(b"<table><tr><td>1</td></tr>" * 20000)
+            self.close_connection = True
+            return
+        status, target = self.routes.get(self.path.split("?")[0], (404, b"not found"))
+        self.send_response(status)
+        if 300 <= status < 400:
+            self.send_header("Location", target)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_header("Content-Length", str(len(target)))
+        self.end_headers()
+        self.wfile.write(target)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def probe(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(telkomcare_http, "PROBE_CACHE_PATH", tmp_path / "session_probe.json")
+    monkeypatch.setattr(telkomcare_http, "load_session_from_env",
+                        lambda: ("newtelkomcareapache", "127.0.0.1", "cookie"))
+
+    def run(prefix):
+        monkeypatch.setattr(telkomcare_http, "BASE_URL", server + prefix)
+        return telkomcare_http.probe_session(use_cache=False)
+    return run
+
+
+def test_probe_valid(probe):
+    assert probe("/ok") is True
+
+
+def test_probe_follows_non_login_redirect(probe):
+    assert probe("/slash") is True
+
+
+def test_probe_login_redirect_is_expired(probe):
+    assert probe("/expired") is False
+
+
+def test_fetch_to_file_removes_part_file_on_error(server, tmp_path):
+    dest = tmp_path / "report.xls"
+    with pytest.raises(requests.RequestException):
+        telkomcare_http.fetch_to_file(requests.Session(), server + "/truncated.xls", dest)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,20 @@
+# tests/test_session.py
+from selenium.common.exceptions import WebDriverException
+
+import telkomcare_http
+import telkomcare_session
+
+
+class _DeadDriver:
+    def get(self, url):
+        raise WebDriverException("driver mati")
+
+
+def test_ensure_logged_in_can_skip_probe(monkeypatch):
+    probes = []
+    monkeypatch.setattr(telkomcare_http, "probe_session", lambda: probes.append(1))
+
+    driver = telkomcare_session.ensure_logged_in(_DeadDriver(), login_func=lambda: "new-driver", probe=False)
+
+    assert driver == "new-driver"
+    assert probes == []
@@ -0,0 +1,101 @@
+# tests/test_sheetdiff.py
+import pytest
+
+import telkomcare_importer as importer
+import telkomcare_sheetdiff as sheetdiff
+from telkomcare_columnar import ColumnTable
+from telkomcare_sheetdiff import changed_ranges, row_hash
+
+
+def test_unchanged_rows_send_nothing():
+    hashes = ["a", "b", "c"]
+    assert changed_ranges(hashes, list(hashes)) == []
+
+
+def test_close_changes_are_coalesced():
+    old = list("abcdefghij")
+    new = list(old)
+    new[1], new[3], new[4] = "X", "Y", "Z"
+    # gap 1 baris (index 2) <= MERGE_GAP_ROWS → satu range, ikut kirim baris 2
+    assert changed_ranges(old, new) == [(1, 5)]
+    assert changed_ranges(old, new, merge_gap=0) == [(1, 2), (3, 5)]
+
+
+def test_far_changes_stay_separate():
+    old = list("abcdefghij")
+    new = list(old)
+    new[0], new[9] = "X", "Y"
+    assert changed_ranges(old, new) == [(0, 1), (9, 10)]
+
+
+def test_appended_rows_are_always_sent():
+    old = ["a", "b"]
+    assert changed_ranges(old, ["a", "b", "c", "d"]) == [(2, 4)]
+    assert changed_ranges([], ["a", "b"]) == [(0, 2)]
+    # baris baru menyambung ke perubahan di ekor lama
+    assert changed_ranges(old, ["a", "X", "c"]) == [(1, 3)]
+
+
+def test_shorter_report_only_diffs_remaining_rows():
+    assert changed_ranges(["a", "b", "c", "d"], ["a", "X"]) == [(1, 2)]
+    assert changed_ranges(["a", "b", "c", "d"], ["a", "b"]) == []
+
+
+class _FakeSheet:
+    def __init__(self):
+        self.cleared = []
+
+    def batch_clear(self, ranges):
+        self.cleared.extend(ranges)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    calls = []
+
+    def send_row_ranges(ws, table, ranges, last_col_letter, sheet_name, row_sizes=None):
+        calls.append(ranges)
+        return {"rows": sum(end - start for start, end in ranges)}
+    monkeypatch.setattr(importer, "send_row_ranges", send_row_ranges)
+    return calls
+
+
+def _hashes(rows):
+    return [row_hash(row) for row in rows]
+
+
+def test_write_diff_clears_tail_when_report_shrinks(sent):
+    old_rows = [["INC1", "OPEN"], ["INC2", "OPEN"], ["INC3", "OPEN"], ["INC4", "OPEN"]]
+    new_rows = [["INC1", "OPEN"], ["INC2", "CLOSED"]]
+    ws = _FakeSheet()
+
+    importer._write_diff(ws, ColumnTable.from_rows(new_rows), _hashes(old_rows), _hashes(new_rows), "TTR")
+
+    assert sent == [[(1, 2)]]
+    # Data mulai baris 2 (baris 1 header) → baris 4..5 sheet = index 2..3 lama
+    assert ws.cleared == ["A4:B5"]
+
+
+def test_write_diff_appends_without_clearing(sent):
+    old_rows = [["INC1", "OPEN"]]
+    new_rows = [["INC1", "OPEN"], ["INC2", "OPEN"]]
+    ws = _FakeSheet()
+
+    importer._write_diff(ws, ColumnTable.from_rows(new_rows), _hashes(old_rows), _hashes(new_rows), "TTR")
+
+    assert sent == [[(1, 2)]]
+    assert ws.cleared == []
+
+
+def test_shadow_round_trip_and_expiry(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheetdiff, "SHADOW_DIR", tmp_path)
+    sheetdiff.save_shadow("sheet-id", "TTR DATIN", 2, ["a", "b"])
+    assert sheetdiff.load_shadow("sheet-id", "TTR DATIN")["hashes"] == ["a", "b"]
+
+    monkeypatch.setattr(sheetdiff, "SHADOW_MAX_AGE_HOURS", -1)
+    assert sheetdiff.load_shadow("sheet-id", "TTR DATIN") is None
+
+    sheetdiff.drop_shadow("sheet-id", "TTR DATIN")
+    sheetdiff.drop_shadow("sheet-id", "TTR DATIN")
+    monkeypatch.setattr(sheetdiff, "SHADOW_MAX_AGE_HOURS", 24)
+    assert sheetdiff.load_shadow("sheet-id", "TTR DATIN") is None
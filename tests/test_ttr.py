@@ -0,0 +1,78 @@
+# tests/test_ttr.py
+from datetime import date
+
+import telkomcare_ttr as ttr
+from telkomcare_htmltable import read_table_text, write_table_html
+
+HEADER = [["NO", "INCIDENT", "STATUS"]]
+
+
+def _fake_fetch(calls):
+    def fetch(start, end, path):
+        calls.append((start, end))
+        rows = [["1", f"INC{start.day}", "OPEN"], ["2", "INC-SAME", f"{end}"]]
+        write_table_html(path, HEADER, rows)
+        return str(path)
+    return fetch
+
+
+def _ticket_server(tickets):
+    """Export tiruan: tiket yang aktif di rentang (open <= end, close >= start), NO 1..n."""
+    def fetch(start, end, path):
+        active = [t for t in tickets if t[1] <= end and t[2] >= start]
+        rows = [[str(no), ticket_id, f"{opened}"] for no, (ticket_id, opened, _closed) in enumerate(active, 1)]
+        write_table_html(path, HEADER, rows)
+        return str(path)
+    return fetch
+
+
+def test_sliced_export_does_not_depend_on_day_of_month(tmp_path):
+    # INC-X dibuka ulang tanggal 4 dan aktif sampai tanggal 12 → dua baris di export
+    # tanggal 1..5, dan muncul lagi di potongan 11..20
+    fetch = _ticket_server([("INC-A", date(2026, 10, 2), date(2026, 10, 2)),
+                            ("INC-X", date(2026, 10, 3), date(2026, 10, 4)),
+                            ("INC-X", date(2026, 10, 4), date(2026, 10, 12))])
+    exports = {}
+    for day in (5, 25):
+        dest = tmp_path / f"day{day}.xls"
+        ttr.fetch_range("TTR DATIN", fetch, date(2026, 10, 1), date(2026, 10, day), dest, slice_days=10)
+        exports[day] = read_table_text(str(dest), "first")
+
+    assert exports[5] == exports[25]
+    assert exports[25][1] == [["1", "INC-A", "2026-10-02"], ["2", "INC-X", "2026-10-04"]]
+
+
+def test_fetch_range_merges_slices_and_removes_piece_files(tmp_path):
+    calls = []
+    dest = tmp_path / "ttr_datin.xls"
+    ttr.fetch_range("TTR DATIN", _fake_fetch(calls), date(2026, 10, 1), date(2026, 10, 25), dest,
+                    slice_days=10, workers=2)
+
+    assert calls and len(calls) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ttr_datin.xls"]
+    header, rows = read_table_text(str(dest), "first")
+    assert header == HEADER
+    # INC-SAME dobel di tiap potongan → versi potongan terakhir, NO diurut ulang
+    assert rows == [["1", "INC1", "OPEN"], ["2", "INC-SAME", "2026-10-25"],
+                    ["3", "INC11", "OPEN"], ["4", "INC21", "OPEN"]]
+
+
+def test_month_to_date_serial_fetch_reuses_closed_day_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ttr, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(ttr, "SLICE_DAYS", 10)
+    today = date(2026, 10, 18)
+    work = tmp_path / "work"
+    work.mkdir()
+
+    calls = []
+    ttr.fetch_month_to_date("TTR DATIN", _fake_fetch(calls), work / "ttr_datin.xls", today=today,
+                            trailing_days=3, workers=1)
+    assert calls == [(date(2026, 10, 1), date(2026, 10, 10)), (date(2026, 10, 11), date(2026, 10, 15)),
+                     (date(2026, 10, 16), date(2026, 10, 18))]
+
+    # Cycle berikutnya: hari tutup dari cache, hanya jendela trailing yang di-fetch
+    calls.clear()
+    ttr.fetch_month_to_date("TTR DATIN", _fake_fetch(calls), work / "ttr_datin.xls", today=today,
+                            trailing_days=3, workers=1)
+    assert calls == [(date(2026, 10, 16), date(2026, 10, 18))]
+    assert sorted(p.name for p in work.iterdir()) == ["ttr_datin.xls"]